@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import loader
+from coordination import CoordinationClient, CoordinationServer, CoordinationState
+from synthetic import write_synthetic_list
+
+
+def scorer(address, name, batches, batch_size, seen):
+    client = CoordinationClient(address, name)
+    leases = []
+    for _ in range(batches):
+        batch = client.next_batch(batch_size, leases)
+        leases = [batch["lease"]]
+        now = time.time()
+        client.send_events([[row, word, 25, 1, now] for row, word in zip(batch["rows"].tolist(), batch["words"])])
+        seen.extend(batch["rows"].tolist())
+    client.close()
+
+
+def main(rows=1_000_000, batches=50, batch_size=200):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_list(os.path.join(tmp, "master.txt"), rows)
+        words, _ = loader.load_master_wordlist(path, os.path.join(tmp, "cache"))
+        order = np.random.default_rng(0).permutation(len(words))
+        print(f"rows={rows} batches per scorer={batches} batch size={batch_size}")
+        for scorers in (1, 2, 4, 8):
+            state = CoordinationState(words, order, np.full(len(order), 25, dtype=np.uint8),
+                                      np.zeros(len(words), dtype=bool), os.path.join(tmp, f"coord{scorers}.db"))
+            server = CoordinationServer(("127.0.0.1", 0), state)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            address = f"127.0.0.1:{server.server_address[1]}"
+            seen = []
+            threads = [threading.Thread(target=scorer, args=(address, f"s{i}", batches, batch_size, seen))
+                       for i in range(scorers)]
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            elapsed = time.perf_counter() - start
+            server.shutdown()
+            server.server_close()
+            state.conn.close()
+            duplicates = len(seen) - len(set(seen))
+            print(f"scorers={scorers}  {len(seen) / elapsed:9.0f} words/s  duplicates={duplicates}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import loader
+from synthetic import write_synthetic_list
+
+
+def update_list(path, fraction, seed=1):
+    # A new release: fraction of the lines get a new score, as many are
+    # dropped and as many new words are inserted at random places.
+    rng = np.random.default_rng(seed)
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    count = int(len(lines) * fraction)
+    for i in rng.choice(len(lines), count, replace=False).tolist():
+        word, score = lines[i].split(";")
+        lines[i] = f"{word};{(int(score) + 7) % 101}"
+    drop = set(rng.choice(len(lines), count, replace=False).tolist())
+    lines = [line for i, line in enumerate(lines) if i not in drop]
+    for i, at in enumerate(np.sort(rng.integers(0, len(lines), count))[::-1].tolist()):
+        lines.insert(at, f"NEWWORD{i};{i % 101}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def main(rows=1_000_000, percent=1.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_list(os.path.join(tmp, "master.txt"), int(rows))
+        cache = os.path.join(tmp, "cache")
+        loader.load_master_wordlist(path, cache)
+        update_list(path, percent / 100)
+        print(f"rows={rows} changed={percent}%")
+
+        # What a changed list cost before: a full parse into a new snapshot.
+        start = time.perf_counter()
+        words, scores = loader.load_master_wordlist(path, os.path.join(tmp, "fresh"))
+        print(f"full parse  {time.perf_counter() - start:7.3f} s")
+
+        start = time.perf_counter()
+        diffed, diffed_scores = loader.load_master_wordlist(path, cache)
+        print(f"diff reload {time.perf_counter() - start:7.3f} s")
+        print(f"changes: {loader.load_master_changes(path, cache).summary()}")
+        assert list(diffed) == list(words) and np.array_equal(diffed_scores, scores)
+
+
+if __name__ == "__main__":
+    main(*(float(a) if "." in a else int(a) for a in sys.argv[1:]))
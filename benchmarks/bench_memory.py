@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import loader
+from master_index import MasterIndex
+from scoring import filter_wordlist
+from synthetic import write_synthetic_list
+
+FILTERS = (3, 15, 25, 60)
+
+
+def mb(n):
+    return f"{n / 1e6:8.1f} MB"
+
+
+def index_bytes(index):
+    arrays = (index.order, index.slot, index.scores, index.lengths, index.buckets, index.done,
+              index.partition.total, index.partition.done)
+    return sum(a.nbytes for a in arrays)
+
+
+def main(rows=5_000_000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_list(os.path.join(tmp, "master.txt"), rows)
+        cache_dir = os.path.join(tmp, "cache")
+        print(f"rows={rows} file={mb(os.path.getsize(path))}")
+
+        # Before: the whole list as a DataFrame with one str object per word,
+        # plus the filtered copy the queue used to be built from.
+        df = loader.read_word_table(path, "score")
+        filtered = filter_wordlist(df, *FILTERS)
+        df_bytes = df.memory_usage(deep=True).sum()
+        filtered_bytes = filtered.memory_usage(deep=True).sum()
+        print(f"before  master DataFrame      {mb(df_bytes)}")
+        print(f"        filtered copy         {mb(filtered_bytes)}")
+        print(f"        total                 {mb(df_bytes + filtered_bytes)}")
+        del df, filtered
+
+        # After: word buffer, uint8 scores and the master index columns.
+        words, scores = loader.load_master_wordlist(path, cache_dir)
+        start = time.perf_counter()
+        words, scores = loader.load_master_wordlist(path, cache_dir)
+        mapped = time.perf_counter() - start
+        index = MasterIndex(words, scores, seed=0)
+        index.fill(len(index), {}, [])
+        slots = index.select(*FILTERS)
+        print(f"after   word buffer           {mb(words.nbytes)}  (memory-mapped, opened in {mapped * 1000:.0f} ms)")
+        print(f"        scores                {mb(scores.nbytes)}")
+        print(f"        master index columns  {mb(index_bytes(index))}")
+        print(f"        filtered queue        {mb(len(slots) * 5)}  (row id + bucket per word)")
+        print(f"        total                 {mb(words.nbytes + scores.nbytes + index_bytes(index) + len(slots) * 5)}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from parallel import run_pipeline
+from synthetic import write_synthetic_list
+
+
+def main(rows=5_000_000, max_workers=None, chunk_mb=16):
+    max_workers = max_workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_list(os.path.join(tmp, "master.txt"), rows)
+        overrides = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for i, line in zip(range(50_000), f):
+                overrides[line.split(";")[0]] = [0, 25, 50, 60, 61][i % 5]
+        filters = (3, 15, 25, 60)
+
+        print(f"rows={rows} size={os.path.getsize(path) / 1e6:.0f} MB "
+              f"chunk={chunk_mb} MB cores={os.cpu_count()}")
+        counts = [1]
+        while counts[-1] * 2 <= max_workers:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != max_workers:
+            counts.append(max_workers)
+
+        baseline = None
+        for workers in counts:
+            start = time.perf_counter()
+            df = run_pipeline([path], overrides, filters, workers, chunk_mb << 20)
+            elapsed = time.perf_counter() - start
+            if baseline is None:
+                baseline, expected = elapsed, df
+            else:
+                # Deterministic merge: every worker count gives the same frame.
+                assert df.equals(expected)
+            print(f"workers={workers:<3} {elapsed:8.2f}s  speedup {baseline / elapsed:5.2f}x  rows out={len(df)}")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,58 @@
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import loader
+from master_index import MasterIndex
+from prioritizer import ChangeModel, PrioritizedQueue
+from synthetic import write_synthetic_list
+from work_queue import WorkQueue
+
+FILTERS = (3, 15, 0, 100)
+
+
+def needs_change(word):
+    # The simulated user moves words with a Q or a double letter.
+    return "Q" in word or any(a == b for a, b in zip(word, word[1:]))
+
+
+def session(index, prioritized, picks):
+    done = np.zeros(len(index), dtype=bool)
+    model = ChangeModel(index.words)
+    if prioritized:
+        queue = PrioritizedQueue(index.words, done, model)
+    else:
+        queue = WorkQueue(index.words, lambda row: done[row])
+    slots = index.select(*FILTERS)
+    queue.extend(index.order[slots], index.buckets[slots])
+    changed = 0
+    start = time.perf_counter()
+    for _ in range(picks):
+        row, word, score = queue.current()
+        change = needs_change(word)
+        changed += change
+        model.learn_rescore(row, score, score + 1 if change else score)
+        done[row] = True
+        queue.advance()
+    return changed, (time.perf_counter() - start) / picks
+
+
+def main(rows=1_000_000, picks=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_list(os.path.join(tmp, "master.txt"), rows)
+        words, scores = loader.load_master_wordlist(path, os.path.join(tmp, "cache"))
+        index = MasterIndex(words, scores, seed=0)
+        index.fill(len(index), {}, [])
+        print(f"rows={rows} picks={picks}")
+        for name, prioritized in (("shuffle", False), ("prioritized", True)):
+            changed, per_pick = session(index, prioritized, picks)
+            print(f"{name:12s} {changed:6d} words changed ({changed / picks:5.1%})  "
+                  f"{per_pick * 1000:6.3f} ms per word")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scoring import map_score_to_bucket, map_scores_to_buckets, overlay_scores
+
+
+def synthetic_lists(rows, personal_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    words = pd.Series([f"W{i:07d}" for i in range(rows)])
+    df = pd.DataFrame({"word": words, "score": rng.integers(0, 101, rows)})
+    picked = rng.choice(rows, personal_rows, replace=False)
+    personal_df = pd.DataFrame({"word": words[picked].values,
+                                "score": rng.choice([0, 25, 50, 60, 61], personal_rows)})
+    return df, personal_df
+
+
+def overlay_rowwise(df, personal_df):
+    personal_dict = dict(zip(personal_df['word'], personal_df['score']))
+    return df.apply(
+        lambda row: personal_dict[row['word']] if row['word'] in personal_dict else row['score'], axis=1
+    )
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def main(rows=1_000_000, personal_rows=50_000):
+    df, personal_df = synthetic_lists(rows, personal_rows)
+
+    old_overlay, t_old_overlay = timed(overlay_rowwise, df, personal_df)
+    overrides = dict(zip(personal_df["word"], personal_df["score"]))
+    new_overlay, t_new_overlay = timed(overlay_scores, df["word"], df["score"], overrides)
+    assert old_overlay.equals(new_overlay)
+
+    old_buckets, t_old_buckets = timed(lambda s: s.apply(map_score_to_bucket), new_overlay)
+    new_buckets, t_new_buckets = timed(map_scores_to_buckets, new_overlay)
+    assert (old_buckets.values == new_buckets.values).all()
+
+    print(f"rows={rows} personal={personal_rows}")
+    print(f"overlay  row-wise {t_old_overlay:8.3f}s  vectorized {t_new_overlay:8.3f}s  "
+          f"speedup {t_old_overlay / t_new_overlay:6.1f}x")
+    print(f"buckets  apply    {t_old_buckets:8.3f}s  vectorized {t_new_buckets:8.3f}s  "
+          f"speedup {t_old_buckets / t_new_buckets:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
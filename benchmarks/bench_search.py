@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import loader
+from search import SearchIndex
+from synthetic import write_synthetic_list
+
+QUERIES = [("pattern", "?A?E??"), ("pattern", "Q??????"), ("pattern", "???????????X"),
+           ("anagram", "RETAINS"), ("regex", "Q.*Z.*X")]
+
+
+def main(rows=5_000_000, repeat=5):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_synthetic_list(os.path.join(tmp, "master.txt"), rows)
+        words, _ = loader.load_master_wordlist(path, os.path.join(tmp, "cache"))
+        start = time.perf_counter()
+        index = SearchIndex.build(words)
+        print(f"rows={rows} build={time.perf_counter() - start:.2f} s")
+        for mode, query in QUERIES:
+            times = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                found = index.search(mode, query, limit=500)
+                times.append(time.perf_counter() - start)
+            print(f"{mode:8s} {query:14s} {len(found):4d} shown  first {times[0] * 1000:8.2f} ms  "
+                  f"best {min(times) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
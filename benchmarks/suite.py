@@ -0,0 +1,304 @@
+# Benchmark suite for the startup, per-keystroke and save paths.
+#
+#     python benchmarks/suite.py --sizes 1k,100k,1M --out results.json
+#     python benchmarks/suite.py --sizes 1M --compare results.json
+#
+# Synthetic master, personal and tracker lists are generated for every size
+# (personal and tracker sizes are fractions of the master). Each size runs in
+# fresh child processes, one for the headless core logic and one driving the
+# GUI on Qt's offscreen platform, so peak memory is measured per run. Results
+# are written as JSON; --compare prints the time ratio against an earlier run.
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, HERE)
+
+FILTERS = (1, 30, 0, 100)
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip("km")) * scale)
+
+
+def peak_rss():
+    # Peak resident set size of this process in bytes, where available.
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return {"count": len(samples), "p50": pick(0.50), "p95": pick(0.95),
+            "p99": pick(0.99), "max": samples[-1], "total": sum(samples)}
+
+
+def measure(name, fn, repeat=1, setup=None):
+    # Best wall time over repeat runs, then one more run under tracemalloc
+    # for the peak and retained Python and numpy allocations.
+    times = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - start)
+    args = setup() if setup else ()
+    tracemalloc.start()
+    result = fn(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"name": name, "seconds": min(times), "alloc_peak_bytes": peak,
+            "alloc_retained_bytes": retained}, result
+
+
+def headless(paths, rows):
+    import loader
+    from journal import Journal
+    from master_index import MasterIndex
+    from store import ScoreStore
+    from work_queue import WorkQueue
+
+    cache_dir = os.path.join(paths["dir"], "cache")
+    results = []
+
+    def run(name, fn, repeat=1, setup=None):
+        entry, value = measure(name, fn, repeat, setup)
+        results.append(entry)
+        return value
+
+    run("load_master_parse", lambda: loader.load_master_wordlist(paths["master"]))
+    run("load_master_snapshot_write", lambda: loader.load_master_wordlist(paths["master"], cache_dir), 1,
+        lambda: shutil.rmtree(cache_dir, ignore_errors=True) or ())
+    words, scores = run("load_master_snapshot", lambda: loader.load_master_wordlist(paths["master"], cache_dir), 3)
+    personal = run("load_personal", lambda: ScoreStore.from_frame(loader.load_personal_wordlist(paths["personal"]), "score"), 3)
+    tracker = run("load_tracker", lambda: ScoreStore.from_frame(loader.load_tracker(paths["tracker"]), "rescored"), 3)
+    overrides = dict(personal.as_dict())
+    done = run("done_words", lambda: [w for w, r in tracker.items() if r == 1], 3)
+
+    index = run("overlay_filter_bucket", lambda index: index.fill(len(index), overrides, done) or index, 1,
+                lambda: (MasterIndex(words, scores, 0),))
+    slots = run("apply_filters", lambda: index.select(*FILTERS), 5)
+    run("progress_count", lambda: index.partition.count(*FILTERS), 5)
+
+    def build_queue():
+        queue = WorkQueue(index.words, lambda row: index.done[row])
+        queue.extend(index.order[slots], index.buckets[slots])
+        return queue
+    queue = run("build_queue", build_queue, 3)
+
+    def next_words(n=1000):
+        for _ in range(n):
+            if queue.current() is None:
+                break
+            queue.advance()
+    run("next_word_x1000", next_words)
+
+    journal_path = os.path.join(paths["dir"], "bench.journal")
+
+    def journal_flush():
+        journal = Journal(journal_path)
+        for word in list(personal)[:1000]:
+            journal.record_rescore(word, 50)
+        journal.flush()
+        journal.close()
+        os.remove(journal_path)
+    run("journal_flush_1000", journal_flush, 3)
+    run("save_personal", lambda: personal.save(os.path.join(paths["dir"], "personal.out")), 3)
+    run("save_tracker", lambda: tracker.save(os.path.join(paths["dir"], "tracker.out")), 3)
+    return results
+
+
+def gui(paths, rows, keystrokes=500, undos=100, saves=20):
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    from PyQt5.QtCore import QEvent, Qt
+    from PyQt5.QtGui import QKeyEvent
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+
+    # Nothing may block on a dialog while being timed.
+    QMessageBox.information = staticmethod(lambda *args, **kwargs: None)
+    QMessageBox.warning = staticmethod(lambda *args, **kwargs: None)
+    QMessageBox.critical = staticmethod(lambda *args, **kwargs: None)
+
+    workdir = paths["dir"]
+    with open(os.path.join(workdir, "config.ini"), "w", encoding="utf-8") as f:
+        f.write("[General]\n"
+                f"master_wordlist_file={paths['master']}\n"
+                f"personal_wordlist_file={os.path.join(workdir, 'gui_personal.txt')}\n"
+                f"rescore_tracker_file={os.path.join(workdir, 'gui_tracker.txt')}\n"
+                f"length_min={FILTERS[0]}\nlength_max={FILTERS[1]}\n"
+                f"score_min={FILTERS[2]}\nscore_max={FILTERS[3]}\n"
+                f"snapshot_cache_dir={os.path.join(workdir, 'cache')}\n"
+                "rapid_mode=1\nautosave_every=25\nautosave_interval_s=3600\nshuffle_seed=0\n")
+    for name in ("personal", "tracker"):
+        with open(paths[name], "rb") as src, open(os.path.join(workdir, f"gui_{name}.txt"), "wb") as dst:
+            dst.write(src.read())
+    os.chdir(workdir)
+
+    app = QApplication([])
+    import wordlister
+    started = time.perf_counter()
+    window = wordlister.RescoreApp()
+    window.show()
+    while window.loading:
+        app.processEvents()
+    loaded = time.perf_counter() - started
+    times = window.startup_times
+    results = [{"name": "gui_startup", "seconds": loaded,
+                "first_word_seconds": times.get("first_word", times["loaded"]) - times["load_started"]}]
+
+    def press(key):
+        start = time.perf_counter()
+        window.keyPressEvent(QKeyEvent(QEvent.KeyPress, key, Qt.NoModifier))
+        app.processEvents()
+        return time.perf_counter() - start
+
+    keys = [Qt.Key_D, Qt.Key_A, Qt.Key_Space, Qt.Key_Q, Qt.Key_E]
+    samples = [press(keys[i % len(keys)]) for i in range(keystrokes) if window.current_item is not None]
+    results.append(dict(percentiles(samples), name="gui_rescore_cycle"))
+
+    samples = []
+    for i in range(undos):
+        if window.current_item is None:
+            break
+        press(Qt.Key_D)
+        samples.append(press(Qt.Key_U))
+    results.append(dict(percentiles(samples), name="gui_undo"))
+
+    samples = []
+    for i in range(saves):
+        for _ in range(25):
+            press(Qt.Key_Space)
+        start = time.perf_counter()
+        window.save_changes()
+        window.persistence.wait_idle()
+        samples.append(time.perf_counter() - start)
+    results.append(dict(percentiles(samples), name="gui_save_changes"))
+
+    start = time.perf_counter()
+    window.compact_journal()
+    window.persistence.wait_idle()
+    results.append({"name": "gui_save_and_exit", "seconds": time.perf_counter() - start})
+    window.close()
+    return results
+
+
+def generate(workdir, rows, personal_fraction, tracker_fraction):
+    from synthetic import write_personal_list, write_synthetic_list, write_tracker
+    paths = {"dir": workdir,
+             "master": os.path.join(workdir, "master.txt"),
+             "personal": os.path.join(workdir, "personal.txt"),
+             "tracker": os.path.join(workdir, "tracker.txt")}
+    write_synthetic_list(paths["master"], rows)
+    write_personal_list(paths["personal"], paths["master"], int(rows * personal_fraction), rows)
+    write_tracker(paths["tracker"], paths["master"], int(rows * tracker_fraction), rows)
+    return paths
+
+
+def run_child(mode, paths, rows):
+    # One process per run keeps peak memory and Qt state separate.
+    out = subprocess.run([sys.executable, __file__, "--child", mode, "--child-dir", paths["dir"],
+                          "--sizes", str(rows)], capture_output=True, text=True)
+    if out.returncode != 0:
+        print(out.stderr, file=sys.stderr)
+        return [{"name": f"{mode}_failed", "error": out.stderr.strip().splitlines()[-1:]}]
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    def key(r):
+        return r["name"], r["rows"], r["personal_fraction"], r["tracker_fraction"]
+
+    def seconds(r):
+        return r.get("seconds", r.get("p50"))
+    old = {key(r): r for r in baseline["results"]}
+    print(f"\ncompared with {baseline['meta'].get('revision')} (ratio > 1 is slower now)")
+    for r in report["results"]:
+        before = old.get(key(r))
+        if before is None or seconds(r) is None or not seconds(before):
+            continue
+        print(f"  {r['name']:<28} {r['rows']:>10}  {seconds(before):10.4f}s -> {seconds(r):10.4f}s"
+              f"  x{seconds(r) / seconds(before):5.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the startup, per-keystroke and save paths.")
+    parser.add_argument("--sizes", default="1k,100k,1M", help="master sizes, e.g. 1k,100k,1M,10M")
+    parser.add_argument("--personal", default="0.05", help="personal list sizes as fractions of the master")
+    parser.add_argument("--tracker", default="0.2", help="tracker sizes as fractions of the master")
+    parser.add_argument("--no-gui", action="store_true", help="skip the offscreen GUI runs")
+    parser.add_argument("--out", help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", help="an earlier JSON report to compare against")
+    parser.add_argument("--child", choices=["headless", "gui"], help=argparse.SUPPRESS)
+    parser.add_argument("--child-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        rows = parse_size(args.sizes)
+        paths = {"dir": args.child_dir}
+        for name in ("master", "personal", "tracker"):
+            paths[name] = os.path.join(args.child_dir, f"{name}.txt")
+        results = headless(paths, rows) if args.child == "headless" else gui(paths, rows)
+        results.append({"name": f"{args.child}_peak_rss", "bytes": peak_rss()})
+        print(json.dumps(results))
+        return 0
+
+    report = {"meta": {"revision": git_revision(), "python": sys.version.split()[0],
+                       "platform": platform.platform(), "cpus": os.cpu_count(),
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+              "results": []}
+    for size in args.sizes.split(","):
+        rows = parse_size(size)
+        for personal in (float(p) for p in args.personal.split(",")):
+            for tracker in (float(t) for t in args.tracker.split(",")):
+                with tempfile.TemporaryDirectory() as tmp:
+                    print(f"rows={rows} personal={personal} tracker={tracker}", file=sys.stderr)
+                    paths = generate(tmp, rows, personal, tracker)
+                    modes = ["headless"] if args.no_gui else ["headless", "gui"]
+                    for mode in modes:
+                        for result in run_child(mode, paths, rows):
+                            result.update(rows=rows, personal_fraction=personal, tracker_fraction=tracker)
+                            report["results"].append(result)
+
+    text = json.dumps(report, indent=1)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
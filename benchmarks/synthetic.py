@@ -0,0 +1,51 @@
+import numpy as np
+
+LETTERS = np.frombuffer(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype="S1")
+BUCKETS = [0, 25, 50, 60, 61]
+
+
+def write_synthetic_list(path, rows, seed=0):
+    # A master wordlist of random 3-15 letter words with scores 0-100.
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(3, 16, rows)
+    scores = rng.integers(0, 101, rows)
+    with open(path, "w", encoding="utf-8") as f:
+        for start in range(0, rows, 100_000):
+            stop = min(start + 100_000, rows)
+            chars = LETTERS[rng.integers(0, 26, (stop - start, 15))]
+            f.writelines(f"{row[:n].tobytes().decode()};{score}\n"
+                         for row, n, score in zip(chars, lengths[start:stop], scores[start:stop]))
+    return path
+
+
+def sample_words(master_path, rows, total, seed):
+    # rows words picked at random from the first total lines of a master list.
+    rng = np.random.default_rng(seed)
+    picked = np.sort(rng.choice(total, min(rows, total), replace=False))
+    words = []
+    with open(master_path, "r", encoding="utf-8") as f:
+        it = iter(picked.tolist())
+        wanted = next(it, None)
+        for i, line in enumerate(f):
+            if wanted is None:
+                break
+            if i == wanted:
+                words.append(line.split(";", 1)[0])
+                wanted = next(it, None)
+    return words
+
+
+def write_personal_list(path, master_path, rows, total, seed=1):
+    rng = np.random.default_rng(seed)
+    words = sample_words(master_path, rows, total, seed)
+    scores = rng.choice(BUCKETS, len(words))
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{word};{score}\n" for word, score in zip(words, scores))
+    return path
+
+
+def write_tracker(path, master_path, rows, total, seed=2):
+    words = sample_words(master_path, rows, total, seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{word};1\n" for word in words)
+    return path
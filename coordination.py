@@ -0,0 +1,352 @@
+import argparse
+import http.client
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+DEFAULT_PORT = 8765
+
+# The merged decisions of every scorer, one row per word. score and rescored
+# are the word's personal score and tracker value as the scorer left them
+# (NULL: not in that list).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    word TEXT PRIMARY KEY,
+    row INTEGER NOT NULL,
+    score INTEGER,
+    rescored INTEGER,
+    time REAL NOT NULL,
+    client TEXT NOT NULL
+) WITHOUT ROWID
+"""
+
+# Conflict policy: for each word the event with the latest (time, client)
+# wins, whatever order events arrive in, so every replay of the same events
+# gives the same result. Batches are disjoint, so this only decides between
+# a scorer and a later undo or a word handed out again after a lease ran out.
+MERGE_SQL = """
+INSERT INTO events (word, row, score, rescored, time, client) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (word) DO UPDATE SET row = excluded.row, score = excluded.score,
+    rescored = excluded.rescored, time = excluded.time, client = excluded.client
+WHERE (excluded.time, excluded.client) > (events.time, events.client)
+"""
+
+
+def connect(path):
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(SCHEMA)
+    return conn
+
+
+class CoordinationState:
+    # The server side: hands out disjoint batches of master rows from the
+    # filtered, shuffled queue and merges the scorers' events. A batch is a
+    # lease; rows in a live lease are never handed out again. Rows of a
+    # released or expired lease that were not rescored go back to the front
+    # of the pool, as do rows whose rescore is undone later.
+
+    def __init__(self, words, rows, scores, done, db_path, lease_seconds=1800):
+        self.words = words
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.position = 0
+        self.scores = np.zeros(len(words), dtype=np.uint8)
+        self.scores[self.rows] = scores
+        self.done = done
+        self.leased = np.zeros(len(words), dtype=bool)
+        self.returned = deque()
+        self.leases = {}
+        self.lease_seconds = lease_seconds
+        self.lock = threading.Lock()
+        self.conn = connect(db_path)
+        for row, rescored in self.conn.execute("SELECT row, rescored FROM events"):
+            if 0 <= row < len(words):
+                self.done[row] = rescored == 1
+
+    def _end_lease(self, lease_id):
+        _, rows, _ = self.leases.pop(lease_id)
+        self.leased[rows] = False
+        self.returned.extend(rows[~self.done[rows]].tolist())
+
+    def _take(self, size):
+        taken = []
+        while self.returned and len(taken) < size:
+            row = self.returned.popleft()
+            if not self.done[row] and not self.leased[row]:
+                taken.append(row)
+                self.leased[row] = True
+        while self.position < len(self.rows) and len(taken) < size:
+            stop = min(len(self.rows), self.position + 4 * size)
+            window = self.rows[self.position:stop]
+            free = np.flatnonzero(~self.done[window] & ~self.leased[window])[:size - len(taken)]
+            self.leased[window[free]] = True
+            taken.extend(window[free].tolist())
+            self.position = stop if len(taken) < size else self.position + int(free[-1]) + 1
+        return np.array(taken, dtype=np.int64)
+
+    def next_batch(self, client, size, release=()):
+        with self.lock:
+            now = time.time()
+            for lease_id in [i for i, (_, _, expires) in self.leases.items() if expires < now]:
+                self._end_lease(lease_id)
+            for lease_id in release:
+                if lease_id in self.leases and self.leases[lease_id][0] == client:
+                    self._end_lease(lease_id)
+            rows = self._take(max(1, min(int(size), 10_000)))
+            lease_id = uuid.uuid4().hex if len(rows) else None
+            if lease_id is not None:
+                self.leases[lease_id] = (client, rows, now + self.lease_seconds)
+        return {"lease": lease_id, "rows": rows.tolist(), "words": self.words[rows],
+                "scores": self.scores[rows].tolist()}
+
+    def record(self, client, events):
+        # events: [row, word, score, rescored, time] lists. Events whose row
+        # does not hold that word (a scorer with a different master list)
+        # are rejected.
+        accepted = []
+        for row, word, score, rescored, when in events:
+            if isinstance(row, int) and 0 <= row < len(self.words) and self.words[row] == word:
+                accepted.append((word, row, score, rescored, float(when), client))
+        with self.lock:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(MERGE_SQL, accepted)
+                self.conn.execute("COMMIT")
+            except sqlite3.Error:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                raise
+            # Looked up by word, the table's key: a word listed twice in the
+            # master list has one event that settles both rows.
+            names = list({word for word, *_ in accepted})
+            state = {}
+            for start in range(0, len(names), 500):
+                chunk = names[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                state.update(self.conn.execute(
+                    f"SELECT word, rescored FROM events WHERE word IN ({marks})", chunk))
+            for word, row, *_ in accepted:
+                self.done[row] = state.get(word) == 1
+                if not self.done[row] and not self.leased[row]:
+                    self.returned.append(row)
+        return {"accepted": len(accepted), "rejected": len(events) - len(accepted)}
+
+    def status(self):
+        with self.lock:
+            queued = self.rows[self.position:]
+            return {"remaining": int((~self.done[queued] & ~self.leased[queued]).sum()) + len(self.returned),
+                    "leases": len(self.leases), "leased": int(self.leased.sum()),
+                    "rescored": int(self.done[self.rows].sum()), "total": len(self.rows)}
+
+
+class Handler(BaseHTTPRequestHandler):
+    # JSON over HTTP/1.1 keep-alive, so a client reuses its connections.
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._reply(200, self.server.state.status())
+        else:
+            self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            client = str(request.get("client", ""))
+            if self.path == "/batch":
+                reply = self.server.state.next_batch(client, request.get("size", 200), request.get("release", []))
+            elif self.path == "/events":
+                reply = self.server.state.record(client, request.get("events", []))
+            else:
+                self._reply(404, {"error": f"unknown path {self.path}"})
+                return
+        except (ValueError, TypeError, sqlite3.Error) as e:
+            self._reply(400, {"error": str(e)})
+            return
+        self._reply(200, reply)
+
+
+class CoordinationServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, state):
+        super().__init__(address, Handler)
+        self.state = state
+
+
+class CoordinationClient:
+    # Talks to a coordination server over a small pool of keep-alive
+    # connections, so fetching a batch and sending events do not wait for
+    # each other and do not reconnect for every request. Thread-safe.
+
+    def __init__(self, address, client_id=None, connections=2, timeout=10):
+        host, _, port = address.rpartition(":") if ":" in address else (address, "", "")
+        self.host = host or address
+        self.port = int(port) if port else DEFAULT_PORT
+        self.address = f"{self.host}:{self.port}"
+        self.client_id = client_id or uuid.uuid4().hex
+        self.timeout = timeout
+        self._pool = queue.Queue()
+        for _ in range(connections):
+            self._pool.put(None)
+
+    def _request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(dict(payload, client=self.client_id)).encode("utf-8")
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        conn = self._pool.get()
+        try:
+            # A pooled connection the server has closed fails once; retry on
+            # a fresh one.
+            for attempt in range(2):
+                if conn is None:
+                    conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    conn.request(method, path, body, headers)
+                    response = conn.getresponse()
+                    data = response.read()
+                    break
+                except (OSError, http.client.HTTPException) as e:
+                    conn.close()
+                    conn = None
+                    if attempt:
+                        raise OSError(f"coordination server {self.address}: {e}") from e
+        finally:
+            self._pool.put(conn)
+        reply = json.loads(data or b"{}")
+        if response.status != 200:
+            raise OSError(f"coordination server {self.address}: {reply.get('error', response.status)}")
+        return reply
+
+    def next_batch(self, size, release=()):
+        reply = self._request("POST", "/batch", {"size": size, "release": list(release)})
+        reply["rows"] = np.array(reply["rows"], dtype=np.int32)
+        reply["scores"] = np.array(reply["scores"], dtype=np.uint8)
+        return reply
+
+    def send_events(self, events):
+        return self._request("POST", "/events", {"events": events})
+
+    def status(self):
+        return self._request("GET", "/status")
+
+    def close(self):
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn.close()
+
+
+def export(db_path, personal_path, tracker_path):
+    # Writes the base personal wordlist and tracker with every merged
+    # decision applied on top.
+    import loader
+    from store import ScoreStore
+    personal = ScoreStore.from_frame(loader.load_personal_wordlist(personal_path), "score") \
+        if os.path.exists(personal_path) else ScoreStore("score")
+    tracker = ScoreStore.from_frame(loader.load_tracker(tracker_path), "rescored") \
+        if os.path.exists(tracker_path) else ScoreStore("rescored")
+    conn = connect(db_path)
+    try:
+        count = 0
+        for word, score, rescored in conn.execute("SELECT word, score, rescored FROM events"):
+            personal.restore(word, score)
+            tracker.restore(word, rescored)
+            count += 1
+    finally:
+        conn.close()
+    personal.save(personal_path)
+    tracker.save(tracker_path)
+    return count
+
+
+def load_state(args):
+    from session import SessionConfig, load_session
+    config = SessionConfig(args.master, args.personal, args.tracker, args.length_min, args.length_max,
+                           args.score_min, args.score_max, args.cache_dir, args.seed, 1, (), (), "text", "",
+                           False, False)
+    chunks, result = [], {}
+    load_session(config, lambda percent, text: print(text), lambda *stores: None,
+                 lambda rows, scores: chunks.append((rows, scores)),
+                 lambda index: result.setdefault("index", index))
+    index = result["index"]
+    rows = np.concatenate([rows for rows, _ in chunks]) if chunks else np.empty(0, dtype=np.int32)
+    scores = np.concatenate([scores for _, scores in chunks]) if chunks else np.empty(0, dtype=np.uint8)
+    return CoordinationState(index.words, rows, scores, index.done.copy(), args.db, args.lease_minutes * 60)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Share one master wordlist between several scorers: hand out disjoint batches "
+                    "of words and merge everyone's rescores.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the coordination server")
+    serve.add_argument("--master", required=True, help="master wordlist file (the same one every scorer uses)")
+    serve.add_argument("--personal", required=True, help="personal wordlist the team starts from")
+    serve.add_argument("--tracker", required=True, help="rescore tracker the team starts from")
+    serve.add_argument("--db", default="coordination.db", help="SQLite file holding the merged rescores")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on (0.0.0.0 for the LAN)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--length-min", type=int, default=6)
+    serve.add_argument("--length-max", type=int, default=10)
+    serve.add_argument("--score-min", type=int, default=25)
+    serve.add_argument("--score-max", type=int, default=60)
+    serve.add_argument("--seed", type=int, default=None, help="shuffle seed for the word order")
+    serve.add_argument("--lease-minutes", type=float, default=30,
+                       help="minutes after which an unfinished batch is handed out again")
+    serve.add_argument("--cache-dir", default="wordlister_cache")
+    serve.add_argument("--export", action="store_true",
+                       help="write the merged personal wordlist and tracker when the server stops")
+    out = commands.add_parser("export", help="write the merged rescores into the personal wordlist and tracker")
+    out.add_argument("--db", default="coordination.db")
+    out.add_argument("--personal", required=True)
+    out.add_argument("--tracker", required=True)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "export":
+            count = export(args.db, args.personal, args.tracker)
+            print(f"Merged {count} words into {args.personal} and {args.tracker}")
+            return 0
+        state = load_state(args)
+        server = CoordinationServer((args.host, args.port), state)
+        print(f"Serving {len(state.rows)} words on {args.host}:{server.server_address[1]}", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            state.conn.close()
+        if args.export:
+            count = export(args.db, args.personal, args.tracker)
+            print(f"Merged {count} words into {args.personal} and {args.tracker}")
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+import re
+from collections import namedtuple
+
+from scoring import score_buckets
+
+# How far each rescoring action moves a word along score_buckets (lower index
+# is a higher score). The GUI keys and the batch rules share these names.
+ACTION_STEPS = {
+    "increase": -1,
+    "decrease": 1,
+    "increase_double": -2,
+    "decrease_double": 2,
+    "keep": 0,
+}
+
+
+def apply_action(score, action):
+    idx = score_buckets.index(score)
+    new_idx = min(max(idx + ACTION_STEPS.get(action, 0), 0), len(score_buckets) - 1)
+    return score_buckets[new_idx]
+
+
+def icon_key(old_score, new_score):
+    diff = score_buckets.index(old_score) - score_buckets.index(new_score)
+    if diff > 0:
+        return "increase_2" if diff > 1 else "increase_1"
+    elif diff < 0:
+        return "decrease_2" if diff < -1 else "decrease_1"
+    return "keep"
+
+
+# One bulk rescoring rule. The filters that are None match every word; the
+# rule either moves the word's bucket by action or, if value is set, gives
+# it that exact score.
+Rule = namedtuple("Rule", ["text", "length_min", "length_max", "buckets",
+                           "score_min", "score_max", "pattern", "action", "value"])
+
+
+def _parse_range(term, text):
+    lo, sep, hi = text.partition("-")
+    try:
+        return int(lo), int(hi if sep else lo)
+    except ValueError:
+        raise ValueError(f"{term}: expected a number or a range like 3-5") from None
+
+
+def parse_rule(text):
+    # Rules are space separated terms, e.g. "length=3 bucket=50 set=25" or
+    # "regex=^QU length=4-6 increase". Terms: length=N[-M], bucket=B[,B...],
+    # score=N[-M] (the score before bucketing), regex=PATTERN (searched, use
+    # ^ and $ to anchor), and exactly one of set=SCORE or an action name.
+    fields = dict(text=text, length_min=None, length_max=None, buckets=None,
+                  score_min=None, score_max=None, pattern=None, action=None, value=None)
+    for term in text.split():
+        key, sep, arg = term.partition("=")
+        if not sep:
+            key, arg = "action", key
+        if key == "length":
+            fields["length_min"], fields["length_max"] = _parse_range(term, arg)
+        elif key == "score":
+            fields["score_min"], fields["score_max"] = _parse_range(term, arg)
+        elif key == "bucket":
+            try:
+                buckets = [int(b) for b in arg.split(",")]
+            except ValueError:
+                raise ValueError(f"{term}: buckets must be numbers") from None
+            unknown = [b for b in buckets if b not in score_buckets]
+            if unknown:
+                raise ValueError(f"{term}: not a score bucket: {unknown[0]}")
+            fields["buckets"] = buckets
+        elif key == "regex":
+            try:
+                fields["pattern"] = re.compile(arg)
+            except re.error as e:
+                raise ValueError(f"{term}: {e}") from None
+        elif key in ("set", "action"):
+            if fields["action"] is not None or fields["value"] is not None:
+                raise ValueError(f"{text}: more than one action")
+            if key == "set":
+                fields["value"] = _parse_range(term, arg)[0]
+            elif arg in ACTION_STEPS:
+                fields["action"] = arg
+            else:
+                raise ValueError(f"{term}: unknown action")
+        else:
+            raise ValueError(f"{term}: unknown term")
+    if fields["action"] is None and fields["value"] is None:
+        raise ValueError(f"{text}: no action (use set=SCORE or one of {', '.join(ACTION_STEPS)})")
+    return Rule(**fields)
+
+
+def parse_word_action(text):
+    # The right-hand side of a word list line: an action name or a score.
+    if text in ACTION_STEPS:
+        return text, None
+    try:
+        return None, int(text)
+    except ValueError:
+        raise ValueError(f"{text}: expected an action or a score") from None
+
+
+def load_word_actions(path):
+    # word;action or word;score per line. Later lines for the same word win.
+    actions = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            word, sep, arg = line.rpartition(";")
+            if not sep or not word:
+                raise ValueError(f"{path}:{number}: expected word;action")
+            try:
+                actions[word] = parse_word_action(arg.strip())
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from None
+    return actions
+
+
+def _stepped(buckets, action):
+    import numpy as np
+    order = np.array(score_buckets)
+    idx = np.searchsorted(-order, -buckets)
+    return order[np.clip(idx + ACTION_STEPS[action], 0, len(order) - 1)]
+
+
+def _rule_mask(rule, words, lengths, scores, buckets):
+    import numpy as np
+    mask = np.ones(len(words), dtype=bool)
+    if rule.length_min is not None:
+        mask &= (lengths >= rule.length_min) & (lengths <= rule.length_max)
+    if rule.score_min is not None:
+        mask &= (scores >= rule.score_min) & (scores <= rule.score_max)
+    if rule.buckets is not None:
+        mask &= np.isin(buckets, rule.buckets)
+    if rule.pattern is not None and mask.any():
+        hits = words[mask].str.contains(rule.pattern, regex=True).to_numpy(dtype=bool)
+        mask[np.flatnonzero(mask)[~hits]] = False
+    return mask
+
+
+class BatchReport:
+    def __init__(self, rules):
+        self.rows = 0
+        self.skipped = 0
+        self.changed = 0
+        self.by_rule = {rule.text: 0 for rule in rules}
+        self.by_word_list = 0
+
+    def summary(self):
+        lines = [f"{self.rows} words read, {self.skipped} already rescored and skipped, "
+                 f"{self.changed} rescored"]
+        lines += [f"  {count:>10}  {text}" for text, count in self.by_rule.items()]
+        if self.by_word_list:
+            lines.append(f"  {self.by_word_list:>10}  (word list)")
+        return "\n".join(lines)
+
+
+class BatchRescorer:
+    # Applies rules and per-word actions to the master wordlist a chunk at a
+    # time, writing the results into the personal and tracker stores exactly
+    # as the GUI would: the personal score is set and the word is marked as
+    # rescored. A word takes the first rule it matches; an entry in the word
+    # list overrides the rules. Words already marked as rescored are left
+    # alone unless include_rescored is set.
+
+    def __init__(self, rules=(), word_actions=None, include_rescored=False, track=True):
+        self.rules = list(rules)
+        self.word_actions = word_actions or {}
+        self.include_rescored = include_rescored
+        self.track = track
+
+    def run(self, chunks, personal, tracker, on_chunk=None):
+        report = BatchReport(self.rules)
+        for chunk in chunks:
+            self.rescore_chunk(chunk, personal, tracker, report)
+            if on_chunk is not None:
+                on_chunk(report)
+        return report
+
+    def rescore_chunk(self, chunk, personal, tracker, report):
+        import numpy as np
+        from scoring import map_scores_to_buckets, overlay_scores
+
+        words = chunk["word"].reset_index(drop=True)
+        report.rows += len(words)
+        scores = overlay_scores(words, chunk["score"].reset_index(drop=True), personal.as_dict()).to_numpy()
+        buckets = map_scores_to_buckets(scores)
+        lengths = words.str.len().to_numpy()
+
+        eligible = np.ones(len(words), dtype=bool)
+        if not self.include_rescored and not tracker.empty:
+            eligible = ~words.map(tracker.as_dict()).eq(1).to_numpy()
+            report.skipped += int((~eligible).sum())
+
+        # Index of the rule that rescored each word, -1 for none yet and
+        # len(rules) for the word list.
+        matched = np.full(len(words), -1, dtype=np.int64)
+        new_scores = np.zeros(len(words), dtype=np.int64)
+        for i, rule in enumerate(self.rules):
+            hit = eligible & (matched < 0)
+            if not hit.any():
+                break
+            hit &= _rule_mask(rule, words, lengths, scores, buckets)
+            if rule.value is not None:
+                new_scores[hit] = rule.value
+            else:
+                new_scores[hit] = _stepped(buckets[hit], rule.action)
+            matched[hit] = i
+
+        if self.word_actions:
+            listed = np.flatnonzero(eligible & words.isin(list(self.word_actions)).to_numpy())
+            for i in listed:
+                action, value = self.word_actions[words[i]]
+                new_scores[i] = value if value is not None else apply_action(int(buckets[i]), action)
+            matched[listed] = len(self.rules)
+
+        counts = np.bincount(matched[matched >= 0], minlength=len(self.rules) + 1)
+        for rule, count in zip(self.rules, counts):
+            report.by_rule[rule.text] += int(count)
+        report.by_word_list += int(counts[len(self.rules)])
+
+        changed = np.flatnonzero(matched >= 0)
+        for word, score in zip(words.to_numpy()[changed], new_scores[changed].tolist()):
+            personal.upsert(word, score)
+            if self.track:
+                tracker.upsert(word, 1)
+        report.changed += len(changed)
@@ -0,0 +1,128 @@
+import os
+
+RESCORE = "R"
+# Undo records of older versions, which only put back the score the word
+# was shown with. They are no longer written but still replayed.
+UNDO = "U"
+# Undo that puts back the word's exact earlier personal score and tracker
+# value; an empty field means the word was not in that list.
+RESTORE = "P"
+
+
+class Journal:
+    # Append-only log of rescore and undo actions, stored next to the personal
+    # wordlist. Records are collected in memory by the GUI thread with
+    # record_*() and handed to write() in batches, which may run on another
+    # thread; compact() folds them into the personal wordlist and tracker
+    # files and empties the log.
+    # Records are written in batches rather than after every action.
+    write_through = False
+
+    def __init__(self, path, compact_after=5000):
+        self.path = path
+        self.compact_after = compact_after
+        self._pending = []
+        self._file = None
+        self._torn_tail = None
+        self.record_count = 0
+
+    def __len__(self):
+        return self.record_count + len(self._pending)
+
+    def replay(self, personal, tracker):
+        if not os.path.exists(self.path):
+            return 0
+        replayed = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                # A last line without its newline is a torn write from a crash.
+                if not line.endswith("\n"):
+                    self._torn_tail = len(line.encode("utf-8"))
+                    continue
+                parts = line.rstrip("\n").split(";")
+                if len(parts) == 4 and parts[0] == RESTORE:
+                    _, word, score, rescored = parts
+                    try:
+                        personal.restore(word, int(score) if score else None)
+                        tracker.restore(word, int(rescored) if rescored else None)
+                    except ValueError:
+                        continue
+                    replayed += 1
+                    continue
+                if len(parts) != 3:
+                    continue
+                op, word, score = parts
+                try:
+                    score = int(score)
+                except ValueError:
+                    continue
+                if op == RESCORE:
+                    personal.upsert(word, score)
+                    tracker.upsert(word, 1)
+                elif op == UNDO:
+                    personal.revert(word, score)
+                    tracker.revert(word, 0)
+                else:
+                    continue
+                replayed += 1
+        self.record_count = replayed
+        return replayed
+
+    def record_rescore(self, word, score):
+        self._append(RESCORE, word, score)
+
+    def record_restore(self, word, score, rescored):
+        score = "" if score is None else score
+        rescored = "" if rescored is None else rescored
+        self._pending.append(f"{RESTORE};{word};{score};{rescored}\n")
+
+    def _append(self, op, word, score):
+        self._pending.append(f"{op};{word};{score}\n")
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def take_pending(self):
+        lines, self._pending = self._pending, []
+        self.record_count += len(lines)
+        return lines
+
+    def take_for_compaction(self):
+        lines = self.take_pending()
+        self.record_count = 0
+        return lines
+
+    def write(self, lines):
+        if not lines:
+            return
+        if self._file is None:
+            if self._torn_tail:
+                os.truncate(self.path, os.path.getsize(self.path) - self._torn_tail)
+                self._torn_tail = None
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write("".join(lines))
+        self._file.flush()
+
+    def flush(self):
+        self.write(self.take_pending())
+
+    def needs_compaction(self):
+        return len(self) >= self.compact_after
+
+    def compact(self, lines, *writers):
+        # Each writer replaces its target file atomically. The journal is only
+        # emptied once all of them have succeeded; replaying it again on top of
+        # the compacted files would give the same result.
+        self.write(lines)
+        for write in writers:
+            write()
+        self.close()
+        with open(self.path, "w", encoding="utf-8"):
+            pass
+        self._torn_tail = None
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
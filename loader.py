@@ -0,0 +1,291 @@
+import hashlib
+import io
+import json
+import os
+
+import pandas as pd
+
+from word_store import WordBuffer, compact_scores, load_arrays, save_arrays
+
+SNAPSHOT_VERSION = 3
+SNAPSHOT_ARRAYS = ("words", "offsets", "lengths", "scores")
+CHANGE_ARRAYS = ("added", "rescored", "old_scores")
+
+
+def empty_word_table(value_column="score"):
+    return pd.DataFrame(columns=["word", value_column])
+
+
+def read_word_table(path, value_column="score"):
+    # Fast path: C parser with explicit dtypes. Words such as NAN or NULL are
+    # real crossword entries, so NA detection is switched off.
+    if os.path.getsize(path) == 0:
+        return empty_word_table(value_column)
+    names = ["word", value_column]
+    try:
+        return pd.read_csv(
+            path, sep=";", names=names, engine="c", encoding="utf-8",
+            dtype={"word": str, value_column: "int64"}, na_filter=False,
+        )
+    except ValueError:
+        return read_word_table_slow(path, value_column)
+
+
+def read_word_table_slow(path, value_column="score"):
+    # Fallback for malformed files: skip lines with extra fields and drop
+    # lines whose value is missing or not numeric.
+    names = ["word", value_column]
+    df = pd.read_csv(
+        path, sep=";", names=names, engine="python", encoding="utf-8",
+        dtype=str, na_filter=False, on_bad_lines="skip",
+    )
+    return _numeric_values(df, value_column)
+
+
+def _numeric_values(df, value_column):
+    values = pd.to_numeric(df[value_column].str.strip(), errors="coerce")
+    df = df[values.notna()].copy()
+    df[value_column] = values[values.notna()].astype("int64")
+    return df.reset_index(drop=True)
+
+
+def parse_word_bytes(data, value_column="score"):
+    # Same parsing rules as read_word_table, for text already in memory.
+    if not data.strip():
+        return empty_word_table(value_column)
+    names = ["word", value_column]
+    try:
+        return pd.read_csv(io.BytesIO(data), sep=";", names=names, engine="c", encoding="utf-8",
+                           dtype={"word": str, value_column: "int64"}, na_filter=False)
+    except ValueError:
+        df = pd.read_csv(io.BytesIO(data), sep=";", names=names, engine="c", encoding="utf-8",
+                         dtype=str, na_filter=False, on_bad_lines="skip")
+        return _numeric_values(df, value_column)
+
+
+def iter_word_table(path, value_column="score", chunk_size=500_000):
+    # Streams a word table as DataFrame chunks, for lists too large to hold
+    # at once. Bad lines are dropped as in read_word_table_slow.
+    if os.path.getsize(path) == 0:
+        return
+    reader = pd.read_csv(
+        path, sep=";", names=["word", value_column], engine="c", encoding="utf-8",
+        dtype=str, na_filter=False, on_bad_lines="skip", chunksize=chunk_size,
+    )
+    with reader:
+        for df in reader:
+            yield _numeric_values(df, value_column)
+
+
+def file_digest(path, chunk_size=1 << 20):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def snapshot_meta_path(path, cache_dir):
+    key = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, key + ".json")
+
+
+def snapshot_base(cache_dir, digest):
+    # Snapshot arrays are named after the content digest of the list they
+    # hold; the meta file, named after the list's path, says which one is
+    # current.
+    return os.path.join(cache_dir, digest)
+
+
+def _write_atomic(target, write):
+    tmp = target + ".tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, target)
+
+
+def read_snapshot_meta(path, cache_dir):
+    try:
+        with open(snapshot_meta_path(path, cache_dir), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _snapshot_arrays(cache_dir, meta, names):
+    if not meta or meta.get("version") != SNAPSHOT_VERSION:
+        return None
+    try:
+        arrays = load_arrays(snapshot_base(cache_dir, meta["digest"]), names)
+    except (OSError, ValueError):
+        return None
+    if arrays is None:
+        return None
+    words = WordBuffer.from_arrays(arrays)
+    if len(words) != meta.get("rows") or len(arrays["scores"]) != len(words) \
+            or len(arrays["offsets"]) != len(words) + 1:
+        return None
+    return words, arrays
+
+
+def load_snapshot(path, cache_dir):
+    meta = read_snapshot_meta(path, cache_dir)
+    if not meta or meta.get("version") != SNAPSHOT_VERSION:
+        return None
+    sig = file_signature(path)
+    if meta["size"] != sig["size"]:
+        return None
+    if meta["mtime_ns"] != sig["mtime_ns"]:
+        # Same size but touched: only trust the snapshot if the content hash
+        # still matches, then refresh the stored mtime.
+        if file_digest(path) != meta["digest"]:
+            return None
+        meta["mtime_ns"] = sig["mtime_ns"]
+        write_snapshot_meta(path, cache_dir, meta)
+    snapshot = _snapshot_arrays(cache_dir, meta, SNAPSHOT_ARRAYS)
+    if snapshot is None:
+        return None
+    words, arrays = snapshot
+    return words, arrays["scores"]
+
+
+def load_previous_snapshot(path, cache_dir):
+    # The snapshot of the list as it was last loaded, with its line hashes,
+    # for diffing against a changed file: (words, scores, hashes, digest).
+    meta = read_snapshot_meta(path, cache_dir)
+    snapshot = _snapshot_arrays(cache_dir, meta, SNAPSHOT_ARRAYS + ("hashes",))
+    if snapshot is None:
+        return None
+    words, arrays = snapshot
+    if len(arrays["hashes"]) != len(words):
+        return None
+    return words, arrays["scores"], arrays["hashes"], meta["digest"]
+
+
+def write_snapshot_meta(path, cache_dir, meta):
+    try:
+        _write_atomic(snapshot_meta_path(path, cache_dir),
+                      lambda f: f.write(json.dumps(meta).encode("utf-8")))
+    except OSError:
+        pass
+
+
+def _remove_snapshot(cache_dir, meta):
+    # Deletes a superseded snapshot's files unless another list's meta still
+    # points at the same content.
+    import glob
+    if meta.get("version") == SNAPSHOT_VERSION:
+        for other in glob.glob(os.path.join(cache_dir, "*.json")):
+            try:
+                with open(other, "r", encoding="utf-8") as f:
+                    if json.load(f).get("digest") == meta["digest"]:
+                        return
+            except (OSError, ValueError):
+                continue
+        base = snapshot_base(cache_dir, meta["digest"])
+    else:
+        # Older snapshots were named after the list's path.
+        base = snapshot_meta_path(meta.get("source", ""), cache_dir)[:-len(".json")]
+    for name in glob.glob(glob.escape(base) + ".*.npy"):
+        try:
+            os.remove(name)
+        except OSError:
+            pass
+
+
+def write_snapshot(path, cache_dir, words, scores, digest=None, hashes=None, changes=None):
+    # On Windows removing the previous snapshot fails while it is still
+    # mapped; it is then left for a later run to clean up. The line hashes
+    # are only kept when the file parsed one row per line, which is what a
+    # later diff relies on.
+    import master_diff
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        if digest is None:
+            digest, hashes = master_diff.scan_file(path)
+        previous = read_snapshot_meta(path, cache_dir)
+        meta = dict(file_signature(path), version=SNAPSHOT_VERSION, digest=digest,
+                    source=os.path.abspath(path), rows=len(words))
+        base = snapshot_base(cache_dir, digest)
+        arrays = dict(words.arrays(), scores=scores)
+        if len(hashes) == len(words):
+            arrays["hashes"] = hashes
+        save_arrays(base, arrays, _write_atomic)
+        if changes is not None:
+            save_arrays(base + ".changes", changes.arrays(), _write_atomic)
+            meta["changes"] = changes.meta()
+    except OSError:
+        return
+    write_snapshot_meta(path, cache_dir, meta)
+    if previous and (previous.get("version") != SNAPSHOT_VERSION or previous.get("digest") != digest):
+        _remove_snapshot(cache_dir, previous)
+
+
+def load_master_changes(path, cache_dir):
+    # What changed in the master list at its last reload, or None.
+    from master_diff import MasterChanges
+    meta = read_snapshot_meta(path, cache_dir)
+    if not meta or meta.get("version") != SNAPSHOT_VERSION or "changes" not in meta:
+        return None
+    try:
+        arrays = load_arrays(snapshot_base(cache_dir, meta["digest"]) + ".changes", CHANGE_ARRAYS, mmap=False)
+    except (OSError, ValueError):
+        return None
+    if arrays is None:
+        return None
+    info = meta["changes"]
+    return MasterChanges(arrays["added"], arrays["rescored"], arrays["old_scores"], info["removed"],
+                         info["previous"], info["requeued"])
+
+
+def mark_changes_requeued(path, cache_dir):
+    meta = read_snapshot_meta(path, cache_dir)
+    if meta and "changes" in meta:
+        meta["changes"]["requeued"] = True
+        write_snapshot_meta(path, cache_dir, meta)
+
+
+def load_master_wordlist(path, cache_dir=None, workers=1):
+    # The master list as a WordBuffer and a uint8 score array. With a cache
+    # directory both come memory-mapped from the snapshot after the first
+    # parse, so only the pages actually touched are read into memory.
+    if not os.path.exists(path):
+        return None
+    if cache_dir:
+        snapshot = load_snapshot(path, cache_dir)
+        if snapshot is not None:
+            return snapshot
+        # The list changed since it was last loaded: only its new and changed
+        # lines are parsed, and what changed is kept with the new snapshot.
+        previous = load_previous_snapshot(path, cache_dir)
+        if previous is not None:
+            import master_diff
+            result = master_diff.diff_master(path, *previous)
+            if result is not None:
+                words, scores, hashes, digest, changes = result
+                write_snapshot(path, cache_dir, words, scores, digest, hashes, changes)
+                return words, scores
+    import parallel
+    if workers != 1 and os.path.getsize(path) > parallel.DEFAULT_CHUNK_BYTES:
+        # Large lists are parsed a byte range at a time on a process pool.
+        df = parallel.run_pipeline([path], workers=workers)
+    else:
+        df = read_word_table(path, "score")
+    words, scores = WordBuffer.from_words(df["word"].tolist()), compact_scores(df["score"])
+    del df
+    if cache_dir:
+        write_snapshot(path, cache_dir, words, scores)
+    return words, scores
+
+
+def load_personal_wordlist(path):
+    return read_word_table(path, "score")
+
+
+def load_tracker(path):
+    return read_word_table(path, "rescored")
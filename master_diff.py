@@ -0,0 +1,175 @@
+import hashlib
+
+import numpy as np
+
+from word_store import WordBuffer, compact_scores
+
+SCAN_CHUNK_BYTES = 1 << 20
+# Odd multiplier of the per-line polynomial hash, and its inverse mod 2**64.
+_P = 0x100000001B3
+_P_INV = pow(_P, -1, 1 << 64)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _powers(base, n):
+    # base**0 .. base**(n - 1), wrapping mod 2**64.
+    powers = np.full(n, base, dtype=np.uint64)
+    powers[0] = 1
+    return np.cumprod(powers, dtype=np.uint64)
+
+
+class LineScan:
+    # One pass over a master wordlist file that yields the content digest of
+    # the whole file and a 64-bit hash of every non-blank line, in file
+    # order. Blank lines are the ones the parser skips, so when the file
+    # parses cleanly line i of the scan is row i of the parsed list. A line
+    # hash covers the line's bytes without its line ending, so an unchanged
+    # word;score line hashes the same wherever it moves in the file.
+
+    def __init__(self, chunk_bytes=SCAN_CHUNK_BYTES):
+        self.chunk_bytes = chunk_bytes
+        self.powers = _powers(_P, chunk_bytes + 1)
+        self.inverse = _powers(_P_INV, chunk_bytes + 1)
+
+    def chunks(self, path):
+        # (bytes, line starts, line ends, line hashes) per chunk of whole
+        # lines, non-blank lines only, and finally the file digest in
+        # self.digest.
+        digest = hashlib.blake2b(digest_size=20)
+        tail = b""
+        with open(path, "rb") as f:
+            while True:
+                block = f.read(self.chunk_bytes - len(tail))
+                digest.update(block)
+                data = tail + block
+                if not block:
+                    if data:
+                        yield (data,) + self.hash_lines(data)
+                    break
+                cut = data.rfind(b"\n") + 1
+                if cut == 0 and len(data) < self.chunk_bytes:
+                    tail = data
+                    continue
+                cut = cut or len(data)
+                tail = data[cut:]
+                yield (data[:cut],) + self.hash_lines(data[:cut])
+        self.digest = digest.hexdigest()
+
+    def hash_lines(self, data):
+        buf = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(buf == 10)
+        starts = np.concatenate(([0], newlines + 1))
+        ends = np.concatenate((newlines, [len(buf)]))
+        if starts[-1] == len(buf):
+            starts, ends = starts[:-1], ends[:-1]
+        # A \r before the newline is part of the line ending.
+        cr = (ends > starts) & (buf[np.maximum(ends - 1, 0)] == 13)
+        ends = ends - cr
+        keep = ends > starts
+        starts, ends = starts[keep], ends[keep]
+        prefix = np.zeros(len(buf) + 1, dtype=np.uint64)
+        np.cumsum(buf.astype(np.uint64) * self.powers[:len(buf)], dtype=np.uint64, out=prefix[1:])
+        hashes = (prefix[ends] - prefix[starts]) * self.inverse[starts]
+        hashes = (hashes ^ (ends - starts).astype(np.uint64)) * _MIX
+        return starts, ends, hashes ^ (hashes >> np.uint64(29))
+
+
+def scan_file(path):
+    # The file digest and the hash of every non-blank line.
+    scan = LineScan()
+    hashes = [h for _, _, _, h in scan.chunks(path)]
+    return scan.digest, np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+
+
+class MasterChanges:
+    # What changed between the previously loaded master list and the current
+    # one: new rows, rows whose master score changed (with the old score) and
+    # the number of words that are gone. Rows are rows of the new list.
+
+    def __init__(self, added, rescored, old_scores, removed, previous, requeued=False):
+        self.added = added
+        self.rescored = rescored
+        self.old_scores = old_scores
+        self.removed = removed
+        self.previous = previous
+        self.requeued = requeued
+
+    def rows(self):
+        return np.union1d(self.added, self.rescored)
+
+    def arrays(self):
+        return {"added": self.added, "rescored": self.rescored, "old_scores": self.old_scores}
+
+    def meta(self):
+        return {"added": len(self.added), "rescored": len(self.rescored), "removed": self.removed,
+                "previous": self.previous, "requeued": self.requeued}
+
+    def summary(self):
+        return f"{len(self.added)} added, {self.removed} removed, {len(self.rescored)} rescored"
+
+
+def diff_master(path, old_words, old_scores, old_hashes, previous):
+    # Streams the new master list against the previous snapshot. Lines whose
+    # hash is in the snapshot reuse its row; only the other lines are parsed.
+    # Returns (words, scores, hashes, digest, changes), or None when the
+    # changed lines do not parse one row per line (a malformed file), in
+    # which case the caller parses the whole file instead.
+    import loader
+    # Plain views of the memory-mapped snapshot, which index faster.
+    old_words = WordBuffer(*(np.asarray(a) for a in (old_words.data, old_words.offsets, old_words.lengths)))
+    old_scores = np.asarray(old_scores)
+    order = np.argsort(old_hashes)
+    known = old_hashes[order]
+    # Equal hashes share a group; a group any new line matched is kept.
+    groups = np.zeros(len(known), dtype=np.int64)
+    np.cumsum(known[1:] != known[:-1], out=groups[1:])
+    kept = np.zeros(len(known) and int(groups[-1]) + 1, dtype=bool)
+    scan = LineScan()
+    sources, hashes, pending = [], [], []
+    parsed_count = 0
+    for data, starts, ends, chunk_hashes in scan.chunks(path):
+        # Looking up the hashes in sorted order keeps the search cache friendly.
+        lookup = np.argsort(chunk_hashes)
+        slots = np.empty(len(chunk_hashes), dtype=np.int64)
+        slots[lookup] = np.searchsorted(known, chunk_hashes[lookup])
+        slots = np.minimum(slots, max(len(known) - 1, 0))
+        matched = known[slots] == chunk_hashes if len(known) else np.zeros(len(chunk_hashes), dtype=bool)
+        source = np.where(matched, order[slots] if len(known) else 0, -1)
+        kept[groups[slots[matched]]] = True
+        fresh = np.flatnonzero(~matched)
+        source[fresh] = len(old_words) + parsed_count + np.arange(len(fresh))
+        parsed_count += len(fresh)
+        pending.extend(data[s:e] for s, e in zip(starts[fresh].tolist(), ends[fresh].tolist()))
+        sources.append(source)
+        hashes.append(chunk_hashes)
+    hashes = np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+    sources = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+
+    if pending:
+        df = loader.parse_word_bytes(b"\n".join(pending) + b"\n")
+        if len(df) != len(pending):
+            return None
+        parsed_words, parsed_scores = WordBuffer.from_words(df["word"].tolist()), compact_scores(df["score"])
+    else:
+        parsed_words, parsed_scores = WordBuffer.from_words([]), np.empty(0, dtype=np.uint8)
+    words = WordBuffer.concat([old_words, parsed_words]).take(sources)
+    scores = np.concatenate([old_scores, parsed_scores])[sources]
+
+    # Old rows whose line is nowhere in the new file were removed or had
+    # their score changed; new rows from parsed lines were added or had
+    # their score changed. Telling those apart only needs the words on both
+    # sides, a small set for a small update.
+    gone = np.sort(order[~kept[groups]])
+    old_by_word = dict(zip(old_words[gone], old_scores[gone].tolist()))
+    new_rows = np.flatnonzero(sources >= len(old_words))
+    added, rescored, previous_scores = [], [], []
+    for row, word, score in zip(new_rows.tolist(), words[new_rows], scores[new_rows].tolist()):
+        old = old_by_word.pop(word, None)
+        if old is None:
+            added.append(row)
+        elif old != score:
+            rescored.append(row)
+            previous_scores.append(old)
+    changes = MasterChanges(np.array(added, dtype=np.int64), np.array(rescored, dtype=np.int64),
+                            np.array(previous_scores, dtype=np.uint8), len(old_by_word), previous)
+    return words, scores, hashes, scan.digest, changes
@@ -0,0 +1,111 @@
+import numpy as np
+
+from partition_index import PartitionIndex
+from scoring import map_scores_to_buckets
+from word_store import compact_scores
+
+
+class MasterIndex:
+    # Column arrays for the master wordlist, used to rebuild the word queue
+    # without going back to pandas or the disk. words is a WordBuffer and
+    # raw_scores a uint8 array, both possibly memory-mapped.
+    #
+    # Rows are stored in one shuffled order: slot i describes master row
+    # order[i]. Any filter therefore comes out already shuffled, and the
+    # columns can be filled a chunk of slots at a time while loading.
+
+    def __init__(self, words, raw_scores, seed=None):
+        n = len(words)
+        self.words = words
+        self.raw_scores = raw_scores
+        self.order = np.random.default_rng(seed).permutation(n).astype(np.int32)
+        self.slot = np.empty(n, dtype=np.int32)
+        self.slot[self.order] = np.arange(n, dtype=np.int32)
+        self.scores = np.zeros(n, dtype=np.uint8)
+        self.lengths = np.zeros(n, dtype=np.uint8)
+        self.buckets = np.zeros(n, dtype=np.uint8)
+        # Rescored flag per master row, the session's view of the tracker.
+        self.done = np.zeros(n, dtype=bool)
+        self.filled = 0
+        self.partition = PartitionIndex()
+        self.signature = None
+        # For a merged wordlist stack: the layer each row's score came from,
+        # as an index into source_names.
+        self.source = None
+        self.source_names = None
+        # What the last master list update changed (a MasterChanges), and a
+        # flag per row for the words it added or rescored.
+        self.changes = None
+        self.changed = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def fill(self, stop, overrides, done):
+        # Compute score (with personal overrides), length and bucket for the
+        # slots up to stop, and count them into the partition index. Words
+        # are only decoded from the buffer when there are overrides or
+        # rescored words to look up.
+        start, stop = self.filled, min(stop, len(self))
+        rows = self.order[start:stop]
+        self.lengths[start:stop] = self.words.lengths[rows]
+        if overrides or len(done):
+            import pandas as pd
+            from scoring import overlay_scores
+            words = pd.Series(self.words[rows], dtype=object)
+            scores = overlay_scores(words, pd.Series(self.raw_scores[rows]), overrides)
+            self.scores[start:stop] = compact_scores(scores.to_numpy())
+            self.done[rows] = words.isin(done).to_numpy()
+        else:
+            self.scores[start:stop] = self.raw_scores[rows]
+        self.buckets[start:stop] = map_scores_to_buckets(self.scores[start:stop])
+        self.partition.add(self.lengths[start:stop], self.scores[start:stop], self.done[rows])
+        self.filled = stop
+
+    def set_changes(self, changes):
+        self.changes = changes
+        self.changed = None
+        if changes is not None:
+            self.changed = np.zeros(len(self), dtype=bool)
+            self.changed[changes.rows()] = True
+
+    def select(self, length_min, length_max, score_min, score_max, changed_only=False, start=0, stop=None):
+        # Slots in [start, stop) passing the filters, in shuffled order. With
+        # changed_only, only words new or rescored in the last master list
+        # update pass.
+        stop = self.filled if stop is None else min(stop, self.filled)
+        scores = self.scores[start:stop]
+        lengths = self.lengths[start:stop]
+        mask = ((scores >= score_min) & (scores <= score_max) &
+                (lengths >= length_min) & (lengths <= length_max))
+        if changed_only:
+            if self.changed is None:
+                return np.empty(0, dtype=np.int64)
+            mask &= self.changed[self.order[start:stop]]
+        return np.flatnonzero(mask) + start
+
+    def matches(self, row, length_min, length_max, score_min, score_max, changed_only=False):
+        slot = self.slot[row]
+        if changed_only and (self.changed is None or not self.changed[row]):
+            return False
+        return (score_min <= self.scores[slot] <= score_max and
+                length_min <= self.lengths[slot] <= length_max)
+
+    def count(self, length_min, length_max, score_min, score_max, changed_only=False):
+        # (done, total) for the filters; the partition index only counts by
+        # length and score, so the changed words are counted directly.
+        if not changed_only:
+            return self.partition.count(length_min, length_max, score_min, score_max)
+        rows = self.order[self.select(length_min, length_max, score_min, score_max, True)]
+        return int(self.done[rows].sum()), len(rows)
+
+    def mark_done(self, row, done):
+        # Returns whether the flag changed. Scores stay as loaded, so a word
+        # keeps counting towards the filter it was queued under even after it
+        # has been rescored out of its range.
+        if self.done[row] == done:
+            return False
+        self.done[row] = done
+        slot = self.slot[row]
+        self.partition.mark(int(self.lengths[slot]), int(self.scores[slot]), 1 if done else -1)
+        return True
@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+import numpy as np
+
+ABSENT = -1
+
+# One rescore: the master row, the bucketed score it was queued with, the
+# score it was given, and the word's personal score and tracker value
+# before the rescore (None when the word was not in that list).
+Op = namedtuple("Op", ["row", "shown_score", "new_score", "prev_score", "prev_rescored"])
+
+
+class OpLog:
+    # The session's rescores as fixed-size records in growable numpy arrays,
+    # about ten bytes each, so the history is never cut short. Records before
+    # position are applied and those from position on have been undone and
+    # can be redone; undo and redo just move position. Recording a new
+    # rescore after an undo drops the redo tail, as in any editor. Ops
+    # pushed with joined=True belong to the previous op's batch (a word
+    # rescored together with its related words) and are undone and redone
+    # with it in one step.
+
+    def __init__(self, capacity=1024):
+        self.rows = np.empty(capacity, dtype=np.int32)
+        self.shown_scores = np.empty(capacity, dtype=np.uint8)
+        self.new_scores = np.empty(capacity, dtype=np.int16)
+        self.prev_scores = np.empty(capacity, dtype=np.int16)
+        self.prev_rescored = np.empty(capacity, dtype=np.int8)
+        self.batches = np.empty(capacity, dtype=np.int32)
+        self.size = 0
+        self.position = 0
+
+    def __len__(self):
+        return self.size
+
+    def _grow(self):
+        capacity = 2 * len(self.rows)
+        for name in ("rows", "shown_scores", "new_scores", "prev_scores", "prev_rescored", "batches"):
+            setattr(self, name, np.resize(getattr(self, name), capacity))
+
+    def push(self, row, shown_score, new_score, prev_score, prev_rescored, joined=False):
+        self.size = self.position
+        if self.size == len(self.rows):
+            self._grow()
+        i = self.size
+        self.rows[i] = row
+        self.shown_scores[i] = shown_score
+        self.new_scores[i] = new_score
+        self.prev_scores[i] = ABSENT if prev_score is None else prev_score
+        self.prev_rescored[i] = ABSENT if prev_rescored is None else prev_rescored
+        self.batches[i] = self.batches[i - 1] if joined and i > 0 else i
+        self.size += 1
+        self.position = self.size
+
+    def op(self, i):
+        prev_score = int(self.prev_scores[i])
+        prev_rescored = int(self.prev_rescored[i])
+        return Op(int(self.rows[i]), int(self.shown_scores[i]), int(self.new_scores[i]),
+                  None if prev_score == ABSENT else prev_score,
+                  None if prev_rescored == ABSENT else prev_rescored)
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < self.size
+
+    def undo(self):
+        # The ops of the last batch, newest first, to revert; an empty list
+        # at the start of the session.
+        if not self.can_undo():
+            return []
+        stop = self.position
+        self.position = int(self.batches[stop - 1])
+        return [self.op(i) for i in range(stop - 1, self.position - 1, -1)]
+
+    def redo(self):
+        if not self.can_redo():
+            return []
+        start = self.position
+        batch = self.batches[start]
+        while self.position < self.size and self.batches[self.position] == batch:
+            self.position += 1
+        return [self.op(i) for i in range(start, self.position)]
+
+    def clear(self):
+        self.size = self.position = 0
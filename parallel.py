@@ -0,0 +1,95 @@
+import os
+from collections import deque
+
+import pandas as pd
+
+DEFAULT_CHUNK_BYTES = 32 << 20
+
+# Set in each worker process by _init_worker, so the personal overrides are
+# sent once per worker rather than with every chunk.
+_overrides = None
+_filters = None
+
+
+def byte_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    # Splits a file into (start, end) byte ranges of about chunk_bytes, each
+    # ending just after a newline so no line is cut in two.
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(start + chunk_bytes, size)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def parse_range(path, start, end, value_column="score"):
+    # Same parsing rules as loader.read_word_table, for one byte range.
+    import loader
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return loader.parse_word_bytes(data, value_column)
+
+
+def score_frame(df, overrides=None, filters=None):
+    # Personal overlay, then the GUI's filters and bucket mapping when
+    # filters (length_min, length_max, score_min, score_max) are given.
+    from scoring import filter_wordlist, overlay_scores
+    if overrides:
+        df = df.assign(score=overlay_scores(df["word"], df["score"], overrides))
+    if filters is not None:
+        df = filter_wordlist(df, *filters).reset_index(drop=True)
+    return df
+
+
+def _init_worker(overrides, filters):
+    global _overrides, _filters
+    _overrides, _filters = overrides, filters
+
+
+def _process_range(task):
+    path, start, end = task
+    return score_frame(parse_range(path, start, end), _overrides, _filters)
+
+
+def iter_pipeline(paths, overrides=None, filters=None, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    # Parses and scores the files a byte range at a time on a process pool,
+    # yielding one DataFrame per range in file and range order, so the output
+    # is the same for any worker count. At most two ranges per worker are in
+    # flight, which bounds memory whatever the total input size.
+    workers = workers or os.cpu_count() or 1
+    tasks = [(path, start, end) for path in paths for start, end in byte_ranges(path, chunk_bytes)]
+    if workers == 1:
+        for path, start, end in tasks:
+            yield score_frame(parse_range(path, start, end), overrides, filters)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    # Spawned rather than forked workers: the GUI calls this from its loader
+    # thread, and forking a threaded process is unsafe.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                             initargs=(overrides, filters)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.submit(_process_range, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def run_pipeline(paths, overrides=None, filters=None, workers=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    import loader
+    frames = [df for df in iter_pipeline(paths, overrides, filters, workers, chunk_bytes) if len(df)]
+    if not frames:
+        return loader.empty_word_table()
+    return pd.concat(frames, ignore_index=True)
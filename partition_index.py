@@ -0,0 +1,64 @@
+import threading
+
+import numpy as np
+
+from scoring import score_buckets, map_scores_to_buckets
+
+
+class PartitionIndex:
+    # Word counts of the master list per (length, score) cell, split into
+    # total and already-rescored. A filter is a rectangle of cells, so its
+    # counts are a slice sum instead of a scan over the words. Cells use the
+    # exact score rather than its bucket because the score filter is applied
+    # before bucketing; bucket_grid() folds the score columns into buckets.
+    # The loader thread adds cells while the GUI thread moves and reads them,
+    # hence the lock.
+
+    def __init__(self, max_length=32, max_score=100):
+        self.total = np.zeros((max_length + 1, max_score + 1), dtype=np.int64)
+        self.done = np.zeros_like(self.total)
+        self._lock = threading.Lock()
+
+    def _grow(self, max_length, max_score):
+        rows = max(max_length + 1, self.total.shape[0])
+        cols = max(max_score + 1, self.total.shape[1])
+        if (rows, cols) != self.total.shape:
+            pad = ((0, rows - self.total.shape[0]), (0, cols - self.total.shape[1]))
+            self.total = np.pad(self.total, pad)
+            self.done = np.pad(self.done, pad)
+
+    def add(self, lengths, scores, done_mask):
+        if not len(lengths):
+            return
+        scores = np.clip(scores, 0, None)
+        with self._lock:
+            self._grow(int(lengths.max()), int(scores.max()))
+            np.add.at(self.total, (lengths, scores), 1)
+            np.add.at(self.done, (lengths[done_mask], scores[done_mask]), 1)
+
+    def mark(self, length, score, delta):
+        # delta is +1 when a word becomes rescored and -1 when that is undone.
+        with self._lock:
+            self.done[length, max(score, 0)] += delta
+
+    def _window(self, length_min, length_max, score_min, score_max):
+        return (slice(max(length_min, 0), max(length_max + 1, 0)),
+                slice(max(score_min, 0), max(score_max + 1, 0)))
+
+    def count(self, length_min, length_max, score_min, score_max):
+        # (done, total) for the words passing the filters.
+        window = self._window(length_min, length_max, score_min, score_max)
+        with self._lock:
+            return int(self.done[window].sum()), int(self.total[window].sum())
+
+    def bucket_grid(self):
+        # Unscored words per (length, bucket), for lengths that have words.
+        # Returns the lengths, the buckets in score_buckets order and a
+        # len(lengths) x len(buckets) array of counts.
+        with self._lock:
+            total = self.total.copy()
+            unscored = total - self.done
+        columns = map_scores_to_buckets(np.arange(total.shape[1]))
+        grid = np.stack([unscored[:, columns == b].sum(axis=1) for b in score_buckets], axis=1)
+        lengths = np.flatnonzero(total.sum(axis=1))
+        return lengths, list(score_buckets), grid[lengths]
@@ -0,0 +1,157 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class PersistenceWorker(QObject):
+    # Runs all journal and wordlist writes on a single background thread, in
+    # submission order. Results come back to the GUI thread through the
+    # saved/failed signals. Records whose write fails are kept and written
+    # ahead of the next batch for the same journal. last_error is the error
+    # of the last write that ran, None once a write succeeds.
+    saved = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None, telemetry=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordlister-io")
+        self._lock = threading.Lock()
+        self._queued_batch = None
+        self._retry = None
+        self.last_error = None
+
+    def flush(self, journal, lines):
+        # Batches submitted while an earlier one is still waiting to run are
+        # merged into it, so a burst of saves costs a single write.
+        with self._lock:
+            if self._retry is not None and self._retry[0] is journal:
+                lines = self._retry[1] + list(lines)
+                self._retry = None
+            if not lines:
+                return
+            if self._queued_batch is not None:
+                self._queued_batch.extend(lines)
+                return
+            batch = self._queued_batch = list(lines)
+        self._submit(self._write_batch, "Saved", journal, batch)
+
+    def _write_batch(self, journal, batch):
+        with self._lock:
+            if self._queued_batch is batch:
+                self._queued_batch = None
+        try:
+            journal.write(batch)
+        except Exception:
+            self._keep_for_retry(journal, batch)
+            raise
+
+    def _keep_for_retry(self, journal, lines):
+        # A batch already waiting to run goes after the failed one, so the
+        # failed records are put in front of it to keep the journal order.
+        with self._lock:
+            if self._queued_batch is not None:
+                self._queued_batch[:0] = lines
+            elif self._retry is not None and self._retry[0] is journal:
+                self._retry = (journal, lines + self._retry[1])
+            else:
+                self._retry = (journal, list(lines))
+
+    def compact(self, journal, lines, *writers):
+        # Records submitted after this point must not be merged into a batch
+        # that runs before the compaction empties the journal.
+        with self._lock:
+            self._queued_batch = None
+            if self._retry is not None and self._retry[0] is journal:
+                lines = self._retry[1] + list(lines)
+                self._retry = None
+        self._submit(self._compact, "Saved", journal, lines, *writers)
+
+    def _compact(self, journal, lines, *writers):
+        try:
+            journal.compact(lines, *writers)
+        except Exception:
+            self._keep_for_retry(journal, lines)
+            raise
+
+    def _submit(self, fn, message, *args):
+        if self.telemetry is not None:
+            fn = self.telemetry.timed("disk:" + fn.__name__.strip("_"), fn)
+
+        def run():
+            try:
+                fn(*args)
+            except Exception as e:
+                self.last_error = str(e)
+                self.failed.emit(self.last_error)
+                raise
+            self.last_error = None
+            self.saved.emit(message)
+        return self._executor.submit(run)
+
+    def wait_idle(self):
+        self._executor.submit(lambda: None).result()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+class CoordinationWorker(QObject):
+    # Network side of coordination mode: fetches batches of words from the
+    # coordination server and sends this scorer's rescores to it, on one
+    # background thread. Events are sent in batches; ones that fail to send
+    # are kept and go with the next batch, so a dropped connection loses
+    # nothing.
+    batch_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, client, parent=None):
+        super().__init__(parent)
+        self.client = client
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="wordlister-coordination")
+        self._lock = threading.Lock()
+        self._events = []
+        self.batch_in_flight = False
+
+    def request_batch(self, size, release=()):
+        if self.batch_in_flight:
+            return
+        self.batch_in_flight = True
+
+        def run():
+            try:
+                batch = self.client.next_batch(size, release)
+            except (OSError, ValueError) as e:
+                self.failed.emit(str(e))
+                batch = None
+            self.batch_ready.emit(batch)
+        self._executor.submit(run)
+
+    def record(self, row, word, score, rescored, when):
+        with self._lock:
+            self._events.append([row, word, score, rescored, when])
+
+    @property
+    def pending_count(self):
+        return len(self._events)
+
+    def flush(self):
+        with self._lock:
+            if not self._events:
+                return
+            events, self._events = self._events, []
+
+        def run():
+            try:
+                self.client.send_events(events)
+            except (OSError, ValueError) as e:
+                with self._lock:
+                    self._events[:0] = events
+                self.failed.emit(str(e))
+        self._executor.submit(run)
+
+    def shutdown(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+        self.client.close()
@@ -0,0 +1,203 @@
+import heapq
+
+import numpy as np
+
+from scoring import map_scores_to_buckets
+from work_queue import WorkQueue
+
+# Feature ids: byte bigrams of the word (with 0 marking its start and end),
+# then one id per word length and one per bucket.
+BIGRAMS = 1 << 16
+LENGTH_BASE = BIGRAMS
+BUCKET_BASE = LENGTH_BASE + 256
+FEATURES = BUCKET_BASE + 256
+
+
+def word_features(words, rows):
+    # (word index, bigram id) pairs for the given master rows, read straight
+    # from the WordBuffer bytes without decoding the words.
+    rows = np.asarray(rows, dtype=np.int64)
+    starts = words.offsets[rows].astype(np.int64)
+    sizes = words.offsets[rows + 1].astype(np.int64) - starts
+    padded = sizes + 2
+    total = int(padded.sum())
+    owner = np.repeat(np.arange(len(rows)), padded)
+    first = np.cumsum(padded) - padded
+    pos = np.arange(total) - np.repeat(first, padded)
+    inner = (pos > 0) & (pos <= np.repeat(sizes, padded))
+    chars = np.zeros(total, dtype=np.int64)
+    chars[inner] = words.data[(np.repeat(starts, padded) + pos - 1)[inner]]
+    # Pairs that do not straddle two words.
+    keep = pos[:-1] <= np.repeat(sizes, padded)[:-1]
+    bigrams = (chars[:-1] << 8) | chars[1:]
+    return owner[:-1][keep], bigrams[keep], sizes + 1
+
+
+class ChangeModel:
+    # Learns which words the user tends to give a new score, from the
+    # session's rescores and the words rescored in earlier sessions. Each
+    # feature keeps a count of changed and kept words; a word's priority is
+    # the smoothed log-odds of "changed" for its length and bucket plus the
+    # mean over its letter pairs, so words resembling ones already moved
+    # rank high. Learning one word is a few array updates and the weights
+    # are only recomputed when a queue asks for priorities.
+
+    def __init__(self, words, smoothing=2.0):
+        self.words = words
+        self.smoothing = smoothing
+        self.changed = np.zeros(FEATURES, dtype=np.float64)
+        self.kept = np.zeros(FEATURES, dtype=np.float64)
+        self.total_changed = 0.0
+        self.total_kept = 0.0
+        self.version = 0
+
+    def __len__(self):
+        return int(self.total_changed + self.total_kept)
+
+    def learn(self, rows, buckets, changed, weight=1.0):
+        # weight=-1 forgets decisions again, for undo.
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        changed = np.broadcast_to(np.asarray(changed, dtype=bool), rows.shape)
+        owner, bigrams, _ = word_features(self.words, rows)
+        buckets = np.broadcast_to(np.asarray(buckets, dtype=np.int64), rows.shape)
+        ids = np.concatenate([bigrams, LENGTH_BASE + self.words.lengths[rows].astype(np.int64),
+                              BUCKET_BASE + np.minimum(buckets, 255)])
+        flags = np.concatenate([changed[owner], changed, changed])
+        np.add.at(self.changed, ids[flags], weight)
+        np.add.at(self.kept, ids[~flags], weight)
+        n_changed = int(changed.sum())
+        self.total_changed += weight * n_changed
+        self.total_kept += weight * (len(rows) - n_changed)
+        self.version += 1
+
+    def learn_rescore(self, row, shown_score, new_score, weight=1.0):
+        self.learn([row], shown_score, new_score != shown_score, weight)
+
+    def weights(self, ids):
+        # Log-odds of "changed" for the given feature ids, relative to the
+        # overall rate; unseen features weigh 0.
+        a = self.smoothing
+        p = (self.total_changed + a) / (self.total_changed + self.total_kept + 2 * a)
+        odds = np.log((self.changed[ids] + a * p) / (self.kept[ids] + a * (1 - p)))
+        return odds - np.log(p / (1 - p))
+
+    def priorities(self, rows, buckets, features=None):
+        # features is word_features(rows) when the caller has it cached.
+        rows = np.asarray(rows, dtype=np.int64)
+        if not len(rows) or not self.total_changed or not self.total_kept:
+            return np.zeros(len(rows))
+        owner, bigrams, counts = word_features(self.words, rows) if features is None else features
+        pairs = np.bincount(owner, weights=self.weights(bigrams), minlength=len(rows)) / counts
+        lengths = self.weights(LENGTH_BASE + self.words.lengths[rows].astype(np.int64))
+        buckets = np.minimum(np.asarray(buckets, dtype=np.int64), 255)
+        return pairs + lengths + self.weights(BUCKET_BASE + buckets)
+
+    def bootstrap(self, index, personal, limit=50_000):
+        # Earlier sessions' decisions: a rescored word changed when its
+        # personal score is not the bucket its master score maps to.
+        rows = np.flatnonzero(index.done)
+        if len(rows) > limit:
+            rows = np.random.default_rng(0).choice(rows, limit, replace=False)
+        if not len(rows):
+            return 0
+        buckets = map_scores_to_buckets(index.raw_scores[rows]).astype(np.int64)
+        scores = np.array([personal.get(w, -1) for w in index.words[rows]], dtype=np.int64)
+        known = scores >= 0
+        self.learn(rows[known], buckets[known], scores[known] != buckets[known])
+        return int(known.sum())
+
+
+class PrioritizedQueue(WorkQueue):
+    # A WorkQueue that serves the most promising word of a lookahead window
+    # instead of the next one in shuffled order. The window's rows, scores
+    # and queue positions are numpy arrays, and a heap of (-priority,
+    # position, window slot) entries orders them. Whenever the model has
+    # learned something since the last pick, the window is topped up from
+    # the shuffled queue, its priorities are recomputed in one vectorized
+    # pass and the heap rebuilt. The window's letter pairs are kept between
+    # rebuilds, so only newly added words are read from the word buffer.
+    # Every explore_every-th pick takes the oldest word instead, so
+    # the model keeps seeing words it would not pick itself. Until the model
+    # has seen both kinds of decision all priorities are equal and the order
+    # is the plain shuffle. done is the master index's rescored flag array.
+
+    def __init__(self, words, done, model, window=2048, explore_every=10):
+        super().__init__(words, lambda row: done[row])
+        self.done = done
+        self.model = model
+        self.window = window
+        self.explore_every = explore_every
+        self.window_rows = np.empty(0, dtype=np.int64)
+        self.window_scores = np.empty(0, dtype=np.int64)
+        self.window_positions = np.empty(0, dtype=np.int64)
+        self.taken = np.empty(0, dtype=bool)
+        self.features = word_features(words, [])
+        self.heap = []
+        self.heap_version = -1
+        self.picks = 0
+        self.picked = None
+
+    def _rebuild(self):
+        keep = ~self.taken & ~self.done[self.window_rows]
+        rows, scores, positions = self.window_rows[keep], self.window_scores[keep], self.window_positions[keep]
+        owner, bigrams, counts = self.features
+        kept_pairs = keep[owner]
+        owner = (np.cumsum(keep) - 1)[owner[kept_pairs]]
+        bigrams, counts = bigrams[kept_pairs], counts[keep]
+        start = len(rows)
+        while len(rows) < self.window and self.position < self.size:
+            stop = min(self.size, self.position + self.window - len(rows))
+            more = self.rows[self.position:stop].astype(np.int64)
+            fresh = ~self.done[more]
+            rows = np.concatenate([rows, more[fresh]])
+            scores = np.concatenate([scores, self.scores[self.position:stop][fresh].astype(np.int64)])
+            positions = np.concatenate([positions, np.arange(self.position, stop)[fresh]])
+            self.position = stop
+        new_owner, new_bigrams, new_counts = word_features(self.words, rows[start:])
+        self.features = (np.concatenate([owner, new_owner + start]),
+                         np.concatenate([bigrams, new_bigrams]),
+                         np.concatenate([counts, new_counts]))
+        self.window_rows, self.window_scores, self.window_positions = rows, scores, positions
+        self.taken = np.zeros(len(rows), dtype=bool)
+        priorities = self.model.priorities(rows, scores, self.features)
+        self.heap = list(zip((-priorities).tolist(), positions.tolist(), range(len(rows))))
+        heapq.heapify(self.heap)
+        self.heap_version = self.model.version
+
+    def _pick(self):
+        if self.heap_version != self.model.version or not self.heap:
+            self._rebuild()
+        self.picks += 1
+        explore = self.explore_every and self.picks % self.explore_every == 0
+        while self.heap:
+            if explore:
+                # Oldest word still waiting; the heap entry is skipped later.
+                waiting = np.flatnonzero(~self.taken)
+                slot = int(waiting[np.argmin(self.window_positions[waiting])]) if len(waiting) else None
+                explore = False
+                if slot is None:
+                    continue
+            else:
+                slot = heapq.heappop(self.heap)[2]
+                if self.taken[slot]:
+                    continue
+            self.taken[slot] = True
+            row = int(self.window_rows[slot])
+            if not self.done[row]:
+                return row, int(self.window_scores[slot])
+        return None
+
+    def current(self):
+        item = self.front_item()
+        if item is not None:
+            return item
+        if self.picked is None or self.done[self.picked[0]]:
+            self.picked = self._pick()
+        if self.picked is None:
+            return None
+        row, score = self.picked
+        return row, self.words[row], score
+
+    def advance(self):
+        if not self.advance_front():
+            self.picked = None
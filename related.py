@@ -0,0 +1,115 @@
+import numpy as np
+
+from word_store import load_arrays, save_arrays
+
+RELATED_VERSION = 1
+RELATED_ARRAYS = ("stems", "members", "starts")
+
+# Inflection endings stripped to find a word's stem, longest first.
+SUFFIXES = sorted(["S", "ES", "ED", "ER", "ERS", "EST", "ING", "INGS", "INGLY", "EDLY", "LY",
+                   "NESS", "MENT", "MENTS"], key=len, reverse=True)
+MIN_STEM = 3
+
+
+def stem(word):
+    # A crude suffix-stripping stem, good enough to put ERASE, ERASES, ERASED,
+    # ERASER and ERASING in one group. Then, for every word, a doubled final
+    # letter is undoubled, a final E dropped and a final Y read as I, so
+    # STOP/STOPPED/STOPPING, HOPE/HOPED/HOPING and CRY/CRIES/CRIED agree.
+    w = word.upper()
+    for suffix in SUFFIXES:
+        if w.endswith(suffix) and len(w) - len(suffix) >= MIN_STEM:
+            w = w[:-len(suffix)]
+            break
+    if len(w) > MIN_STEM and w[-1] == w[-2]:
+        w = w[:-1]
+    if len(w) > MIN_STEM and w.endswith("E"):
+        w = w[:-1]
+    if w.endswith("Y"):
+        w = w[:-1] + "I"
+    return w
+
+
+class RelatedIndex:
+    # Groups of master rows sharing a stem. stems holds each row's group id
+    # and members lists the rows group by group, group g being
+    # members[starts[g]:starts[g + 1]], so finding a word's relatives is two
+    # array lookups whatever the size of the list.
+
+    def __init__(self, stems, members, starts):
+        self.stems = stems
+        self.members = members
+        self.starts = starts
+
+    def __len__(self):
+        return len(self.stems)
+
+    @classmethod
+    def build(cls, words, on_progress=None, cancelled=lambda: False, chunk_size=200_000):
+        ids = {}
+        stems = np.empty(len(words), dtype=np.int32)
+        for start in range(0, len(words), chunk_size):
+            if cancelled():
+                return None
+            stop = min(start + chunk_size, len(words))
+            batch = words[np.arange(start, stop)]
+            stems[start:stop] = [ids.setdefault(stem(w), len(ids)) for w in batch]
+            if on_progress is not None:
+                on_progress(stop, len(words))
+        members = np.argsort(stems, kind="stable").astype(np.int32)
+        starts = np.searchsorted(stems[members], np.arange(len(ids) + 1)).astype(np.int64)
+        return cls(stems, members, starts)
+
+    def related(self, row):
+        # The other rows in row's group, in master-list order.
+        group = self.stems[row]
+        rows = self.members[self.starts[group]:self.starts[group + 1]]
+        return rows[rows != row]
+
+    def arrays(self):
+        return {"stems": self.stems, "members": self.members, "starts": self.starts}
+
+
+def load_related(path, cache_dir, rows):
+    # The index cached next to the master wordlist's snapshot, or None.
+    # Rewriting the snapshot for a changed master list drops the meta key,
+    # so a stale index is never used.
+    import loader
+    meta = loader.read_snapshot_meta(path, cache_dir)
+    if not meta or meta.get("related_version") != RELATED_VERSION or meta.get("rows") != rows:
+        return None
+    base = loader.snapshot_base(cache_dir, meta["digest"])
+    try:
+        arrays = load_arrays(base + ".related", RELATED_ARRAYS)
+    except (OSError, ValueError):
+        return None
+    if arrays is None or len(arrays["stems"]) != rows:
+        return None
+    return RelatedIndex(arrays["stems"], arrays["members"], arrays["starts"])
+
+
+def save_related(path, cache_dir, index):
+    import loader
+    meta = loader.read_snapshot_meta(path, cache_dir)
+    if not meta or meta.get("rows") != len(index):
+        return
+    base = loader.snapshot_base(cache_dir, meta["digest"])
+    try:
+        save_arrays(base + ".related", index.arrays(), loader._write_atomic)
+    except OSError:
+        return
+    meta["related_version"] = RELATED_VERSION
+    loader.write_snapshot_meta(path, cache_dir, meta)
+
+
+def load_related_index(path, cache_dir, words, cacheable, on_progress=None, cancelled=lambda: False):
+    # From the cache when possible, else built and (for a plain master list,
+    # without extra lists layered on) cached for the next launch.
+    if cacheable and cache_dir:
+        index = load_related(path, cache_dir, len(words))
+        if index is not None:
+            return index
+    index = RelatedIndex.build(words, on_progress, cancelled)
+    if index is not None and cacheable and cache_dir:
+        save_related(path, cache_dir, index)
+    return index
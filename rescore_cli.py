@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import time
+
+from engine import BatchRescorer, load_word_actions, parse_rule
+from journal import Journal
+from session import ensure_file_exists
+from store import ScoreStore
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Apply bulk rescoring rules to a master wordlist without the GUI. "
+                    "Results go into the personal wordlist and tracker files used by wordlister.py.",
+        epilog='Rules look like "length=3 bucket=50 set=25" or "regex=^QU length=4-6 increase". '
+               "Terms: length=N[-M], bucket=B[,B...], score=N[-M], regex=PATTERN, "
+               "and one of set=SCORE, increase, decrease, increase_double, decrease_double, keep.",
+    )
+    parser.add_argument("--master", required=True, help="master wordlist (word;score per line)")
+    parser.add_argument("--personal", required=True, help="personal wordlist to update")
+    parser.add_argument("--tracker", required=True, help="rescore tracker to update")
+    parser.add_argument("--rule", action="append", default=[], metavar="RULE",
+                        help="a rescoring rule; may be given more than once, the first match wins")
+    parser.add_argument("--rules-file", help="file with one rule per line (# starts a comment)")
+    parser.add_argument("--word-list", help="file of word;action or word;score lines, applied before the rules")
+    parser.add_argument("--include-rescored", action="store_true",
+                        help="also rescore words the tracker already marks as rescored")
+    parser.add_argument("--no-track", action="store_true",
+                        help="leave the tracker alone, so the words still come up in the GUI")
+    parser.add_argument("--chunk-size", type=int, default=500_000, help="master rows read at a time")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    return parser.parse_args(argv)
+
+
+def read_rules(args):
+    texts = list(args.rule)
+    if args.rules_file:
+        with open(args.rules_file, "r", encoding="utf-8") as f:
+            texts += [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+    return [parse_rule(text) for text in texts]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    import loader
+
+    try:
+        rules = read_rules(args)
+        word_actions = load_word_actions(args.word_list) if args.word_list else {}
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if not rules and not word_actions:
+        print("error: nothing to do, give --rule, --rules-file or --word-list", file=sys.stderr)
+        return 2
+    if not os.path.exists(args.master):
+        print(f"error: master wordlist not found: {args.master}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    if not args.dry_run:
+        ensure_file_exists(args.personal)
+        ensure_file_exists(args.tracker)
+    personal = ScoreStore.from_frame(loader.load_personal_wordlist(args.personal), "score") \
+        if os.path.exists(args.personal) else ScoreStore("score")
+    tracker = ScoreStore.from_frame(loader.load_tracker(args.tracker), "rescored") \
+        if os.path.exists(args.tracker) else ScoreStore("rescored")
+    # Actions the GUI journaled but never folded into the files come first,
+    # exactly as on the GUI's next launch.
+    journal = Journal(args.personal + ".journal")
+    journal.replay(personal, tracker)
+
+    rescorer = BatchRescorer(rules, word_actions, args.include_rescored, not args.no_track)
+    report = rescorer.run(
+        loader.iter_word_table(args.master, "score", args.chunk_size), personal, tracker,
+        lambda r: print(f"\r{r.rows} words processed", end="", file=sys.stderr, flush=True),
+    )
+    print(file=sys.stderr)
+    print(report.summary())
+
+    if args.dry_run:
+        print("Dry run, nothing written.")
+    else:
+        # Writes both files atomically, then empties the journal the GUI
+        # would otherwise replay on top of them.
+        journal.compact([], lambda: personal.save(args.personal), lambda: tracker.save(args.tracker))
+        print(f"Wrote {args.personal} and {args.tracker}")
+    print(f"Done in {time.perf_counter() - started:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
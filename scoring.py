@@ -0,0 +1,58 @@
+# numpy and pandas are imported inside the vectorized helpers, so the GUI can
+# import this module at startup without paying for them.
+
+score_buckets = [61, 60, 50, 25, 0]
+
+
+def map_score_to_bucket(score):
+    return min(score_buckets, key=lambda b: abs(b - score))
+
+
+def _bucket_boundaries(buckets):
+    # Sorted bucket values, the midpoints between neighbours and, for a score
+    # exactly on a midpoint, which neighbour map_score_to_bucket would pick
+    # (the one listed first in score_buckets wins a tie).
+    import numpy as np
+    order = sorted(buckets)
+    mids = np.array([(lo + hi) / 2 for lo, hi in zip(order, order[1:])], dtype=float)
+    tie_upper = np.array([buckets.index(hi) < buckets.index(lo)
+                          for lo, hi in zip(order, order[1:])], dtype=bool)
+    return np.array(order), mids, tie_upper
+
+
+def map_scores_to_buckets(scores, buckets=None):
+    import numpy as np
+    import pandas as pd
+    buckets = score_buckets if buckets is None else buckets
+    order, mids, tie_upper = _bucket_boundaries(buckets)
+    values = np.asarray(scores, dtype=float)
+    idx = np.searchsorted(mids, values, side="left")
+    if len(mids):
+        at = np.minimum(idx, len(mids) - 1)
+        ties = (idx < len(mids)) & (values == mids[at]) & tie_upper[at]
+        idx = idx + ties
+    result = order[idx]
+    if isinstance(scores, pd.Series):
+        return pd.Series(result, index=scores.index, name=scores.name)
+    return result
+
+
+def overlay_scores(words, scores, overrides):
+    import pandas as pd
+    if not overrides:
+        return scores
+    mapped = words.map(overrides)
+    merged = mapped.where(mapped.notna(), scores)
+    if pd.api.types.is_integer_dtype(scores.dtype):
+        merged = merged.astype(scores.dtype)
+    return merged
+
+
+def filter_wordlist(df, length_min, length_max, score_min, score_max):
+    filtered = df[
+        (df['score'].between(score_min, score_max)) &
+        (df['word'].str.len().between(length_min, length_max))
+    ]
+    filtered = filtered.copy()
+    filtered['score'] = map_scores_to_buckets(filtered['score'])
+    return filtered
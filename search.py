@@ -0,0 +1,132 @@
+import re
+from collections import OrderedDict
+
+import numpy as np
+
+PATTERN, REGEX, ANAGRAM = "pattern", "regex", "anagram"
+MODES = (PATTERN, REGEX, ANAGRAM)
+# Characters that stand for any one letter in a pattern.
+WILDCARDS = b"?._"
+
+
+def upper_bytes(a):
+    # ASCII upper-casing of a uint8 array.
+    return np.where((a >= 97) & (a <= 122), a - 32, a).astype(np.uint8)
+
+
+class SearchIndex:
+    # Pattern, regex and anagram lookup over a WordBuffer. Words are grouped
+    # by length (in bytes, so ? stands for one ASCII letter) into a rows x
+    # length letter matrix per group. A pattern query ANDs one bitmap per
+    # fixed letter, the bitmap for (length, position, letter) being computed
+    # from the matrix column on first use and kept in a small LRU cache, so
+    # common queries are a handful of packed-bit ANDs. Anagrams look up the
+    # word's sorted letters in a per-length sorted key array. Regexes run
+    # over one newline-separated copy of all words, built on first use.
+
+    def __init__(self, words, groups, anagrams, cache_size=512):
+        self.words = words
+        self.groups = groups
+        self.anagrams = anagrams
+        self.bitmaps = OrderedDict()
+        self.cache_size = cache_size
+        self._text = None
+        self._line_starts = None
+
+    @classmethod
+    def build(cls, words, cancelled=lambda: False):
+        offsets = words.offsets.astype(np.int64)
+        sizes = np.diff(offsets)
+        order = np.argsort(sizes, kind="stable")
+        lengths, starts = np.unique(sizes[order], return_index=True)
+        groups, anagrams = {}, {}
+        for length, start, stop in zip(lengths.tolist(), starts.tolist(), starts[1:].tolist() + [len(order)]):
+            if cancelled():
+                return None
+            if length == 0:
+                continue
+            rows = order[start:stop].astype(np.int32)
+            chars = upper_bytes(words.data[offsets[rows][:, None] + np.arange(length)])
+            groups[length] = (rows, chars)
+            keys = np.ascontiguousarray(np.sort(chars, axis=1)).view(f"S{length}").ravel()
+            key_order = np.argsort(keys, kind="stable")
+            anagrams[length] = (keys[key_order], rows[key_order])
+        return cls(words, groups, anagrams)
+
+    def bitmap(self, length, position, letter):
+        key = (length, position, letter)
+        bits = self.bitmaps.get(key)
+        if bits is None:
+            _, chars = self.groups[length]
+            bits = np.packbits(chars[:, position] == letter)
+            self.bitmaps[key] = bits
+            if len(self.bitmaps) > self.cache_size:
+                self.bitmaps.popitem(last=False)
+        else:
+            self.bitmaps.move_to_end(key)
+        return bits
+
+    def pattern(self, pattern):
+        # Crossword pattern such as ?A?E??; a pattern without wildcards finds
+        # the word itself.
+        query = pattern.strip().upper().encode("utf-8")
+        if not query or len(query) not in self.groups:
+            return np.empty(0, dtype=np.int32)
+        rows, _ = self.groups[len(query)]
+        mask = None
+        for position, letter in enumerate(query):
+            if letter in WILDCARDS:
+                continue
+            bits = self.bitmap(len(query), position, letter)
+            mask = bits if mask is None else mask & bits
+        if mask is None:
+            return rows
+        return rows[np.flatnonzero(np.unpackbits(mask, count=len(rows)))]
+
+    def anagram(self, letters):
+        key = bytes(sorted(letters.replace(" ", "").upper().encode("utf-8")))
+        if not key or len(key) not in self.anagrams:
+            return np.empty(0, dtype=np.int32)
+        keys, rows = self.anagrams[len(key)]
+        return rows[np.searchsorted(keys, key, "left"):np.searchsorted(keys, key, "right")]
+
+    def regex(self, expression, limit=None):
+        # Whole-word, case-insensitive matches; raises re.error for a bad
+        # expression. Stops after limit matches. The expression is run over
+        # one newline-separated copy of all words to find candidates fast,
+        # but each candidate is then matched on its own word, as a match
+        # over the joined text can run across words ([^Z]*, \s) and use up
+        # the words after it.
+        if self._text is None:
+            offsets = self.words.offsets.astype(np.int64)
+            self._line_starts = offsets[:-1] + np.arange(len(self.words))
+            text = np.full(len(self.words.data) + len(self.words), 10, dtype=np.uint8)
+            letters = np.ones(len(text), dtype=bool)
+            letters[offsets[1:] + np.arange(len(self.words))] = False
+            text[letters] = self.words.data
+            self._text = text.tobytes()
+        compiled = re.compile(expression.encode("utf-8"), re.IGNORECASE)
+        # A lookahead from each line start finds every word the expression
+        # can start on without consuming text, so no word is skipped.
+        candidates = re.compile(b"^(?=" + expression.encode("utf-8") + b")", re.MULTILINE | re.IGNORECASE)
+        rows = []
+        for match in candidates.finditer(self._text):
+            if match.start() == len(self._text):
+                break
+            row = int(np.searchsorted(self._line_starts, match.start(), "right")) - 1
+            if compiled.fullmatch(self.words.data[self.words.offsets[row]:self.words.offsets[row + 1]].tobytes()):
+                rows.append(row)
+                if limit is not None and len(rows) >= limit:
+                    break
+        return np.array(rows, dtype=np.int32)
+
+    def search(self, mode, query, limit=None):
+        if mode == PATTERN:
+            rows = self.pattern(query)
+        elif mode == ANAGRAM:
+            rows = self.anagram(query)
+        elif mode == REGEX:
+            rows = self.regex(query, limit) if query.strip() else np.empty(0, dtype=np.int32)
+        else:
+            raise ValueError(f"unknown search mode: {mode}")
+        return rows if limit is None else rows[:limit]
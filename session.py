@@ -0,0 +1,141 @@
+import os
+from collections import namedtuple
+
+from journal import Journal
+from store import ScoreStore
+
+SessionConfig = namedtuple("SessionConfig", [
+    "master_wordlist_file", "personal_wordlist_file", "rescore_tracker_file",
+    "length_min", "length_max", "score_min", "score_max", "snapshot_cache_dir",
+    "shuffle_seed", "load_workers", "extra_wordlist_files", "blocklist_files",
+    "storage_backend", "sqlite_file", "master_changes_only", "requeue_master_changes",
+])
+
+
+def ensure_file_exists(path):
+    if not os.path.exists(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            pass
+
+
+RELOAD_FIELDS = ("master_wordlist_file", "personal_wordlist_file", "rescore_tracker_file", "shuffle_seed",
+                 "extra_wordlist_files", "blocklist_files", "storage_backend", "sqlite_file")
+FILTER_FIELDS = ("length_min", "length_max", "score_min", "score_max", "master_changes_only")
+
+
+def same_file(a, b):
+    if a == b:
+        return True
+    try:
+        return os.path.samefile(a, b)
+    except OSError:
+        return os.path.abspath(a) == os.path.abspath(b)
+
+
+def settings_change(old, new, master_signature=None):
+    # "reload" when the session has to be read from disk again, "filter" when
+    # only the queue needs rebuilding from the in-memory index, else None.
+    for field in RELOAD_FIELDS:
+        a, b = getattr(old, field), getattr(new, field)
+        if a != b and not (field.endswith("_file") and same_file(a, b)):
+            return "reload"
+    if master_signature is not None:
+        import loader
+        try:
+            if loader.file_signature(new.master_wordlist_file) != master_signature:
+                return "reload"
+        except OSError:
+            return "reload"
+    if any(getattr(old, field) != getattr(new, field) for field in FILTER_FIELDS):
+        return "filter"
+    return None
+
+
+def load_session(config, on_progress, on_stores, on_chunk, on_master,
+                 cancelled=lambda: False, first_chunk=20000, chunk_size=200000):
+    # Loads everything a rescoring session needs, reporting through callbacks
+    # so the caller can start scoring before the whole queue is built.
+    #
+    # The master index keeps its rows in one random permutation and is filled
+    # a chunk of slots at a time, so every chunk of the queue is already in
+    # shuffled order and the chunks together are a uniform shuffle of the
+    # filtered words.
+    import loader
+    from master_index import MasterIndex
+    from sources import BLOCK, WordlistLayer, WordlistStack
+    from word_store import WordBuffer, compact_scores
+
+    on_progress(0, "Loading master wordlist...")
+    signature = loader.file_signature(config.master_wordlist_file) if os.path.exists(config.master_wordlist_file) else None
+    master = loader.load_master_wordlist(config.master_wordlist_file, config.snapshot_cache_dir,
+                                         config.load_workers)
+    if master is None:
+        raise FileNotFoundError(f"Master wordlist file not found: {config.master_wordlist_file}")
+    words, scores = master
+    layers = ([WordlistLayer(path) for path in config.extra_wordlist_files] +
+              [WordlistLayer(path, BLOCK) for path in config.blocklist_files])
+    source = None
+    if layers:
+        stack = WordlistStack(layers)
+        merged_words, merged_scores, source = stack.merge(
+            words, scores, lambda layer: on_progress(20, f"Merging {layer.name}..."))
+        words, scores = WordBuffer.from_words(merged_words), compact_scores(merged_scores)
+        del merged_words
+    # A fixed shuffle_seed gives the same word order on every launch.
+    index = MasterIndex(words, scores, config.shuffle_seed)
+    if source is not None:
+        index.source, index.source_names = source, stack.names
+    index.signature = signature
+    if source is None and config.snapshot_cache_dir:
+        index.set_changes(loader.load_master_changes(config.master_wordlist_file, config.snapshot_cache_dir))
+
+    on_progress(40, "Loading personal wordlist and tracker...")
+    if config.storage_backend == "sqlite":
+        from sqlite_store import SqliteJournal
+        journal = SqliteJournal(config.sqlite_file)
+        if journal.is_empty():
+            # First run on a new database: start from the text files.
+            journal.import_text(config.personal_wordlist_file, config.rescore_tracker_file)
+        personal_scores, rescored_tracker = journal.load()
+    else:
+        ensure_file_exists(config.personal_wordlist_file)
+        ensure_file_exists(config.rescore_tracker_file)
+        personal_scores = ScoreStore.from_frame(loader.load_personal_wordlist(config.personal_wordlist_file), 'score')
+        rescored_tracker = ScoreStore.from_frame(loader.load_tracker(config.rescore_tracker_file), 'rescored')
+        # Unsaved actions from a previous session (or crash) are replayed on top
+        # of the files just loaded.
+        journal = Journal(config.personal_wordlist_file + ".journal")
+        journal.replay(personal_scores, rescored_tracker)
+
+    changes = index.changes
+    if changes is not None and not changes.requeued and config.requeue_master_changes:
+        # Once per master list update: words rescored before their master
+        # score changed are cleared from the tracker so they come up for
+        # review again. Their personal score is kept.
+        for word in index.words[changes.rescored]:
+            if rescored_tracker.get(word) == 1:
+                rescored_tracker.restore(word, 0)
+                journal.record_restore(word, personal_scores.get(word), 0)
+        journal.flush()
+        loader.mark_changes_requeued(config.master_wordlist_file, config.snapshot_cache_dir)
+        changes.requeued = True
+
+    # The stores belong to the caller from here on; keep private copies of
+    # what the remaining steps need.
+    overrides = dict(personal_scores.as_dict())
+    done = [word for word, rescored in rescored_tracker.items() if rescored == 1]
+    on_stores(index, personal_scores, rescored_tracker, journal)
+
+    start, size = 0, first_chunk
+    while start < len(index):
+        if cancelled():
+            return
+        index.fill(start + size, overrides, done)
+        slots = index.select(config.length_min, config.length_max,
+                             config.score_min, config.score_max, config.master_changes_only, start)
+        on_chunk(index.order[slots], index.buckets[slots])
+        start = index.filled
+        size = chunk_size
+        on_progress(50 + 50 * start // len(index), "Building word queue...")
+
+    on_master(index)
@@ -0,0 +1,140 @@
+import os
+
+import numpy as np
+
+# Layer kinds: a "scores" layer adds its words and overrides the score of
+# words already in the stack; a "block" layer removes its words.
+SCORES = "scores"
+BLOCK = "block"
+
+
+def normalize_word(word):
+    # Variants differing only in case or whitespace ("Ice cream", "ICECREAM")
+    # are the same entry.
+    return "".join(word.split()).upper()
+
+
+def normalize_words(words):
+    return np.array([normalize_word(w) for w in words], dtype=object)
+
+
+def sorted_unique(words, scores=None, spellings=None):
+    # Sorts normalized words and drops duplicates, keeping the score (and
+    # original spelling) of the last occurrence as a dict overlay would.
+    # Input that is already sorted and unique is returned as is.
+    if len(words) > 1:
+        keys = words.astype(str)
+        if not (keys[1:] > keys[:-1]).all():
+            order = np.argsort(keys, kind="stable")
+            keys = keys[order]
+            last = np.append(keys[1:] != keys[:-1], True)
+            order = order[last]
+            words = words[order]
+            scores = scores[order] if scores is not None else None
+            spellings = spellings[order] if spellings is not None else None
+    return words, scores, spellings
+
+
+class WordlistLayer:
+    def __init__(self, path, kind=SCORES):
+        self.path = path
+        self.kind = kind
+        self.name = os.path.basename(path)
+
+    def read(self, chunk_size=500_000):
+        # Sorted unique normalized words, their original spellings and, for
+        # a scores layer, their scores. The file is read in chunks; only the
+        # arrays are kept.
+        import pandas as pd
+        import loader
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Wordlist not found: {self.path}")
+        spellings, scores = [], []
+        if self.kind == BLOCK:
+            # Blocklists may be bare words or word;score lines.
+            if os.path.getsize(self.path):
+                reader = pd.read_csv(self.path, sep=";", names=["word"], usecols=[0], engine="c",
+                                     encoding="utf-8", dtype=str, na_filter=False, chunksize=chunk_size)
+                with reader:
+                    spellings = [df["word"].to_numpy(dtype=object) for df in reader]
+        else:
+            for df in loader.iter_word_table(self.path, "score", chunk_size):
+                spellings.append(df["word"].to_numpy(dtype=object))
+                scores.append(df["score"].to_numpy())
+        spellings = np.concatenate(spellings) if spellings else np.array([], dtype=object)
+        scores = (np.concatenate(scores) if scores else np.array([], dtype=np.int64)) \
+            if self.kind == SCORES else None
+        words = normalize_words(spellings)
+        keep = words != ""
+        return sorted_unique(words[keep], scores[keep] if scores is not None else None, spellings[keep])
+
+
+class WordlistStack:
+    # The master wordlist plus further layers in increasing precedence: each
+    # scores layer overrides the ones below it and each block layer removes
+    # words. The personal wordlist still sits on top as the GUI's overlay.
+    #
+    # Layers are merged as sorted runs of normalized words, one layer at a
+    # time into the running result (a vectorized two-way merge of sorted
+    # arrays), so no layer is ever held as a DataFrame. Each merged word
+    # records which layer its score came from. The normalized form is only
+    # the key words are matched on: merge returns each word as spelled in
+    # the lowest layer that has it, so it still matches the personal
+    # wordlist and tracker.
+
+    def __init__(self, layers):
+        self.layers = list(layers)
+
+    @property
+    def names(self):
+        return ["master"] + [layer.name for layer in self.layers]
+
+    def merge(self, master_words, master_scores, on_progress=None):
+        spellings = np.array(list(master_words), dtype=object)
+        words, scores, spellings = sorted_unique(normalize_words(spellings), np.asarray(master_scores), spellings)
+        source = np.zeros(len(words), dtype=np.uint8)
+        for i, layer in enumerate(self.layers, 1):
+            if on_progress is not None:
+                on_progress(layer)
+            layer_words, layer_scores, layer_spellings = layer.read()
+            if layer.kind == BLOCK:
+                words, scores, source, spellings = _remove(words, scores, source, spellings, layer_words)
+            else:
+                words, scores, source, spellings = _merge(words, scores, source, spellings, layer_words,
+                                                          layer_scores, layer_spellings, i)
+        return spellings, scores, source
+
+
+def _positions(words, other):
+    # Where each of the sorted words in other goes in words, and whether it
+    # is already there.
+    keys = words.astype(str)
+    other_keys = other.astype(str)
+    pos = np.searchsorted(keys, other_keys)
+    found = pos < len(keys)
+    found[found] = keys[pos[found]] == other_keys[found]
+    return pos, found
+
+
+def _merge(words, scores, source, spellings, layer_words, layer_scores, layer_spellings, layer_id):
+    if not len(layer_words):
+        return words, scores, source, spellings
+    pos, found = _positions(words, layer_words)
+    scores = scores.copy()
+    source = source.copy()
+    scores[pos[found]] = layer_scores[found]
+    source[pos[found]] = layer_id
+    new = ~found
+    return (np.insert(words, pos[new], layer_words[new]),
+            np.insert(scores, pos[new], layer_scores[new]),
+            np.insert(source, pos[new], layer_id),
+            np.insert(spellings, pos[new], layer_spellings[new]))
+
+
+def _remove(words, scores, source, spellings, blocked):
+    if not len(blocked) or not len(words):
+        return words, scores, source, spellings
+    pos, found = _positions(words, blocked)
+    keep = np.ones(len(words), dtype=bool)
+    keep[pos[found]] = False
+    return words[keep], scores[keep], source[keep], spellings[keep]
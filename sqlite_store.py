@@ -0,0 +1,202 @@
+import argparse
+import os
+import sqlite3
+import sys
+
+from store import ScoreStore
+
+# One row per word the user has touched. score is the personal wordlist
+# entry and rescored the tracker entry; NULL means the word is not in that
+# list. Keeping both in one row means they are always written together.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT PRIMARY KEY,
+    score INTEGER,
+    rescored INTEGER
+) WITHOUT ROWID
+"""
+
+RESCORE_SQL = """
+INSERT INTO words (word, score, rescored) VALUES (?, ?, 1)
+ON CONFLICT (word) DO UPDATE SET score = excluded.score, rescored = 1
+"""
+
+RESTORE_SQL = """
+INSERT INTO words (word, score, rescored) VALUES (?, ?, ?)
+ON CONFLICT (word) DO UPDATE SET score = excluded.score, rescored = excluded.rescored
+"""
+
+DELETE_EMPTY_SQL = "DELETE FROM words WHERE word = ? AND score IS NULL AND rescored IS NULL"
+
+
+class SqliteJournal:
+    # SQLite storage for the personal scores and the tracker, used in place
+    # of Journal when storage_backend=sqlite. It has the same record_*() /
+    # take_pending() / write() interface, but write() applies a batch to the
+    # database in one transaction instead of appending to a log, so there is
+    # nothing to replay at startup and nothing to compact. The connection is
+    # shared between the loader and I/O threads, one at a time.
+    write_through = True
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._pending = []
+        self.record_count = 0
+
+    def _error(self, e):
+        # sqlite3 errors (a corrupt or locked file, a bad path) are raised as
+        # OSError, which the loader and the persistence worker report.
+        return OSError(f"{self.path}: {e}")
+
+    def connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            conn = None
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(SCHEMA)
+            except sqlite3.Error as e:
+                if conn is not None:
+                    conn.close()
+                raise self._error(e) from e
+            self._conn = conn
+        return self._conn
+
+    def __len__(self):
+        return self.record_count + len(self._pending)
+
+    def is_empty(self):
+        try:
+            return self.connect().execute("SELECT 1 FROM words LIMIT 1").fetchone() is None
+        except sqlite3.Error as e:
+            raise self._error(e) from e
+
+    def load(self):
+        personal, tracker = ScoreStore("score"), ScoreStore("rescored")
+        try:
+            for word, score, rescored in self.connect().execute("SELECT word, score, rescored FROM words"):
+                if score is not None:
+                    personal.upsert(word, score)
+                if rescored is not None:
+                    tracker.upsert(word, rescored)
+        except sqlite3.Error as e:
+            raise self._error(e) from e
+        return personal, tracker
+
+    def record_rescore(self, word, score):
+        self._pending.append((RESCORE_SQL, (word, score)))
+
+    def record_restore(self, word, score, rescored):
+        self._pending.append((RESTORE_SQL, (word, score, rescored)))
+        self._pending.append((DELETE_EMPTY_SQL, (word,)))
+
+    @property
+    def pending_count(self):
+        return len(self._pending)
+
+    def take_pending(self):
+        records, self._pending = self._pending, []
+        self.record_count += len(records)
+        return records
+
+    def take_for_compaction(self):
+        return self.take_pending()
+
+    def write(self, records):
+        if not records:
+            return
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN")
+            for sql, params in records:
+                conn.execute(sql, params)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise self._error(e) from e
+
+    def flush(self):
+        self.write(self.take_pending())
+
+    def needs_compaction(self):
+        return False
+
+    def compact(self, records, *writers):
+        # The database is the saved state; the text file writers are only
+        # used by the text backend. Use export_text() to produce the files.
+        self.write(records)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def import_stores(self, personal, tracker):
+        # Merges text-format stores into the database in one transaction.
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany("INSERT INTO words (word, score) VALUES (?, ?) "
+                             "ON CONFLICT (word) DO UPDATE SET score = excluded.score",
+                             personal.items())
+            conn.executemany("INSERT INTO words (word, rescored) VALUES (?, ?) "
+                             "ON CONFLICT (word) DO UPDATE SET rescored = excluded.rescored",
+                             tracker.items())
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise self._error(e) from e
+
+    def import_text(self, personal_path, tracker_path):
+        # Imports the text files, with any unsaved journal replayed on top.
+        import loader
+        from journal import Journal
+        personal = ScoreStore.from_frame(loader.load_personal_wordlist(personal_path), "score") \
+            if os.path.exists(personal_path) else ScoreStore("score")
+        tracker = ScoreStore.from_frame(loader.load_tracker(tracker_path), "rescored") \
+            if os.path.exists(tracker_path) else ScoreStore("rescored")
+        Journal(personal_path + ".journal").replay(personal, tracker)
+        self.import_stores(personal, tracker)
+        return len(personal), len(tracker)
+
+    def export_text(self, personal_path, tracker_path):
+        personal, tracker = self.load()
+        personal.save(personal_path)
+        tracker.save(tracker_path)
+        return len(personal), len(tracker)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Copy the personal wordlist and tracker between text files and a SQLite database.")
+    parser.add_argument("command", choices=["import", "export"],
+                        help="import: text files into the database; export: database to text files")
+    parser.add_argument("--db", required=True, help="SQLite database file")
+    parser.add_argument("--personal", required=True, help="personal wordlist text file")
+    parser.add_argument("--tracker", required=True, help="rescore tracker text file")
+    args = parser.parse_args(argv)
+
+    store = SqliteJournal(args.db)
+    try:
+        if args.command == "import":
+            personal, tracker = store.import_text(args.personal, args.tracker)
+            print(f"Imported {personal} personal scores and {tracker} tracker entries into {args.db}")
+        else:
+            personal, tracker = store.export_text(args.personal, args.tracker)
+            print(f"Exported {personal} personal scores to {args.personal} and {tracker} tracker entries to {args.tracker}")
+    except (OSError, sqlite3.Error) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+import threading
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from session import load_session
+
+
+def error_message(e):
+    # File and parse errors carry their own message; anything else is
+    # unexpected, so its type is named too.
+    if isinstance(e, (OSError, ValueError)):
+        return str(e)
+    return f"{type(e).__name__}: {e}"
+
+
+class SessionLoader(QObject):
+    # Runs load_session on a background thread and forwards its callbacks as
+    # signals, which Qt delivers on the GUI thread.
+    progress = pyqtSignal(int, str)
+    stores_ready = pyqtSignal(object, object, object, object)
+    chunk_ready = pyqtSignal(object, object)
+    master_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, config, parent=None):
+        super().__init__(parent)
+        self.config = config
+        self.cancelled = False
+
+    def start(self):
+        threading.Thread(target=self._run, name="wordlister-load", daemon=True).start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _run(self):
+        try:
+            load_session(self.config, self.progress.emit, self.stores_ready.emit,
+                         self.chunk_ready.emit, self.master_ready.emit,
+                         cancelled=lambda: self.cancelled)
+        except Exception as e:
+            self.failed.emit(error_message(e))
+        self.finished.emit()
+
+
+class IndexLoader(QObject):
+    # Loads or builds one of the lookup indexes (related words, search) on a
+    # background thread once the master index is in. build is called with
+    # (on_progress, cancelled) and returns the index, or None if cancelled.
+    progress = pyqtSignal(int, int)
+    ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, build, parent=None):
+        super().__init__(parent)
+        self.build = build
+        self.cancelled = False
+
+    def start(self):
+        threading.Thread(target=self._run, name="wordlister-index", daemon=True).start()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _run(self):
+        try:
+            index = self.build(self.progress.emit, lambda: self.cancelled)
+        except Exception as e:
+            self.failed.emit(error_message(e))
+            return
+        if index is not None:
+            self.ready.emit(index)
@@ -0,0 +1,72 @@
+import os
+
+
+class ScoreStore:
+    # Word -> value mapping for the personal wordlist and the rescore tracker.
+    # Lookups and updates are dict operations; DataFrames are only built when
+    # loading from or writing to disk.
+
+    def __init__(self, value_column="score", values=None):
+        self.value_column = value_column
+        self._values = dict(values or {})
+
+    @classmethod
+    def from_frame(cls, df, value_column="score"):
+        return cls(value_column, zip(df["word"], df[value_column]))
+
+    def to_frame(self):
+        import pandas as pd
+        return pd.DataFrame({"word": list(self._values.keys()),
+                             self.value_column: list(self._values.values())})
+
+    def copy(self):
+        return ScoreStore(self.value_column, self._values)
+
+    def save(self, path):
+        # Write to a temp file and rename so a crash never leaves a truncated file.
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(f"{word};{value}\n" for word, value in self._values.items())
+        os.replace(tmp, path)
+
+    def __contains__(self, word):
+        return word in self._values
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    @property
+    def empty(self):
+        return not self._values
+
+    def get(self, word, default=None):
+        return self._values.get(word, default)
+
+    def items(self):
+        return self._values.items()
+
+    def as_dict(self):
+        return self._values
+
+    def upsert(self, word, value):
+        previous = self._values.get(word)
+        self._values[word] = value
+        return previous
+
+    def revert(self, word, value):
+        # Undo only touches words the store already knows about.
+        if word in self._values:
+            self._values[word] = value
+
+    def restore(self, word, value):
+        # Puts back an earlier state; None means the word was not stored.
+        if value is None:
+            self._values.pop(word, None)
+        else:
+            self._values[word] = value
+
+    def clear(self):
+        self._values.clear()
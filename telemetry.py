@@ -0,0 +1,96 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+
+class Telemetry:
+    # Opt-in timing of the GUI's hot paths. instrument() swaps an object's
+    # methods for timed wrappers that keep the last `samples` durations per
+    # name (for rolling percentiles) and a bounded list of trace events that
+    # dump_trace() writes in Chrome's trace event format (load it in
+    # chrome://tracing or Perfetto). When disabled nothing is wrapped, so
+    # the instrumented code runs exactly as before. Wrapped methods also run
+    # on the I/O thread, so samples are recorded and read under a lock.
+
+    def __init__(self, enabled=False, samples=1000, trace_events=200_000):
+        self.enabled = enabled
+        self.sample_count = samples
+        self.samples = {}
+        self.calls = {}
+        self.trace = deque(maxlen=trace_events)
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.rescore_times = deque()
+        self.rescore_total = 0
+
+    def timed(self, name, fn):
+        if not self.enabled:
+            return fn
+        with self.lock:
+            samples = self.samples.setdefault(name, deque(maxlen=self.sample_count))
+            calls = self.calls.setdefault(name, [0])
+        trace = self.trace
+        lock = self.lock
+        perf_counter = time.perf_counter
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                end = perf_counter()
+                with lock:
+                    samples.append(end - start)
+                    calls[0] += 1
+                    trace.append((name, start, end, threading.get_ident()))
+        return wrapper
+
+    def instrument(self, obj, names):
+        if self.enabled:
+            for name in names:
+                setattr(obj, name, self.timed(name, getattr(obj, name)))
+
+    def record_rescore(self):
+        now = time.perf_counter()
+        self.rescore_times.append(now)
+        self.rescore_total += 1
+        while self.rescore_times and now - self.rescore_times[0] > 60:
+            self.rescore_times.popleft()
+
+    def words_per_minute(self):
+        # Over the last minute and over the whole session.
+        now = time.perf_counter()
+        recent = [t for t in self.rescore_times if now - t <= 60]
+        window = min(60.0, now - self.started)
+        session = self.rescore_total / max(now - self.started, 1e-9) * 60
+        return (len(recent) / window * 60 if window > 0 else 0.0), session
+
+    def stats(self):
+        # (name, calls, p50, p95, p99, max) per instrumented name, in seconds,
+        # over the retained samples.
+        with self.lock:
+            snapshot = [(name, list(samples), self.calls[name][0]) for name, samples in self.samples.items()]
+        rows = []
+        for name, values, calls in snapshot:
+            values.sort()
+            if not values:
+                continue
+            pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+            rows.append((name, calls, pick(0.50), pick(0.95), pick(0.99), values[-1]))
+        return rows
+
+    def dump_trace(self, path):
+        pid = os.getpid()
+        with self.lock:
+            trace = list(self.trace)
+        events = [{"name": name, "ph": "X", "pid": pid, "tid": tid,
+                   "ts": (start - self.started) * 1e6, "dur": (end - start) * 1e6}
+                  for name, start, end, tid in trace]
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        os.replace(tmp, path)
@@ -0,0 +1,100 @@
+import threading
+
+import numpy as np
+import pytest
+
+from coordination import CoordinationClient, CoordinationServer, CoordinationState
+from word_store import WordBuffer
+
+WORDS = ["CAT", "DOG", "EMU", "FOX", "GNU", "CAT"]
+
+
+@pytest.fixture
+def state(tmp_path):
+    words = WordBuffer.from_words(WORDS)
+    rows = np.arange(len(WORDS))
+    state = CoordinationState(words, rows, np.full(len(WORDS), 50), np.zeros(len(WORDS), dtype=bool),
+                              str(tmp_path / "coord.db"))
+    yield state
+    state.conn.close()
+
+
+def test_batches_are_disjoint(state):
+    a = state.next_batch("a", 2)
+    b = state.next_batch("b", 3)
+    assert a["rows"] == [0, 1] and a["words"] == ["CAT", "DOG"]
+    assert b["rows"] == [2, 3, 4]
+    assert state.next_batch("a", 10)["rows"] == [5]
+    assert state.next_batch("b", 10)["lease"] is None
+
+
+def test_released_lease_returns_rows_not_rescored(state):
+    a = state.next_batch("a", 3)
+    state.record("a", [[1, "DOG", 40, 1, 1.0]])
+    # Another client cannot release a's lease.
+    assert state.next_batch("b", 1, [a["lease"]])["rows"] == [3]
+    assert state.next_batch("a", 2, [a["lease"]])["rows"] == [0, 2]
+
+
+def test_expired_lease_returns_rows(state):
+    state.lease_seconds = -1
+    state.next_batch("a", 2)
+    assert state.next_batch("b", 2)["rows"] == [0, 1]
+
+
+def test_latest_event_wins_whatever_the_order(state):
+    state.next_batch("a", 6)
+    assert state.record("b", [[1, "DOG", 20, 0, 2.0]]) == {"accepted": 1, "rejected": 0}
+    state.record("a", [[1, "DOG", 40, 1, 1.0]])
+    assert not state.done[1]
+    state.record("a", [[1, "DOG", 45, 1, 3.0]])
+    assert state.done[1]
+    assert state.conn.execute("SELECT score, client FROM events").fetchall() == [(45, "a")]
+
+
+def test_events_for_other_words_are_rejected(state):
+    reply = state.record("a", [[1, "EMU", 40, 1, 1.0], [99, "DOG", 40, 1, 1.0], ["1", "DOG", 40, 1, 1.0]])
+    assert reply == {"accepted": 0, "rejected": 3}
+    assert not state.done.any()
+
+
+def test_duplicate_words_are_settled_together(state):
+    state.next_batch("a", 6)
+    state.record("a", [[0, "CAT", 40, 1, 1.0], [5, "CAT", 40, 1, 1.0]])
+    assert state.done[0] and state.done[5]
+    assert state.status()["rescored"] == 2
+
+
+def test_undone_rescore_is_handed_out_again(state):
+    lease = state.next_batch("a", 6)["lease"]
+    state.record("a", [[2, "EMU", 40, 1, 1.0]])
+    state.next_batch("a", 1, [lease])
+    state.next_batch("a", 6)
+    assert state.next_batch("b", 1)["lease"] is None
+    state.record("a", [[2, "EMU", None, 0, 2.0]])
+    assert state.next_batch("b", 1)["rows"] == [2]
+
+
+def test_state_is_restored_from_the_database(state, tmp_path):
+    state.record("a", [[3, "FOX", 40, 1, 1.0]])
+    again = CoordinationState(state.words, state.rows, np.full(len(WORDS), 50),
+                              np.zeros(len(WORDS), dtype=bool), str(tmp_path / "coord.db"))
+    assert again.done.tolist() == [False, False, False, True, False, False]
+    again.conn.close()
+
+
+def test_client_roundtrip(state):
+    server = CoordinationServer(("127.0.0.1", 0), state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = CoordinationClient(f"127.0.0.1:{server.server_address[1]}", "a")
+    try:
+        batch = client.next_batch(2)
+        assert batch["rows"].tolist() == [0, 1]
+        assert batch["scores"].tolist() == [50, 50]
+        assert client.send_events([[0, "CAT", 40, 1, 1.0]]) == {"accepted": 1, "rejected": 0}
+        assert client.status()["rescored"] == 1
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
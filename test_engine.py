@@ -0,0 +1,126 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rescore_cli
+from engine import BatchRescorer, _stepped, load_word_actions, parse_rule
+from store import ScoreStore
+
+
+def chunk(rows):
+    return pd.DataFrame(rows, columns=["word", "score"])
+
+
+def rescore(rules=(), word_actions=None, include_rescored=False, tracked=()):
+    personal = ScoreStore("score")
+    tracker = ScoreStore("rescored", {word: 1 for word in tracked})
+    master = chunk([("CAT", 50), ("DOG", 25), ("QUIZ", 60), ("EMU", 0)])
+    report = BatchRescorer([parse_rule(r) for r in rules], word_actions, include_rescored).run(
+        [master[:2], master[2:]], personal, tracker)
+    return personal.as_dict(), tracker.as_dict(), report
+
+
+def test_parse_rule():
+    rule = parse_rule("length=3-5 bucket=50,25 score=10 regex=^QU increase")
+    assert (rule.length_min, rule.length_max) == (3, 5)
+    assert rule.buckets == [50, 25]
+    assert (rule.score_min, rule.score_max) == (10, 10)
+    assert rule.pattern.pattern == "^QU"
+    assert (rule.action, rule.value) == ("increase", None)
+    assert parse_rule("set=25").value == 25
+
+
+@pytest.mark.parametrize("text, message", [
+    ("length=x set=1", "length=x: expected a number or a range like 3-5"),
+    ("bucket=55 keep", "bucket=55: not a score bucket: 55"),
+    ("bucket=a keep", "bucket=a: buckets must be numbers"),
+    ("regex=( keep", "regex=(: "),
+    ("set=1 keep", "set=1 keep: more than one action"),
+    ("jump", "jump: unknown action"),
+    ("colour=red keep", "colour=red: unknown term"),
+    ("length=3", "length=3: no action"),
+])
+def test_parse_rule_errors(text, message):
+    with pytest.raises(ValueError) as e:
+        parse_rule(text)
+    assert str(e.value).startswith(message)
+
+
+def test_first_matching_rule_wins():
+    personal, tracker, report = rescore(["length=3 set=10", "bucket=50 set=20", "regex=^QU decrease"])
+    assert personal == {"CAT": 10, "DOG": 10, "QUIZ": 50, "EMU": 10}
+    assert tracker == dict.fromkeys(personal, 1)
+    assert report.by_rule == {"length=3 set=10": 3, "bucket=50 set=20": 0, "regex=^QU decrease": 1}
+    assert report.rows == 4 and report.changed == 4
+
+
+def test_word_list_overrides_the_rules(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("# comment\nCAT;keep\nDOG;increase_double\nEMU;40\nCAT;decrease\n", encoding="utf-8")
+    actions = load_word_actions(str(path))
+    assert actions == {"CAT": ("decrease", None), "DOG": ("increase_double", None), "EMU": (None, 40)}
+    personal, _, report = rescore(["set=1"], actions)
+    assert personal == {"CAT": 25, "DOG": 60, "QUIZ": 1, "EMU": 40}
+    assert report.by_word_list == 3
+
+
+def test_word_list_errors_name_the_line(tmp_path):
+    path = tmp_path / "words.txt"
+    path.write_text("CAT;keep\nDOG;sideways\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"words.txt:2: sideways: expected an action or a score"):
+        load_word_actions(str(path))
+    path.write_text("CAT\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"words.txt:1: expected word;action"):
+        load_word_actions(str(path))
+
+
+def test_tracked_words_are_skipped_unless_included():
+    personal, _, report = rescore(["set=10"], tracked=["CAT"])
+    assert "CAT" not in personal
+    assert report.skipped == 1 and report.changed == 3
+    personal, _, report = rescore(["set=10"], include_rescored=True, tracked=["CAT"])
+    assert personal["CAT"] == 10
+    assert report.skipped == 0
+
+
+def test_stepped_clamps_at_the_bucket_ends():
+    buckets = np.array([61, 60, 25, 0])
+    assert _stepped(buckets, "increase_double").tolist() == [61, 61, 60, 50]
+    assert _stepped(buckets, "decrease_double").tolist() == [50, 25, 0, 0]
+    assert _stepped(buckets, "keep").tolist() == [61, 60, 25, 0]
+
+
+@pytest.fixture
+def files(tmp_path):
+    master = tmp_path / "master.txt"
+    master.write_text("CAT;50\nDOG;25\n", encoding="utf-8")
+    return [str(master), str(tmp_path / "personal.txt"), str(tmp_path / "tracker.txt")]
+
+
+def cli(files, *extra):
+    master, personal, tracker = files
+    return rescore_cli.main(["--master", master, "--personal", personal, "--tracker", tracker, *extra])
+
+
+def test_cli_writes_personal_and_tracker(files):
+    assert cli(files, "--rule", "length=3 increase") == 0
+    with open(files[1], encoding="utf-8") as f:
+        assert sorted(f.read().split()) == ["CAT;60", "DOG;50"]
+    with open(files[2], encoding="utf-8") as f:
+        assert sorted(f.read().split()) == ["CAT;1", "DOG;1"]
+
+
+def test_cli_dry_run_writes_nothing(files):
+    assert cli(files, "--rule", "set=10", "--dry-run") == 0
+    assert not any(os.path.exists(path) for path in files[1:])
+
+
+def test_cli_exit_codes_on_bad_input(files, capsys):
+    assert cli(files, "--rule", "length=3") == 2
+    assert "no action" in capsys.readouterr().err
+    assert cli(files) == 2
+    assert cli(files, "--word-list", files[0] + ".missing") == 2
+    files[0] += ".missing"
+    assert cli(files, "--rule", "keep") == 1
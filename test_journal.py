@@ -0,0 +1,69 @@
+from journal import Journal
+from store import ScoreStore
+
+
+def stores(personal=None, tracker=None):
+    return ScoreStore("score", personal), ScoreStore("rescored", tracker)
+
+
+def test_replay_applies_records_in_order(tmp_path):
+    path = str(tmp_path / "personal.txt.journal")
+    journal = Journal(path)
+    journal.record_rescore("CAT", 40)
+    journal.record_rescore("DOG", 30)
+    journal.record_restore("DOG", 20, 0)
+    journal.record_restore("EMU", None, 1)
+    journal.flush()
+    journal.close()
+    personal, tracker = stores()
+    assert Journal(path).replay(personal, tracker) == 4
+    assert personal.as_dict() == {"CAT": 40, "DOG": 20}
+    assert tracker.as_dict() == {"CAT": 1, "DOG": 0, "EMU": 1}
+
+
+def test_replay_reads_old_undo_records(tmp_path):
+    path = tmp_path / "personal.txt.journal"
+    path.write_text("R;CAT;40\nR;DOG;30\nU;DOG;20\nU;EMU;10\n", encoding="utf-8")
+    personal, tracker = stores()
+    assert Journal(str(path)).replay(personal, tracker) == 4
+    # An old undo only reverts entries that exist.
+    assert personal.as_dict() == {"CAT": 40, "DOG": 20}
+    assert tracker.as_dict() == {"CAT": 1, "DOG": 0}
+
+
+def test_replay_skips_torn_and_bad_lines(tmp_path):
+    path = tmp_path / "personal.txt.journal"
+    path.write_text("R;CAT;40\nR;DOG;x\nbad line\nR;EMU;3", encoding="utf-8")
+    personal, tracker = stores()
+    journal = Journal(str(path))
+    assert journal.replay(personal, tracker) == 1
+    assert personal.as_dict() == {"CAT": 40}
+    # The torn last line is cut off before the next write appends.
+    journal.record_rescore("FOX", 10)
+    journal.flush()
+    journal.close()
+    assert path.read_text(encoding="utf-8") == "R;CAT;40\nR;DOG;x\nbad line\nR;FOX;10\n"
+
+
+def test_pending_records_are_counted(tmp_path):
+    journal = Journal(str(tmp_path / "j"), compact_after=2)
+    journal.record_rescore("CAT", 40)
+    assert journal.pending_count == 1 and not journal.needs_compaction()
+    journal.record_rescore("DOG", 30)
+    assert journal.needs_compaction()
+    assert journal.take_pending() == ["R;CAT;40\n", "R;DOG;30\n"]
+    assert journal.pending_count == 0 and len(journal) == 2
+
+
+def test_compact_writes_stores_and_empties_journal(tmp_path):
+    path = str(tmp_path / "personal.txt")
+    journal = Journal(path + ".journal")
+    personal, tracker = stores()
+    personal.upsert("CAT", 40)
+    tracker.upsert("CAT", 1)
+    journal.record_rescore("CAT", 40)
+    journal.compact(journal.take_for_compaction(), lambda: personal.save(path),
+                    lambda: tracker.save(str(tmp_path / "tracker.txt")))
+    assert open(path, encoding="utf-8").read() == "CAT;40\n"
+    assert open(path + ".journal", encoding="utf-8").read() == ""
+    assert len(journal) == 0
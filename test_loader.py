@@ -0,0 +1,47 @@
+import numpy as np
+
+import loader
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_read_word_table_keeps_nan_words(tmp_path):
+    df = loader.read_word_table(write(tmp_path / "m.txt", "NAN;50\nNULL;25\n"))
+    assert df["word"].tolist() == ["NAN", "NULL"]
+    assert df["score"].tolist() == [50, 25]
+
+
+def test_read_word_table_drops_malformed_lines(tmp_path):
+    df = loader.read_word_table(write(tmp_path / "m.txt", "CAT;50\nDOG;x\nEMU;1;2\nFOX;30\n"))
+    assert df["word"].tolist() == ["CAT", "FOX"]
+
+
+def test_read_empty_file(tmp_path):
+    assert len(loader.read_word_table(write(tmp_path / "m.txt", ""))) == 0
+
+
+def test_missing_master_list(tmp_path):
+    assert loader.load_master_wordlist(str(tmp_path / "missing.txt")) is None
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = write(tmp_path / "m.txt", "CAT;50\nÉCU;25\n")
+    cache = str(tmp_path / "cache")
+    words, scores = loader.load_master_wordlist(path, cache)
+    cached = loader.load_snapshot(path, cache)
+    assert cached is not None
+    assert list(cached[0]) == list(words) == ["CAT", "ÉCU"]
+    assert np.array_equal(cached[1], scores)
+
+
+def test_snapshot_is_not_used_for_a_changed_file(tmp_path):
+    path = write(tmp_path / "m.txt", "CAT;50\n")
+    cache = str(tmp_path / "cache")
+    loader.load_master_wordlist(path, cache)
+    write(tmp_path / "m.txt", "CAT;50\nDOG;40\n")
+    assert loader.load_snapshot(path, cache) is None
+    words, _ = loader.load_master_wordlist(path, cache)
+    assert list(words) == ["CAT", "DOG"]
@@ -0,0 +1,129 @@
+import os
+
+import numpy as np
+
+import loader
+from master_diff import LineScan, diff_master, scan_file
+from master_index import MasterIndex
+from word_store import WordBuffer
+
+OLD = "CAT;50\nDOG;30\nEMU;20\nFOX;40\n"
+# DOG rescored, EMU removed, GNU added, FOX moved up.
+NEW = "FOX;40\nCAT;50\nDOG;35\nGNU;10\n"
+
+
+def write(path, text):
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def test_line_hash_ignores_line_endings_and_blank_lines():
+    scan = LineScan()
+    _, _, lf = scan.hash_lines(b"CAT;50\nDOG;30\n")
+    _, _, crlf = scan.hash_lines(b"CAT;50\r\n\r\nDOG;30")
+    assert lf.tolist() == crlf.tolist()
+    assert lf[0] != lf[1]
+
+
+def test_scan_spans_chunks(tmp_path):
+    path = write(tmp_path / "list.txt", "".join(f"WORD{i};{i % 101}\n" for i in range(500)))
+    scan = LineScan(chunk_bytes=64)
+    hashes = np.concatenate([h for _, _, _, h in scan.chunks(path)])
+    digest, whole = scan_file(path)
+    assert scan.digest == digest
+    assert hashes.tolist() == whole.tolist()
+
+
+def test_diff_master_counts_changes(tmp_path):
+    path = write(tmp_path / "master.txt", OLD)
+    _, hashes = scan_file(path)
+    old_words = WordBuffer.from_words(["CAT", "DOG", "EMU", "FOX"])
+    old_scores = np.array([50, 30, 20, 40], dtype=np.uint8)
+    write(tmp_path / "master.txt", NEW)
+    words, scores, _, _, changes = diff_master(path, old_words, old_scores, hashes, "old")
+    assert list(words) == ["FOX", "CAT", "DOG", "GNU"]
+    assert scores.tolist() == [40, 50, 35, 10]
+    assert changes.added.tolist() == [3]
+    assert changes.rescored.tolist() == [2]
+    assert changes.old_scores.tolist() == [30]
+    assert changes.removed == 1
+    assert changes.summary() == "1 added, 1 removed, 1 rescored"
+
+
+def test_reload_matches_a_full_parse(tmp_path):
+    path = write(tmp_path / "master.txt", OLD)
+    cache = str(tmp_path / "cache")
+    loader.load_master_wordlist(path, cache)
+    assert loader.load_master_changes(path, cache) is None
+    write(tmp_path / "master.txt", NEW)
+    words, scores = loader.load_master_wordlist(path, cache)
+    df = loader.read_word_table(path)
+    assert list(words) == df["word"].tolist()
+    assert scores.tolist() == df["score"].tolist()
+    changes = loader.load_master_changes(path, cache)
+    assert changes.rows().tolist() == [2, 3]
+    assert not changes.requeued
+    loader.mark_changes_requeued(path, cache)
+    assert loader.load_master_changes(path, cache).requeued
+    # Loading the unchanged list again comes straight from the snapshot.
+    words, scores = loader.load_master_wordlist(path, cache)
+    assert list(words) == ["FOX", "CAT", "DOG", "GNU"]
+
+
+def test_malformed_update_falls_back_to_a_full_parse(tmp_path):
+    path = write(tmp_path / "master.txt", OLD)
+    cache = str(tmp_path / "cache")
+    loader.load_master_wordlist(path, cache)
+    write(tmp_path / "master.txt", OLD + "GNU;many\nYAK;5\n")
+    words, scores = loader.load_master_wordlist(path, cache)
+    assert list(words) == ["CAT", "DOG", "EMU", "FOX", "YAK"]
+    assert scores.tolist() == [50, 30, 20, 40, 5]
+    assert loader.load_master_changes(path, cache) is None
+
+
+def test_master_index_changed_only(tmp_path):
+    path = write(tmp_path / "master.txt", OLD)
+    cache = str(tmp_path / "cache")
+    loader.load_master_wordlist(path, cache)
+    write(tmp_path / "master.txt", NEW)
+    words, scores = loader.load_master_wordlist(path, cache)
+    index = MasterIndex(words, scores, seed=0)
+    index.fill(len(index), {}, ["GNU"])
+    assert index.count(1, 15, 0, 100, changed_only=True) == (0, 0)
+    index.set_changes(loader.load_master_changes(path, cache))
+    rows = index.order[index.select(1, 15, 0, 100, changed_only=True)]
+    assert sorted(index.words[rows]) == ["DOG", "GNU"]
+    assert index.count(1, 15, 0, 100, changed_only=True) == (1, 2)
+    assert index.count(1, 15, 0, 100) == (1, 4)
+    assert index.matches(3, 1, 15, 0, 100, changed_only=True)
+    assert not index.matches(0, 1, 15, 0, 100, changed_only=True)
+
+
+def test_load_session_requeues_rescored_words_once(tmp_path):
+    from session import SessionConfig, load_session
+    path = write(tmp_path / "master.txt", OLD)
+    personal = write(tmp_path / "personal.txt", "DOG;25\n")
+    tracker = write(tmp_path / "tracker.txt", "DOG;1\nCAT;1\n")
+    cache = str(tmp_path / "cache")
+    loader.load_master_wordlist(path, cache)
+    write(tmp_path / "master.txt", NEW)
+    config = SessionConfig(path, personal, tracker, 1, 15, 0, 100, cache, 0, 1, [], [],
+                           "text", "", False, True)
+
+    def load():
+        stores = {}
+        load_session(config, lambda *a: None, lambda index, *rest: stores.setdefault("stores", rest),
+                     lambda rows, scores: None, lambda index: None)
+        personal_scores, tracker_store, journal = stores["stores"]
+        journal.close()
+        return personal_scores, tracker_store
+
+    personal_scores, tracker_store = load()
+    assert tracker_store.get("DOG") == 0
+    assert tracker_store.get("CAT") == 1
+    assert personal_scores.get("DOG") == 25
+    assert loader.load_master_changes(path, cache).requeued
+    # Rescored again: the same update does not clear it a second time.
+    os.remove(personal + ".journal")
+    write(tmp_path / "tracker.txt", "DOG;1\nCAT;1\n")
+    assert load()[1].get("DOG") == 1
@@ -0,0 +1,43 @@
+from oplog import Op, OpLog
+
+
+def test_undo_redo_round_trip():
+    log = OpLog(capacity=2)
+    log.push(1, 50, 60, None, None)
+    log.push(2, 25, 0, 30, 1)
+    log.push(3, 60, 61, 60, 0)
+    assert len(log) == 3
+    assert log.undo() == [Op(3, 60, 61, 60, 0)]
+    assert log.undo() == [Op(2, 25, 0, 30, 1)]
+    assert log.redo() == [Op(2, 25, 0, 30, 1)]
+    assert log.can_redo()
+    assert log.redo() == [Op(3, 60, 61, 60, 0)]
+    assert not log.can_redo() and log.redo() == []
+
+
+def test_undo_at_start_is_empty():
+    log = OpLog()
+    assert not log.can_undo() and log.undo() == []
+
+
+def test_new_push_drops_redo_tail():
+    log = OpLog()
+    log.push(1, 50, 60, None, None)
+    log.push(2, 50, 60, None, None)
+    log.undo()
+    log.push(3, 50, 25, None, None)
+    assert len(log) == 2 and not log.can_redo()
+    assert log.undo()[0].row == 3
+    assert log.undo()[0].row == 1
+
+
+def test_joined_ops_undo_and_redo_together():
+    log = OpLog()
+    log.push(1, 50, 60, None, None)
+    log.push(2, 50, 60, None, None)
+    log.push(5, 50, 60, None, None, joined=True)
+    log.push(6, 50, 60, None, None, joined=True)
+    assert [op.row for op in log.undo()] == [6, 5, 2]
+    assert [op.row for op in log.redo()] == [2, 5, 6]
+    assert [op.row for op in log.undo()] == [6, 5, 2]
+    assert [op.row for op in log.undo()] == [1]
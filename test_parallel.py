@@ -0,0 +1,54 @@
+import pandas as pd
+import pytest
+
+import loader
+from parallel import byte_ranges, iter_pipeline, run_pipeline
+
+LINES = [f"WORD{i};{i % 101}" for i in range(300)]
+
+
+def write(path, text):
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("text", ["\n".join(LINES) + "\n", "\n".join(LINES), "ONE;1"])
+def test_byte_ranges_split_on_newlines_and_cover_the_file(tmp_path, text):
+    path = write(tmp_path / "list.txt", text)
+    data = text.encode("utf-8")
+    ranges = byte_ranges(path, chunk_bytes=100)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert data[end - 1:end] == b"\n"
+
+
+def test_byte_ranges_of_an_empty_file(tmp_path):
+    assert byte_ranges(write(tmp_path / "empty.txt", "")) == []
+    assert run_pipeline([str(tmp_path / "empty.txt")], workers=1).empty
+
+
+def test_ranges_parse_in_file_order(tmp_path):
+    path = write(tmp_path / "list.txt", "\n".join(LINES))
+    frames = list(iter_pipeline([path], workers=1, chunk_bytes=100))
+    assert len(frames) > 1
+    assert pd.concat(frames)["word"].tolist() == [line.split(";")[0] for line in LINES]
+
+
+@pytest.mark.parametrize("text", [
+    "\n".join(LINES) + "\n",
+    "\n".join(LINES[:100] + ["BROKEN;x", "NOSCORE", "EXTRA;1;2", ""] + LINES[100:]),
+])
+def test_workers_match_a_single_process_and_the_loader(tmp_path, text):
+    path = write(tmp_path / "list.txt", text)
+    expected = loader.read_word_table(path)
+    for workers in (1, 2):
+        df = run_pipeline([path], workers=workers, chunk_bytes=256)
+        assert df["word"].tolist() == expected["word"].tolist()
+        assert df["score"].tolist() == expected["score"].tolist()
+
+
+def test_overrides_and_filters(tmp_path):
+    path = write(tmp_path / "list.txt", "CAT;50\nHORSE;40\nEMU;20\n")
+    df = run_pipeline([path], {"EMU": 60}, (3, 3, 0, 100), workers=2, chunk_bytes=8)
+    assert dict(zip(df["word"], df["score"])) == {"CAT": 50, "EMU": 60}
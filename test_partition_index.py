@@ -0,0 +1,40 @@
+import numpy as np
+
+from master_index import MasterIndex
+from partition_index import PartitionIndex
+from word_store import WordBuffer
+
+
+def test_counts_match_a_scan():
+    rng = np.random.default_rng(0)
+    lengths = rng.integers(1, 20, 5000)
+    scores = rng.integers(0, 101, 5000)
+    done = rng.random(5000) < 0.3
+    index = PartitionIndex()
+    index.add(lengths[:2000], scores[:2000], done[:2000])
+    index.add(lengths[2000:], scores[2000:], done[2000:])
+    for filters in [(3, 10, 25, 60), (1, 40, 0, 100), (5, 5, 50, 50), (10, 3, 0, 100)]:
+        lo, hi, smin, smax = filters
+        mask = (lengths >= lo) & (lengths <= hi) & (scores >= smin) & (scores <= smax)
+        assert index.count(*filters) == (int((mask & done).sum()), int(mask.sum()))
+
+
+def test_grows_for_long_words_and_marks():
+    index = PartitionIndex(max_length=4)
+    index.add(np.array([40]), np.array([50]), np.array([False]))
+    assert index.count(1, 50, 0, 100) == (0, 1)
+    index.mark(40, 50, 1)
+    assert index.count(1, 50, 0, 100) == (1, 1)
+    index.mark(40, 50, -1)
+    assert index.count(1, 50, 0, 100) == (0, 1)
+
+
+def test_master_index_mark_done_updates_counts():
+    words = WordBuffer.from_words(["CAT", "HORSE", "EMU"])
+    index = MasterIndex(words, np.array([50, 40, 30], dtype=np.uint8), seed=0)
+    index.fill(len(index), {}, [])
+    assert index.partition.count(3, 5, 0, 100) == (0, 3)
+    assert index.mark_done(1, True)
+    assert not index.mark_done(1, True)
+    assert index.partition.count(3, 5, 0, 100) == (1, 3)
+    assert index.partition.count(3, 3, 0, 100) == (0, 2)
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from PyQt5.QtCore import QCoreApplication
+
+from persistence import PersistenceWorker
+
+
+class FlakyJournal:
+    # Fails the first `failures` writes with the given exception.
+    def __init__(self, failures, error):
+        self.failures = failures
+        self.error = error
+        self.lines = []
+
+    def write(self, lines):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.lines.extend(lines)
+
+    def compact(self, lines, *writers):
+        self.write(lines)
+        for write in writers:
+            write()
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def worker(app):
+    worker = PersistenceWorker()
+    yield worker
+    worker.shutdown()
+
+
+@pytest.mark.parametrize("error", [OSError("disk full"), ValueError("bad record")])
+def test_failed_batch_is_reported_and_retried(app, worker, error):
+    journal = FlakyJournal(1, error)
+    errors = []
+    worker.failed.connect(errors.append)
+    worker.flush(journal, ["a\n", "b\n"])
+    worker.wait_idle()
+    # Signals from the I/O thread are delivered by the event loop.
+    app.processEvents()
+    assert errors == [str(error)]
+    assert worker.last_error == str(error)
+    assert journal.lines == []
+    worker.flush(journal, ["c\n"])
+    worker.wait_idle()
+    assert journal.lines == ["a\n", "b\n", "c\n"]
+    assert worker.last_error is None
+
+
+def test_failed_batch_is_retried_by_compaction(worker):
+    journal = FlakyJournal(1, OSError("locked"))
+    worker.flush(journal, ["a\n"])
+    worker.wait_idle()
+    saved = []
+    worker.compact(journal, ["b\n"], lambda: saved.append(True))
+    worker.wait_idle()
+    assert journal.lines == ["a\n", "b\n"]
+    assert saved == [True]
+
+
+def test_empty_flush_writes_nothing(worker):
+    journal = FlakyJournal(0, None)
+    worker.flush(journal, [])
+    worker.wait_idle()
+    assert journal.lines == []
@@ -0,0 +1,42 @@
+import numpy as np
+
+from prioritizer import ChangeModel, PrioritizedQueue, word_features
+from word_store import WordBuffer
+
+WORDS = WordBuffer.from_words(["CAT", "CATS", "DOG", "DOGS", "EMU"])
+
+
+def test_word_features_are_letter_pairs_with_ends():
+    owner, bigrams, counts = word_features(WORDS, [0, 4])
+    assert owner.tolist() == [0, 0, 0, 0, 1, 1, 1, 1]
+    assert bigrams[:4].tolist() == [ord("C"), ord("C") << 8 | ord("A"), ord("A") << 8 | ord("T"), ord("T") << 8]
+    assert counts.tolist() == [4, 4]
+
+
+def test_model_ranks_similar_words_higher():
+    model = ChangeModel(WORDS)
+    assert model.priorities([1, 3], [5, 5]).tolist() == [0, 0]
+    model.learn([0, 2], [5, 5], [True, False])
+    cats, dogs = model.priorities([1, 3], [5, 5])
+    assert cats > dogs
+    # Undo forgets the decisions again.
+    model.learn([0, 2], [5, 5], [True, False], weight=-1)
+    assert len(model) == 0
+
+
+def test_queue_serves_every_word_once():
+    done = np.zeros(len(WORDS), dtype=bool)
+    model = ChangeModel(WORDS)
+    queue = PrioritizedQueue(WORDS, done, model, window=2, explore_every=0)
+    queue.extend(np.array([4, 2, 0, 3, 1]), np.array([5, 5, 5, 5, 5]))
+    # An untrained model keeps the shuffled order.
+    assert queue.current()[1] == "EMU"
+    model.learn([0, 2], [5, 5], [True, False])
+    served = []
+    while queue.current() is not None:
+        row, word, _ = queue.current()
+        served.append(word)
+        done[row] = True
+        queue.advance()
+    assert sorted(served) == sorted(WORDS)
+    assert served.index("CATS") < served.index("DOGS")
@@ -0,0 +1,32 @@
+import loader
+from related import RelatedIndex, load_related_index, stem
+from word_store import WordBuffer
+
+
+def test_stem_groups_inflections():
+    assert len({stem(w) for w in ["ERASE", "ERASES", "ERASED", "ERASER", "ERASING"]}) == 1
+    assert stem("STOPPED") == stem("STOPPING") == stem("STOP")
+    assert stem("CRIES") == stem("CRIED") == stem("CRY")
+
+
+def test_related_lists_other_group_members():
+    words = WordBuffer.from_words(["ERASE", "CAT", "ERASED", "DOG", "ERASING"])
+    index = RelatedIndex.build(words, chunk_size=2)
+    assert index.related(0).tolist() == [2, 4]
+    assert index.related(1).tolist() == []
+
+
+def test_build_can_be_cancelled():
+    words = WordBuffer.from_words(["ERASE", "CAT"])
+    assert RelatedIndex.build(words, cancelled=lambda: True) is None
+
+
+def test_index_is_cached_with_the_snapshot(tmp_path):
+    path = tmp_path / "m.txt"
+    path.write_text("ERASE;50\nERASED;40\nCAT;30\n", encoding="utf-8")
+    cache = str(tmp_path / "cache")
+    words, _ = loader.load_master_wordlist(str(path), cache)
+    built = load_related_index(str(path), cache, words, True)
+    cached = load_related_index(str(path), cache, words, True,
+                                on_progress=lambda *a: (_ for _ in ()).throw(AssertionError("rebuilt")))
+    assert cached.related(0).tolist() == built.related(0).tolist() == [1]
@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+
+from scoring import filter_wordlist, map_score_to_bucket, map_scores_to_buckets, overlay_scores
+
+
+def test_vectorized_buckets_match_scalar():
+    scores = np.arange(-5, 106)
+    assert map_scores_to_buckets(scores).tolist() == [map_score_to_bucket(s) for s in scores]
+
+
+def test_series_keeps_index():
+    result = map_scores_to_buckets(pd.Series([12, 55], index=[3, 7]))
+    assert result.index.tolist() == [3, 7]
+    assert result.tolist() == [map_score_to_bucket(12), map_score_to_bucket(55)]
+
+
+def test_overlay_scores():
+    words = pd.Series(["CAT", "DOG"])
+    scores = pd.Series([50, 30])
+    assert overlay_scores(words, scores, {"DOG": 10}).tolist() == [50, 10]
+    assert overlay_scores(words, scores, {}) is scores
+
+
+def test_filter_wordlist():
+    df = pd.DataFrame({"word": ["CAT", "HORSE", "OX"], "score": [50, 40, 55]})
+    filtered = filter_wordlist(df, 3, 5, 45, 60)
+    assert filtered["word"].tolist() == ["CAT"]
+    assert filtered["score"].tolist() == [map_score_to_bucket(50)]
@@ -0,0 +1,50 @@
+import re
+
+import pytest
+
+from search import ANAGRAM, PATTERN, REGEX, SearchIndex
+from word_store import WordBuffer
+
+WORDS = ["CAT", "COT", "CUT", "ACT", "DOG", "TAC", "CART"]
+
+
+@pytest.fixture
+def index():
+    return SearchIndex.build(WordBuffer.from_words(WORDS))
+
+
+def found(index, mode, query, limit=None):
+    return [index.words[int(row)] for row in index.search(mode, query, limit)]
+
+
+def test_pattern(index):
+    assert found(index, PATTERN, "C?T") == ["CAT", "COT", "CUT"]
+    assert found(index, PATTERN, "c.t") == ["CAT", "COT", "CUT"]
+    assert found(index, PATTERN, "DOG") == ["DOG"]
+    assert found(index, PATTERN, "????????") == []
+
+
+def test_anagram(index):
+    assert sorted(found(index, ANAGRAM, "tca")) == ["ACT", "CAT", "TAC"]
+    assert found(index, ANAGRAM, "XYZ") == []
+
+
+def test_regex_is_whole_word_and_case_insensitive(index):
+    assert found(index, REGEX, "c.t") == ["CAT", "COT", "CUT"]
+    assert found(index, REGEX, "C") == []
+    assert found(index, REGEX, "cat|dog") == ["CAT", "DOG"]
+
+
+def test_regex_negated_class_stays_within_a_word(index):
+    assert found(index, REGEX, "C[^Z]*") == ["CAT", "COT", "CUT", "CART"]
+    assert found(index, REGEX, "[^D]+") == ["CAT", "COT", "CUT", "ACT", "TAC", "CART"]
+
+
+def test_regex_limit(index):
+    assert found(index, REGEX, ".*", 2) == ["CAT", "COT"]
+    assert len(found(index, REGEX, ".*")) == len(WORDS)
+
+
+def test_regex_error(index):
+    with pytest.raises(re.error):
+        index.search(REGEX, "(")
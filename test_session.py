@@ -0,0 +1,50 @@
+import loader
+from session import SessionConfig, settings_change
+
+
+def config(tmp_path, **changes):
+    base = SessionConfig(str(tmp_path / "master.txt"), str(tmp_path / "personal.txt"),
+                         str(tmp_path / "tracker.txt"), 1, 15, 0, 100, "", 0, 1, [], [],
+                         "text", "", False, True)
+    return base._replace(**changes)
+
+
+def test_files_and_sources_need_a_reload(tmp_path):
+    old = config(tmp_path)
+    for field, value in [("master_wordlist_file", "other.txt"), ("shuffle_seed", 7),
+                         ("extra_wordlist_files", ["extra.txt"]), ("storage_backend", "sqlite")]:
+        assert settings_change(old, config(tmp_path, **{field: value})) == "reload"
+
+
+def test_same_file_by_another_path_is_no_change(tmp_path):
+    (tmp_path / "sub").mkdir()
+    old = config(tmp_path)
+    new = config(tmp_path, personal_wordlist_file=str(tmp_path / "sub" / ".." / "personal.txt"))
+    assert settings_change(old, new) is None
+
+
+def test_filters_only_rebuild_the_queue(tmp_path):
+    old = config(tmp_path)
+    assert settings_change(old, config(tmp_path, length_min=3)) == "filter"
+    assert settings_change(old, config(tmp_path, score_max=60)) == "filter"
+    assert settings_change(old, config(tmp_path, master_changes_only=True)) == "filter"
+    # A reload field wins over a filter change.
+    assert settings_change(old, config(tmp_path, length_min=3, shuffle_seed=7)) == "reload"
+
+
+def test_other_settings_change_nothing(tmp_path):
+    old = config(tmp_path)
+    for field, value in [("snapshot_cache_dir", "cache"), ("load_workers", 4), ("requeue_master_changes", False)]:
+        assert settings_change(old, config(tmp_path, **{field: value})) is None
+
+
+def test_changed_master_file_needs_a_reload(tmp_path):
+    master = tmp_path / "master.txt"
+    master.write_text("CAT;50\n", encoding="utf-8")
+    old = config(tmp_path)
+    signature = loader.file_signature(str(master))
+    assert settings_change(old, old, signature) is None
+    master.write_text("CAT;50\nDOG;30\n", encoding="utf-8")
+    assert settings_change(old, old, signature) == "reload"
+    master.unlink()
+    assert settings_change(old, old, signature) == "reload"
@@ -0,0 +1,56 @@
+import numpy as np
+
+from sources import BLOCK, WordlistLayer, WordlistStack, normalize_word, sorted_unique
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_normalize_word():
+    assert normalize_word("Ice cream") == "ICECREAM"
+
+
+def test_sorted_unique_keeps_last_occurrence():
+    words, scores, spellings = sorted_unique(np.array(["B", "A", "B"], dtype=object), np.array([1, 2, 3]),
+                                             np.array(["b", "a", "B"], dtype=object))
+    assert words.tolist() == ["A", "B"]
+    assert scores.tolist() == [2, 3]
+    assert spellings.tolist() == ["a", "B"]
+
+
+def test_merge_returns_original_spellings(tmp_path):
+    extra = write(tmp_path / "extra.txt", "CAT;60\nIce cream;40\n")
+    stack = WordlistStack([WordlistLayer(extra)])
+    words, scores, source = stack.merge(["cat", "dog"], [50, 30])
+    merged = dict(zip(words.tolist(), scores.tolist()))
+    # The master spelling wins over the layer's, so personal and tracker
+    # entries keyed on "cat" keep matching.
+    assert merged == {"cat": 60, "dog": 30, "Ice cream": 40}
+    assert dict(zip(words.tolist(), source.tolist())) == {"cat": 1, "dog": 0, "Ice cream": 1}
+
+
+def test_block_layer_matches_normalized(tmp_path):
+    blocked = write(tmp_path / "block.txt", "CAT\n")
+    words, _, _ = WordlistStack([WordlistLayer(blocked, BLOCK)]).merge(["cat", "dog"], [50, 30])
+    assert words.tolist() == ["dog"]
+
+
+def test_load_session_keeps_personal_and_tracker(tmp_path):
+    from session import SessionConfig, load_session
+    master = write(tmp_path / "master.txt", "cat;50\ndog;30\n")
+    personal = write(tmp_path / "personal.txt", "cat;25\n")
+    tracker = write(tmp_path / "tracker.txt", "cat;1\n")
+    extra = write(tmp_path / "extra.txt", "EMU;40\n")
+    config = SessionConfig(master, personal, tracker, 1, 15, 0, 100, "", 0, 1, [extra], [],
+                           "text", "", False, False)
+    result = {}
+    load_session(config, lambda *a: None, lambda *stores: None, lambda rows, scores: None,
+                 lambda index: result.setdefault("index", index))
+    index = result["index"]
+    rows = {index.words[int(row)]: int(row) for row in range(len(index))}
+    slot = index.slot[rows["cat"]]
+    assert index.scores[slot] == 25
+    assert index.done[rows["cat"]]
+    assert not index.done[rows["EMU"]]
@@ -0,0 +1,72 @@
+import pytest
+
+from sqlite_store import SqliteJournal
+from store import ScoreStore
+
+
+@pytest.fixture
+def corrupt_db(tmp_path):
+    path = tmp_path / "corrupt.db"
+    path.write_bytes(b"this is not a database" * 100)
+    return str(path)
+
+
+def test_write_and_load(tmp_path):
+    journal = SqliteJournal(str(tmp_path / "w.db"))
+    assert journal.is_empty()
+    journal.record_rescore("CAT", 40)
+    journal.record_rescore("DOG", 30)
+    journal.record_restore("DOG", 20, 0)
+    journal.record_restore("EMU", None, 1)
+    journal.flush()
+    personal, tracker = journal.load()
+    assert personal.as_dict() == {"CAT": 40, "DOG": 20}
+    assert tracker.as_dict() == {"CAT": 1, "DOG": 0, "EMU": 1}
+    journal.record_restore("EMU", None, None)
+    journal.flush()
+    assert "EMU" not in journal.load()[1]
+    journal.close()
+
+
+def test_import_stores(tmp_path):
+    journal = SqliteJournal(str(tmp_path / "w.db"))
+    journal.import_stores(ScoreStore("score", {"CAT": 25}), ScoreStore("rescored", {"CAT": 1, "DOG": 1}))
+    personal, tracker = journal.load()
+    assert personal.as_dict() == {"CAT": 25}
+    assert tracker.as_dict() == {"CAT": 1, "DOG": 1}
+    journal.close()
+
+
+def test_import_text_replays_an_old_journal(tmp_path):
+    personal = tmp_path / "personal.txt"
+    personal.write_text("CAT;25\n", encoding="utf-8")
+    (tmp_path / "personal.txt.journal").write_text("R;DOG;30\nU;DOG;20\nR;EMU;40\n", encoding="utf-8")
+    journal = SqliteJournal(str(tmp_path / "w.db"))
+    assert journal.import_text(str(personal), str(tmp_path / "tracker.txt")) == (3, 2)
+    personal_scores, tracker = journal.load()
+    assert personal_scores.as_dict() == {"CAT": 25, "DOG": 20, "EMU": 40}
+    assert tracker.as_dict() == {"DOG": 0, "EMU": 1}
+    journal.close()
+
+
+def test_corrupt_database_raises_os_error(corrupt_db):
+    journal = SqliteJournal(corrupt_db)
+    with pytest.raises(OSError):
+        journal.is_empty()
+    with pytest.raises(OSError):
+        journal.load()
+
+
+def test_session_loader_reports_corrupt_database(tmp_path, corrupt_db):
+    pytest.importorskip("PyQt5")
+    from session import SessionConfig
+    from startup import SessionLoader
+    master = tmp_path / "master.txt"
+    master.write_text("CAT;50\n", encoding="utf-8")
+    config = SessionConfig(str(master), str(tmp_path / "p.txt"), str(tmp_path / "t.txt"), 1, 15, 0, 100,
+                           "", 0, 1, [], [], "sqlite", corrupt_db, False, False)
+    loader = SessionLoader(config)
+    errors = []
+    loader.failed.connect(errors.append)
+    loader._run()
+    assert errors and corrupt_db in errors[0]
@@ -0,0 +1,44 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import startup
+from startup import IndexLoader, SessionLoader
+
+
+def test_session_loader_reports_any_error(monkeypatch):
+    def load_session(*args, **kwargs):
+        raise KeyError("score")
+
+    monkeypatch.setattr(startup, "load_session", load_session)
+    loader = SessionLoader(None)
+    errors, finished = [], []
+    loader.failed.connect(errors.append)
+    loader.finished.connect(lambda: finished.append(True))
+    loader._run()
+    assert errors == ["KeyError: 'score'"]
+    assert finished == [True]
+
+
+def test_index_loader_reports_any_error():
+    def build(on_progress, cancelled):
+        raise RuntimeError("out of range")
+
+    loader = IndexLoader(build)
+    errors, ready = [], []
+    loader.failed.connect(errors.append)
+    loader.ready.connect(ready.append)
+    loader._run()
+    assert errors == ["RuntimeError: out of range"]
+    assert ready == []
+
+
+def test_file_errors_keep_their_message():
+    def build(on_progress, cancelled):
+        raise OSError("master.txt: not found")
+
+    loader = IndexLoader(build)
+    errors = []
+    loader.failed.connect(errors.append)
+    loader._run()
+    assert errors == ["master.txt: not found"]
@@ -0,0 +1,37 @@
+import loader
+from store import ScoreStore
+
+
+def test_upsert_returns_previous_value():
+    store = ScoreStore("score")
+    assert store.upsert("CAT", 40) is None
+    assert store.upsert("CAT", 50) == 40
+    assert store.get("CAT") == 50 and "CAT" in store and len(store) == 1
+
+
+def test_revert_only_touches_known_words():
+    store = ScoreStore("rescored", {"CAT": 1})
+    store.revert("CAT", 0)
+    store.revert("DOG", 0)
+    assert store.as_dict() == {"CAT": 0}
+
+
+def test_restore_puts_back_absent_words():
+    store = ScoreStore("score", {"CAT": 40})
+    store.restore("CAT", None)
+    store.restore("DOG", 20)
+    assert store.as_dict() == {"DOG": 20}
+
+
+def test_copy_is_independent():
+    store = ScoreStore("score", {"CAT": 40})
+    copy = store.copy()
+    copy.upsert("CAT", 10)
+    assert store.get("CAT") == 40
+
+
+def test_save_round_trip(tmp_path):
+    path = str(tmp_path / "personal.txt")
+    ScoreStore("score", {"CAT": 40, "NAN": 25}).save(path)
+    loaded = ScoreStore.from_frame(loader.load_personal_wordlist(path), "score")
+    assert loaded.as_dict() == {"CAT": 40, "NAN": 25}
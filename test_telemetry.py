@@ -0,0 +1,52 @@
+import json
+import threading
+
+from telemetry import Telemetry
+
+
+class Worker:
+    def step(self, n):
+        return n * 2
+
+
+def test_disabled_leaves_methods_alone():
+    worker = Worker()
+    original = worker.step
+    Telemetry(False).instrument(worker, ["step"])
+    assert worker.step == original
+
+
+def test_stats_and_trace(tmp_path):
+    telemetry = Telemetry(True)
+    worker = Worker()
+    telemetry.instrument(worker, ["step"])
+    assert [worker.step(i) for i in range(10)] == [i * 2 for i in range(10)]
+    (name, calls, p50, p95, p99, worst), = telemetry.stats()
+    assert (name, calls) == ("step", 10)
+    assert 0 <= p50 <= p95 <= p99 <= worst
+    path = str(tmp_path / "trace.json")
+    telemetry.dump_trace(path)
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)["traceEvents"]) == 10
+
+
+def test_stats_while_another_thread_records():
+    # The I/O thread records samples while the GUI thread reads the stats.
+    telemetry = Telemetry(True, samples=50)
+    worker = Worker()
+    telemetry.instrument(worker, ["step"])
+    stop = threading.Event()
+
+    def record():
+        while not stop.is_set():
+            worker.step(1)
+
+    thread = threading.Thread(target=record)
+    thread.start()
+    try:
+        for _ in range(2000):
+            telemetry.stats()
+    finally:
+        stop.set()
+        thread.join()
+    assert telemetry.stats()[0][1] > 0
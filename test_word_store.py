@@ -0,0 +1,47 @@
+import numpy as np
+
+from word_store import WordBuffer, compact_scores, load_arrays, save_arrays
+
+WORDS = ["CAT", "Ice cream", "CAFÉ", "", "DOG"]
+
+
+def test_from_words_roundtrip():
+    buffer = WordBuffer.from_words(WORDS)
+    assert len(buffer) == len(WORDS)
+    assert list(buffer) == WORDS
+    assert buffer[2] == "CAFÉ"
+    assert buffer[np.int64(4)] == "DOG"
+    assert buffer[np.array([4, 0])] == ["DOG", "CAT"]
+
+
+def test_lengths_count_characters_not_bytes():
+    buffer = WordBuffer.from_words(WORDS)
+    assert buffer.lengths.tolist() == [3, 9, 4, 0, 3]
+    assert buffer.data.nbytes == len("".join(WORDS).encode("utf-8"))
+
+
+def test_save_and_load_arrays(tmp_path):
+    def write_atomic(target, write):
+        with open(target, "wb") as f:
+            write(f)
+
+    buffer = WordBuffer.from_words(WORDS)
+    base = str(tmp_path / "snapshot")
+    save_arrays(base, buffer.arrays(), write_atomic)
+    assert list(WordBuffer.from_arrays(load_arrays(base, ["words", "offsets", "lengths"]))) == WORDS
+    assert load_arrays(base, ["words", "missing"]) is None
+
+
+def test_compact_scores_clips():
+    assert compact_scores([-5, 50, 300]).tolist() == [0, 50, 255]
+
+
+def test_take_and_concat():
+    buffer = WordBuffer.from_words(WORDS)
+    taken = buffer.take([4, 2, 2, 0], chunk_size=3)
+    assert list(taken) == ["DOG", "CAFÉ", "CAFÉ", "CAT"]
+    assert taken.lengths.tolist() == [3, 4, 4, 3]
+    assert list(buffer.take([])) == []
+    joined = WordBuffer.concat([buffer, WordBuffer.from_words(["EMU"])])
+    assert list(joined) == WORDS + ["EMU"]
+    assert joined[5] == "EMU"
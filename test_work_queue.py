@@ -0,0 +1,51 @@
+import numpy as np
+
+from word_store import WordBuffer
+from work_queue import WorkQueue
+
+WORDS = WordBuffer.from_words(["CAT", "DOG", "EMU", "FOX"])
+
+
+def make_queue(done):
+    queue = WorkQueue(WORDS, lambda row: done[row])
+    queue.extend(np.array([2, 0, 3, 1]), np.array([25, 50, 60, 0]))
+    return queue
+
+
+def test_current_skips_done_rows():
+    done = np.array([True, False, False, False])
+    queue = make_queue(done)
+    assert queue.current() == (2, "EMU", 25)
+    queue.advance()
+    assert queue.current() == (3, "FOX", 60)
+    queue.advance()
+    assert queue.current() == (1, "DOG", 0)
+    queue.advance()
+    assert queue.current() is None
+
+
+def test_extend_grows_past_capacity():
+    done = np.zeros(4, dtype=bool)
+    queue = WorkQueue(WORDS, lambda row: done[row])
+    rows = np.arange(3000) % 4
+    queue.extend(rows, np.zeros(3000))
+    assert len(queue) == 3000
+
+
+def test_push_front_returns_undone_word_first():
+    done = np.zeros(4, dtype=bool)
+    queue = make_queue(done)
+    queue.push_front(0, 50)
+    assert queue.current() == (0, "CAT", 50)
+    # A pushed-back word rescored again meanwhile is dropped.
+    done[0] = True
+    assert queue.current() == (2, "EMU", 25)
+
+
+def test_jump_to_shows_word_once_even_if_done():
+    done = np.array([False, True, False, False])
+    queue = make_queue(done)
+    queue.jump_to(1, 0)
+    assert queue.current() == (1, "DOG", 0)
+    queue.advance()
+    assert queue.current() == (2, "EMU", 25)
@@ -0,0 +1,140 @@
+import os
+
+from PyQt5.QtWidgets import QWidget, QFrame, QLabel, QVBoxLayout, QHBoxLayout
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont, QPixmap
+
+
+def load_icon_pixmaps(icon_paths):
+    # Decode every ticker icon once; a missing or unreadable file maps to None
+    # and the ticker shows the icon key as text instead.
+    pixmaps = {}
+    for key, path in icon_paths.items():
+        pixmap = QPixmap(path) if os.path.exists(path) else None
+        pixmaps[key] = pixmap if pixmap is not None and not pixmap.isNull() else None
+    return pixmaps
+
+
+class WordCard(QLabel):
+    # The main word display. One label is kept for the whole session and
+    # only its text and (when the bucket changes) its stylesheet are updated.
+
+    def __init__(self, bucket_colors, parent=None):
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumHeight(150)
+        self.styles = {bucket: f"""
+            color: #000000;
+            border: 3px solid {color};
+            border-radius: 10px;
+            padding: 20px;
+            background-color: #ffffff;
+        """ for bucket, color in bucket_colors.items()}
+        self.bucket = None
+        self.hide()
+
+    def set_word_font(self, family, size):
+        self.setFont(QFont(family, size, QFont.Bold))
+
+    def show_word(self, word, bucket):
+        self.setText(word)
+        if bucket != self.bucket:
+            self.setStyleSheet(self.styles[bucket])
+            self.bucket = bucket
+        self.show()
+
+    def clear_word(self):
+        self.hide()
+        self.clear()
+
+
+class TickerSlot(QFrame):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        layout.setSpacing(2)
+
+        self.icon_label = QLabel()
+        self.icon_label.setFixedSize(48, 48)
+        self.icon_label.setScaledContents(True)
+        layout.addWidget(self.icon_label, alignment=Qt.AlignCenter)
+
+        self.word_label = QLabel()
+        self.word_label.setFont(QFont("Segoe UI", 10))
+        self.word_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.word_label, alignment=Qt.AlignCenter)
+        self.icon_key = None
+
+    def set_item(self, word, icon_key, pixmap):
+        if icon_key != self.icon_key:
+            if pixmap is not None:
+                self.icon_label.setPixmap(pixmap)
+            else:
+                self.icon_label.setText(icon_key)
+            self.icon_key = icon_key
+        self.word_label.setText(word)
+
+
+class Ticker(QWidget):
+    # A fixed row of slots for the most recent rescores, filled in place from
+    # the newest item on the left; unused slots are hidden.
+
+    def __init__(self, pixmaps, size=5, parent=None):
+        super().__init__(parent)
+        self.pixmaps = pixmaps
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.slots = [TickerSlot(self) for _ in range(size)]
+        for slot in self.slots:
+            layout.addWidget(slot)
+            slot.hide()
+
+    def set_items(self, items):
+        items = list(items)
+        for i, slot in enumerate(self.slots):
+            if i < len(items):
+                word, icon_key = items[i]
+                slot.set_item(word, icon_key, self.pixmaps.get(icon_key))
+                slot.show()
+            else:
+                slot.hide()
+
+
+class TelemetryPanel(QLabel):
+    # Debug readout of a Telemetry: words per minute and rolling handler
+    # timings, refreshed twice a second while the panel is visible.
+
+    def __init__(self, telemetry, parent=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        font = QFont("Consolas", 9)
+        font.setStyleHint(QFont.Monospace)
+        self.setFont(font)
+        self.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.setStyleSheet("background-color: #f4f4f4; padding: 6px;")
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start(500)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def refresh(self):
+        if not self.telemetry.enabled:
+            self.setText("Instrumentation is off. Set telemetry=1 in config.ini and restart.")
+            return
+        recent, session = self.telemetry.words_per_minute()
+        lines = [f"words/min {recent:6.1f} last minute {session:6.1f} session"
+                 f"   rescored {self.telemetry.rescore_total}",
+                 f"{'handler':<18}{'calls':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+        for name, calls, p50, p95, p99, worst in self.telemetry.stats():
+            lines.append(f"{name:<18}{calls:>8}{p50 * 1000:>9.2f}{p95 * 1000:>9.2f}"
+                         f"{p99 * 1000:>9.2f}{worst * 1000:>9.2f}")
+        self.setText("<pre>" + "\n".join(lines) + "</pre>")
@@ -0,0 +1,107 @@
+import os
+
+import numpy as np
+
+
+class WordBuffer:
+    # All words of a list in one contiguous UTF-8 byte buffer, with an offsets
+    # array marking where each word starts (word i is data[offsets[i]:
+    # offsets[i + 1]]) and each word's length in characters. This costs a few
+    # bytes per word on top of the text itself, against a separate Python
+    # str object per word in a pandas column. Words are only decoded when
+    # they are looked up, and the arrays can be memory-mapped from disk.
+
+    def __init__(self, data, offsets, lengths):
+        self.data = data
+        self.offsets = offsets
+        self.lengths = lengths
+
+    @classmethod
+    def from_words(cls, words):
+        encoded = [w.encode("utf-8") for w in words]
+        sizes = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        if offsets[-1] < np.iinfo(np.uint32).max:
+            offsets = offsets.astype(np.uint32)
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(encoded))
+        return cls(data, offsets, np.minimum(lengths, 255).astype(np.uint8))
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def word(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode("utf-8")
+
+    def __getitem__(self, i):
+        # An int gives one word; an array of row ids gives a list of words.
+        if isinstance(i, (int, np.integer)):
+            return self.word(int(i))
+        return [self.word(j) for j in np.asarray(i).tolist()]
+
+    def __iter__(self):
+        data, offsets = self.data.tobytes(), self.offsets.tolist()
+        for start, stop in zip(offsets, offsets[1:]):
+            yield data[start:stop].decode("utf-8")
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes + self.lengths.nbytes
+
+    def arrays(self):
+        return {"words": self.data, "offsets": self.offsets, "lengths": self.lengths}
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        return cls(arrays["words"], arrays["offsets"], arrays["lengths"])
+
+    @classmethod
+    def concat(cls, buffers):
+        data = np.concatenate([b.data for b in buffers])
+        sizes = np.concatenate([np.diff(b.offsets.astype(np.int64)) for b in buffers])
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        if offsets[-1] < np.iinfo(np.uint32).max:
+            offsets = offsets.astype(np.uint32)
+        return cls(data, offsets, np.concatenate([b.lengths for b in buffers]))
+
+    def take(self, rows, chunk_size=1 << 20):
+        # A new buffer holding the given rows in the given order. The bytes
+        # are gathered a chunk of rows at a time to bound the index arrays.
+        rows = np.asarray(rows, dtype=np.int64)
+        starts = self.offsets.astype(np.int64)[rows]
+        sizes = self.offsets.astype(np.int64)[rows + 1] - starts
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        data = np.empty(int(offsets[-1]), dtype=np.uint8)
+        for start in range(0, len(rows), chunk_size):
+            stop = min(start + chunk_size, len(rows))
+            lo, hi = offsets[start], offsets[stop]
+            shift = np.repeat(starts[start:stop] - offsets[start:stop], sizes[start:stop])
+            data[lo:hi] = self.data[np.arange(lo, hi) + shift]
+        if offsets[-1] < np.iinfo(np.uint32).max:
+            offsets = offsets.astype(np.uint32)
+        return WordBuffer(data, offsets, self.lengths[rows])
+
+
+def compact_scores(scores):
+    # Scores as uint8; lists use 0-100, anything outside 0-255 is clipped.
+    return np.clip(np.asarray(scores), 0, 255).astype(np.uint8)
+
+
+def save_arrays(base, arrays, write_atomic):
+    # One .npy file per array next to base, each replaced atomically.
+    for name, array in arrays.items():
+        write_atomic(f"{base}.{name}.npy", lambda f, a=array: np.save(f, a, allow_pickle=False))
+
+
+def load_arrays(base, names, mmap=True):
+    # Memory-mapped (read-only) unless mmap is False. None if any is missing.
+    arrays = {}
+    for name in names:
+        path = f"{base}.{name}.npy"
+        if not os.path.exists(path):
+            return None
+        arrays[name] = np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+    return arrays
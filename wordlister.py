@@ -1,15 +1,49 @@
-import os
-import pandas as pd
+import re
+import time
+import uuid
 from collections import deque
+from engine import apply_action, icon_key
+from oplog import OpLog
+from coordination import CoordinationClient
+from persistence import PersistenceWorker, CoordinationWorker
+from prioritizer import ChangeModel, PrioritizedQueue
+from session import SessionConfig, settings_change
+from related import load_related_index
+from scoring import map_score_to_bucket
+from search import SearchIndex, MODES
+from startup import SessionLoader, IndexLoader
+from work_queue import WorkQueue
+from telemetry import Telemetry
+from widgets import WordCard, Ticker, TelemetryPanel, load_icon_pixmaps
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QPushButton,
-    QMessageBox, QHBoxLayout, QFrame, QAction, QDialog, QFormLayout,
-    QLineEdit, QDialogButtonBox, QSpinBox, QFileDialog, QFontDialog, QProgressBar
+    QMessageBox, QHBoxLayout, QAction, QDialog, QFormLayout,
+    QLineEdit, QDialogButtonBox, QSpinBox, QFileDialog, QFontDialog, QProgressBar,
+    QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QListWidget, QListWidgetItem, QComboBox
 )
 from PyQt5.QtCore import Qt, QSettings, QTimer
-from PyQt5.QtGui import QFont, QPixmap
+from PyQt5.QtGui import QFont
+
+process_started = time.perf_counter()
+
+def settings_list(value):
+    # Comma separated paths; QSettings may already have split them.
+    if not value:
+        return ()
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(v.strip() for v in value if v.strip())
+
+
+scoring_keys = {Qt.Key_D, Qt.Key_A, Qt.Key_Space, Qt.Key_U, Qt.Key_R, Qt.Key_S, Qt.Key_Q, Qt.Key_E}
+
+action_keys = {Qt.Key_D: "increase", Qt.Key_A: "decrease", Qt.Key_Space: "keep",
+               Qt.Key_Q: "decrease_double", Qt.Key_E: "increase_double"}
+
+# Most related words listed for one word, and most search results shown.
+related_limit = 200
+search_limit = 500
 
-score_buckets = [61, 60, 50, 25, 0]
 bucket_colors = {
     0: "#e74c3c",
     25: "#f39c12",
@@ -18,9 +52,6 @@ bucket_colors = {
     61: "#9b59b6"
 }
 
-def map_score_to_bucket(score):
-    return min(score_buckets, key=lambda b: abs(b - score))
-
 class SettingsDialog(QDialog):
     def __init__(self, settings: QSettings, parent=None):
         super().__init__(parent)
@@ -37,9 +68,9 @@ class SettingsDialog(QDialog):
         instructions_label = QLabel(
             "Configure file paths, filters, timing, and display options.\n\n"
             "Master Wordlist: Original read-only source.\n"
-            "Personal Wordlist & Tracker: In-memory updates, saved on 'S' or exit.\n"
+            "Personal Wordlist & Tracker: Autosaved to a journal in the background (or on 'S'), written in full on exit.\n"
             "Filters: Limit words.\n"
-            "Timing: Minimal delays.\n"
+            "Timing: Minimal delays and autosave frequency.\n"
             "Display: Font for main word.\n"
             "Progress: Uses an in-memory counter rather than scanning tracker repeatedly.\n\n"
             "Keys: Q/E to jump 2 buckets up/down."
@@ -55,7 +86,13 @@ class SettingsDialog(QDialog):
         length_max = int(self.settings.value("length_max", 10))
         score_min = int(self.settings.value("score_min", 25))
         score_max = int(self.settings.value("score_max", 60))
+        prioritize_queue = int(self.settings.value("prioritize_queue", 0))
+        master_changes_only = int(self.settings.value("master_changes_only", 0))
         disappear_delay = int(self.settings.value("disappear_delay_ms", 200))
+        rapid_mode = int(self.settings.value("rapid_mode", 0))
+        input_buffer_size = int(self.settings.value("input_buffer_size", 8))
+        autosave_interval = int(self.settings.value("autosave_interval_s", 30))
+        autosave_every = int(self.settings.value("autosave_every", 25))
         font_family = self.settings.value("main_word_font_family", "Segoe UI")
         font_size = int(self.settings.value("main_word_font_size", 32))
 
@@ -87,6 +124,14 @@ class SettingsDialog(QDialog):
         tracker_hbox.addWidget(browse_tracker_btn)
         files_group_layout.addRow("Tracker File:", tracker_hbox)
 
+        self.extra_wordlists_edit = QLineEdit(", ".join(settings_list(self.settings.value("extra_wordlist_files", ""))))
+        self.extra_wordlists_edit.setToolTip("Comma separated; each list overrides the scores of the ones before it")
+        files_group_layout.addRow("Extra Wordlists:", self.extra_wordlists_edit)
+
+        self.blocklists_edit = QLineEdit(", ".join(settings_list(self.settings.value("blocklist_files", ""))))
+        self.blocklists_edit.setToolTip("Comma separated; words in these lists are left out")
+        files_group_layout.addRow("Blocklists:", self.blocklists_edit)
+
         filters_group = QGroupBox("Filters")
         filters_group_layout = QFormLayout(filters_group)
         
@@ -111,6 +156,14 @@ class SettingsDialog(QDialog):
         filters_group_layout.addRow("Minimum Score:", self.score_min_spin)
         filters_group_layout.addRow("Maximum Score:", self.score_max_spin)
 
+        self.prioritize_check = QCheckBox("Show words likely to need a new score first")
+        self.prioritize_check.setChecked(bool(prioritize_queue))
+        filters_group_layout.addRow("Word Order:", self.prioritize_check)
+
+        self.master_changes_check = QCheckBox("Only words new or rescored in the last master list update")
+        self.master_changes_check.setChecked(bool(master_changes_only))
+        filters_group_layout.addRow("Master Updates:", self.master_changes_check)
+
         timing_group = QGroupBox("Timing")
         timing_group_layout = QFormLayout(timing_group)
 
@@ -119,6 +172,25 @@ class SettingsDialog(QDialog):
         self.delay_spin.setValue(disappear_delay)
         timing_group_layout.addRow("Disappear Delay (ms):", self.delay_spin)
 
+        self.rapid_mode_check = QCheckBox("Show the next word immediately")
+        self.rapid_mode_check.setChecked(bool(rapid_mode))
+        timing_group_layout.addRow("Rapid Mode:", self.rapid_mode_check)
+
+        self.input_buffer_spin = QSpinBox()
+        self.input_buffer_spin.setRange(0, 100)
+        self.input_buffer_spin.setValue(input_buffer_size)
+        timing_group_layout.addRow("Typed-Ahead Keys:", self.input_buffer_spin)
+
+        self.autosave_interval_spin = QSpinBox()
+        self.autosave_interval_spin.setRange(5, 3600)
+        self.autosave_interval_spin.setValue(autosave_interval)
+        timing_group_layout.addRow("Autosave Interval (s):", self.autosave_interval_spin)
+
+        self.autosave_every_spin = QSpinBox()
+        self.autosave_every_spin.setRange(1, 10000)
+        self.autosave_every_spin.setValue(autosave_every)
+        timing_group_layout.addRow("Autosave After N Words:", self.autosave_every_spin)
+
         font_group = QGroupBox("Main Word Font")
         font_group_layout = QFormLayout(font_group)
 
@@ -164,15 +236,204 @@ class SettingsDialog(QDialog):
         self.settings.setValue("master_wordlist_file", self.master_wordlist_edit.text())
         self.settings.setValue("personal_wordlist_file", self.personal_wordlist_edit.text())
         self.settings.setValue("rescore_tracker_file", self.tracker_edit.text())
+        self.settings.setValue("extra_wordlist_files", ", ".join(settings_list(self.extra_wordlists_edit.text())))
+        self.settings.setValue("blocklist_files", ", ".join(settings_list(self.blocklists_edit.text())))
         self.settings.setValue("length_min", self.length_min_spin.value())
         self.settings.setValue("length_max", self.length_max_spin.value())
         self.settings.setValue("score_min", self.score_min_spin.value())
         self.settings.setValue("score_max", self.score_max_spin.value())
         self.settings.setValue("disappear_delay_ms", self.delay_spin.value())
+        self.settings.setValue("rapid_mode", int(self.rapid_mode_check.isChecked()))
+        self.settings.setValue("prioritize_queue", int(self.prioritize_check.isChecked()))
+        self.settings.setValue("master_changes_only", int(self.master_changes_check.isChecked()))
+        self.settings.setValue("input_buffer_size", self.input_buffer_spin.value())
+        self.settings.setValue("autosave_interval_s", self.autosave_interval_spin.value())
+        self.settings.setValue("autosave_every", self.autosave_every_spin.value())
         self.settings.setValue("main_word_font_family", self.font_family)
         self.settings.setValue("main_word_font_size", self.font_size)
         self.accept()
 
+class StatisticsDialog(QDialog):
+    def __init__(self, partition, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Wordlist Statistics")
+        self.resize(600, 700)
+
+        main_layout = QVBoxLayout(self)
+
+        title_label = QLabel("Unscored Words by Length and Score")
+        title_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
+        title_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(title_label)
+
+        lengths, buckets, grid = partition.bucket_grid()
+        table = QTableWidget(len(lengths), len(buckets), self)
+        table.setHorizontalHeaderLabels([str(b) for b in buckets])
+        table.setVerticalHeaderLabels([str(length) for length in lengths])
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        for i in range(len(lengths)):
+            for j, bucket in enumerate(buckets):
+                item = QTableWidgetItem(f"{grid[i, j]:,}")
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                table.setItem(i, j, item)
+        main_layout.addWidget(table)
+
+        total_label = QLabel(f"{int(grid.sum()):,} words still unscored")
+        total_label.setFont(QFont("Segoe UI", 10))
+        total_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(total_label)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.reject)
+        main_layout.addWidget(button_box)
+
+class RelatedWordsDialog(QDialog):
+    def __init__(self, word, score, entries, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Related Words")
+        self.resize(450, 550)
+        self.action = None
+
+        main_layout = QVBoxLayout(self)
+        title_label = QLabel(f"Words related to {word} ({score})")
+        title_label.setFont(QFont("Segoe UI", 14, QFont.Bold))
+        title_label.setAlignment(Qt.AlignCenter)
+        main_layout.addWidget(title_label)
+        main_layout.addWidget(QLabel("Ticked words get the same new score as the word itself."))
+
+        # entries: (row, word, current score) for each unscored related word.
+        self.list_widget = QListWidget(self)
+        for row, related_word, related_score in entries:
+            item = QListWidgetItem(f"{related_word} ({related_score})")
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked)
+            item.setData(Qt.UserRole, row)
+            self.list_widget.addItem(item)
+        # Keys go to the dialog; words are ticked with the mouse.
+        self.list_widget.setFocusPolicy(Qt.NoFocus)
+        main_layout.addWidget(self.list_widget)
+
+        button_layout = QHBoxLayout()
+        for label, key in (("[Q] Down 2", Qt.Key_Q), ("[A] Decrease", Qt.Key_A), ("[Space] Keep", Qt.Key_Space),
+                           ("[D] Increase", Qt.Key_D), ("[E] Up 2", Qt.Key_E)):
+            button = QPushButton(label, self)
+            button.setFocusPolicy(Qt.NoFocus)
+            button.clicked.connect(lambda checked, k=key: self.choose(action_keys[k]))
+            button_layout.addWidget(button)
+        main_layout.addLayout(button_layout)
+
+    def keyPressEvent(self, event):
+        if event.key() in action_keys:
+            self.choose(action_keys[event.key()])
+        else:
+            super().keyPressEvent(event)
+
+    def choose(self, action):
+        self.action = action
+        self.accept()
+
+    def checked_rows(self):
+        return [self.list_widget.item(i).data(Qt.UserRole) for i in range(self.list_widget.count())
+                if self.list_widget.item(i).checkState() == Qt.Checked]
+
+class SearchDialog(QDialog):
+    def __init__(self, search_index, words, describe, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Search")
+        self.resize(450, 600)
+        self.search_index = search_index
+        self.words = words
+        # describe(row, word) -> (score, rescored) for the result list.
+        self.describe = describe
+
+        main_layout = QVBoxLayout(self)
+        form_layout = QFormLayout()
+        self.mode_combo = QComboBox(self)
+        self.mode_combo.addItems([mode.capitalize() for mode in MODES])
+        form_layout.addRow("Search By:", self.mode_combo)
+        self.query_edit = QLineEdit(self)
+        self.query_edit.setPlaceholderText("?A?E??, a word, a regex or letters to anagram")
+        form_layout.addRow("Query:", self.query_edit)
+        main_layout.addLayout(form_layout)
+
+        self.count_label = QLabel("", self)
+        main_layout.addWidget(self.count_label)
+        self.results = QListWidget(self)
+        self.results.itemDoubleClicked.connect(self.accept)
+        main_layout.addWidget(self.results)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.button(QDialogButtonBox.Ok).setText("Go to Word")
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        main_layout.addWidget(button_box)
+
+        # Search as you type, once typing pauses.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(lambda: self.search_timer.start(150))
+        self.mode_combo.currentIndexChanged.connect(lambda: self.search_timer.start(0))
+        self.query_edit.setFocus()
+
+    def run_search(self):
+        self.results.clear()
+        query = self.query_edit.text()
+        if not query.strip():
+            self.count_label.setText("")
+            return
+        mode = MODES[self.mode_combo.currentIndex()]
+        try:
+            rows = self.search_index.search(mode, query, search_limit + 1)
+        except re.error as e:
+            self.count_label.setText(f"Invalid regex: {e.msg}")
+            return
+        more = len(rows) > search_limit
+        for row in rows[:search_limit].tolist():
+            word = self.words[row]
+            score, rescored = self.describe(row, word)
+            item = QListWidgetItem(f"{word} ({score})" + ("  - rescored" if rescored else ""))
+            item.setData(Qt.UserRole, row)
+            self.results.addItem(item)
+        if self.results.count():
+            self.results.setCurrentRow(0)
+        self.count_label.setText(f"First {search_limit} matches" if more else f"{len(rows)} matches")
+
+    def selected_row(self):
+        item = self.results.currentItem()
+        return None if item is None else item.data(Qt.UserRole)
+
+class HistoryDialog(QDialog):
+    def __init__(self, history, words, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("History")
+        self.resize(500, 600)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addWidget(QLabel("Pick the last rescore to keep; later ones are undone and can be redone."))
+
+        # Row 0 is the start of the session, row i keeps the first i rescores.
+        self.list_widget = QListWidget(self)
+        self.list_widget.addItem("(start of session)")
+        for i in range(len(history)):
+            op = history.op(i)
+            item = QListWidgetItem(f"{i + 1}. {words[op.row]}: {op.shown_score} -> {op.new_score}")
+            if i >= history.position:
+                item.setForeground(Qt.gray)
+            self.list_widget.addItem(item)
+        self.list_widget.setCurrentRow(history.position)
+        self.list_widget.itemDoubleClicked.connect(self.accept)
+        main_layout.addWidget(self.list_widget)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        main_layout.addWidget(button_box)
+
+    def selected_position(self):
+        return self.list_widget.currentRow()
+
 class RescoreApp(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -184,48 +445,69 @@ class RescoreApp(QMainWindow):
         QApplication.instance().setFont(QFont("Segoe UI", 9))
 
         self.settings = QSettings("config.ini", QSettings.IniFormat)
-        self.master_wordlist_file = self.settings.value("master_wordlist_file", r"C:\Users\Dennis\OneDrive\XwiWordList.txt")
-        self.personal_wordlist_file = self.settings.value("personal_wordlist_file", "personal_wordlist.txt")
-        self.rescore_tracker_file = self.settings.value("rescore_tracker_file", "rescore_tracker.txt")
-        self.length_min = int(self.settings.value("length_min", 6))
-        self.length_max = int(self.settings.value("length_max", 10))
-        self.score_min = int(self.settings.value("score_min", 25))
-        self.score_max = int(self.settings.value("score_max", 60))
-        self.disappear_delay_ms = int(self.settings.value("disappear_delay_ms", 200))
-        self.main_word_font_family = self.settings.value("main_word_font_family", "Segoe UI")
-        self.main_word_font_size = int(self.settings.value("main_word_font_size", 32))
-        self.main_word_font_size = 64  # Larger font
-
-        self.df = self.load_master_wordlist(self.master_wordlist_file)
-        if self.df is None:
-            QMessageBox.critical(self, "Error", f"Master wordlist file not found: {self.master_wordlist_file}")
-            exit()
-
-        self.ensure_file_exists(self.personal_wordlist_file)
-        self.ensure_file_exists(self.rescore_tracker_file)
-
-        self.personal_df = self.load_personal_wordlist(self.personal_wordlist_file)
-        self.rescored_tracker = self.load_tracker(self.rescore_tracker_file)
-
-        self.apply_personal_scores()
-
-        self.filtered_df = self.apply_filters().sample(frac=1).reset_index(drop=True)
-
-        self.current_index = 0
-        self.current_label = None
-        self.history_stack = deque(maxlen=5)
+        self.read_settings()
+        # Instrumentation is set up once here; changing it needs a restart.
+        self.telemetry = Telemetry(bool(int(self.settings.value("telemetry", 0))))
+
+        self.master_index = None
+        self.queue = None
+        self.current_item = None
+        self.done_count, self.total_count = 0, 0
+        self.personal_scores = None
+        self.rescored_tracker = None
+        self.journal = None
+        self.session_loader = None
+        self.index_loaders = []
+        self.related_index = None
+        self.search_index = None
+        self.coordinator = None
+        self.leases = []
+        self.batches_exhausted = False
+        self.session_ready = False
+        self.loading = False
+        self.waiting_for_words = False
+        self.refilter_pending = False
+        self.startup_times = {}
+
+        self.persistence = PersistenceWorker(self, self.telemetry)
+        self.persistence.saved.connect(self.on_saved)
+        self.persistence.failed.connect(self.on_save_failed)
+        self.rescores_since_save = 0
+        self.autosave_timer = QTimer(self)
+        # Looked up on every tick, so the timer goes through the telemetry
+        # wrapper installed further down.
+        self.autosave_timer.timeout.connect(lambda: self.autosave())
+        self.autosave_timer.start(self.autosave_interval_s * 1000)
+
+        self.history = OpLog()
         self.ticker_items = deque(maxlen=5)
         self.scoring_in_progress = False
-
-        # Build done_words set once from filtered words and rescored_tracker
-        filtered_words_set = set(self.filtered_df['word'])
-        self.done_words = set(row['word'] for _, row in self.rescored_tracker.iterrows()
-                              if row['rescored'] == 1 and row['word'] in filtered_words_set)
+        # Keys pressed while a word is leaving the screen (or while waiting
+        # for the loader), replayed in order against the following words.
+        self.pending_keys = deque()
+        self.flash_timer = QTimer(self)
+        self.flash_timer.setSingleShot(True)
+        self.flash_timer.timeout.connect(lambda: self.new_score_label.setText(""))
 
         menubar = self.menuBar()
         settings_action = QAction("Settings", self)
         settings_action.triggered.connect(self.open_settings_dialog)
         menubar.addAction(settings_action)
+        statistics_action = QAction("Statistics", self)
+        statistics_action.triggered.connect(self.open_statistics_dialog)
+        menubar.addAction(statistics_action)
+        search_action = QAction("Search", self)
+        search_action.setShortcut("Ctrl+F")
+        search_action.triggered.connect(self.open_search_dialog)
+        menubar.addAction(search_action)
+        history_action = QAction("History", self)
+        history_action.triggered.connect(self.open_history_dialog)
+        menubar.addAction(history_action)
+        self.debug_action = QAction("Debug", self)
+        self.debug_action.setCheckable(True)
+        self.debug_action.setShortcut("F12")
+        self.debug_action.toggled.connect(lambda on: self.telemetry_panel.setVisible(on))
+        menubar.addAction(self.debug_action)
 
         central_widget = QWidget(self)
         self.setCentralWidget(central_widget)
@@ -243,7 +525,7 @@ class RescoreApp(QMainWindow):
 
         self.progress_bar = QProgressBar(self)
         self.progress_bar.setFont(QFont("Segoe UI", 10))
-        self.progress_bar.setRange(0, len(self.filtered_df))
+        self.progress_bar.setRange(0, 0)
         main_layout.addWidget(self.progress_bar)
 
         self.progress_detail_label = QLabel("", self)
@@ -251,7 +533,14 @@ class RescoreApp(QMainWindow):
         self.progress_detail_label.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(self.progress_detail_label)
 
-        instructions = QLabel("Keybindings:\n[D] Increase | [A] Decrease | [Space] Keep | [U] Undo | [S] Save | [Q] Down 2 | [E] Up 2", self)
+        self.load_progress_bar = QProgressBar(self)
+        self.load_progress_bar.setFont(QFont("Segoe UI", 9))
+        self.load_progress_bar.setRange(0, 100)
+        self.load_progress_bar.setFormat("Loading wordlists... %p%")
+        self.load_progress_bar.hide()
+        main_layout.addWidget(self.load_progress_bar)
+
+        instructions = QLabel("Keybindings:\n[D] Increase | [A] Decrease | [Space] Keep | [U] Undo | [R] Redo | [S] Save | [Q] Down 2 | [E] Up 2 | [G] Related Words", self)
         instructions.setFont(QFont("Segoe UI", 10))
         instructions.setAlignment(Qt.AlignCenter)
         main_layout.addWidget(instructions)
@@ -271,6 +560,11 @@ class RescoreApp(QMainWindow):
         self.new_score_label.setFixedHeight(40)
         self.new_score_label.setText("")
 
+        self.word_card = WordCard(bucket_colors, self)
+        self.word_card.set_word_font(self.main_word_font_family, self.main_word_font_size)
+        self.flash_color = None
+
+        self.word_layout.addWidget(self.word_card, alignment=Qt.AlignCenter)
         self.word_layout.addWidget(self.new_score_label, alignment=Qt.AlignCenter)
         self.word_layout.addWidget(self.current_score_label, alignment=Qt.AlignCenter)
         main_layout.addWidget(self.word_area)
@@ -282,9 +576,6 @@ class RescoreApp(QMainWindow):
         button_layout.addWidget(self.exit_button, alignment=Qt.AlignCenter)
         main_layout.addLayout(button_layout)
 
-        self.ticker_layout = QHBoxLayout()
-        main_layout.addLayout(self.ticker_layout)
-
         self.icons = {
             "increase_1": "icons/icon_increase_1.png",
             "increase_2": "icons/icon_increase_2.png",
@@ -292,54 +583,348 @@ class RescoreApp(QMainWindow):
             "decrease_2": "icons/icon_decrease_2.png",
             "keep":       "icons/icon_keep.png"
         }
+        self.ticker = Ticker(load_icon_pixmaps(self.icons), self.ticker_items.maxlen, self)
+        main_layout.addWidget(self.ticker)
+
+        self.telemetry_panel = TelemetryPanel(self.telemetry, self)
+        main_layout.addWidget(self.telemetry_panel)
+        # handle_key is the frame time of one keystroke, typed or buffered.
+        self.telemetry.instrument(self, ["keyPressEvent", "handle_key", "rescore_word", "place_word", "show_next_word",
+                                         "update_ticker", "update_progress", "undo_action", "autosave"])
 
         self.update_progress()
-        self.show_next_word()
+        self.start_loading()
 
-    def ensure_file_exists(self, path):
-        if not os.path.exists(path):
-            with open(path, 'w', encoding='utf-8') as f:
-                pass
+    def read_settings(self):
+        self.master_wordlist_file = self.settings.value("master_wordlist_file", r"C:\Users\Dennis\OneDrive\XwiWordList.txt")
+        self.personal_wordlist_file = self.settings.value("personal_wordlist_file", "personal_wordlist.txt")
+        self.rescore_tracker_file = self.settings.value("rescore_tracker_file", "rescore_tracker.txt")
+        self.length_min = int(self.settings.value("length_min", 6))
+        self.length_max = int(self.settings.value("length_max", 10))
+        self.score_min = int(self.settings.value("score_min", 25))
+        self.score_max = int(self.settings.value("score_max", 60))
+        self.prioritize_queue = bool(int(self.settings.value("prioritize_queue", 0)))
+        self.master_changes_only = bool(int(self.settings.value("master_changes_only", 0)))
+        # Send words whose master score changed in an update back for review.
+        self.requeue_master_changes = bool(int(self.settings.value("requeue_master_changes", 1)))
+        self.disappear_delay_ms = int(self.settings.value("disappear_delay_ms", 200))
+        self.rapid_mode = bool(int(self.settings.value("rapid_mode", 0)))
+        self.input_buffer_size = int(self.settings.value("input_buffer_size", 8))
+        self.autosave_interval_s = int(self.settings.value("autosave_interval_s", 30))
+        self.autosave_every = int(self.settings.value("autosave_every", 25))
+        self.main_word_font_family = self.settings.value("main_word_font_family", "Segoe UI")
+        self.main_word_font_size = int(self.settings.value("main_word_font_size", 32))
+        self.main_word_font_size = 64  # Larger font
+        self.snapshot_cache_dir = self.settings.value("snapshot_cache_dir", "wordlister_cache")
+        shuffle_seed = self.settings.value("shuffle_seed", "")
+        self.shuffle_seed = int(shuffle_seed) if shuffle_seed else None
+        # 0 uses every core for parsing a large master wordlist.
+        self.load_workers = int(self.settings.value("load_workers", 1))
+        self.extra_wordlist_files = settings_list(self.settings.value("extra_wordlist_files", ""))
+        self.blocklist_files = settings_list(self.settings.value("blocklist_files", ""))
+        # "text" (personal wordlist, tracker and journal files) or "sqlite".
+        self.storage_backend = self.settings.value("storage_backend", "text")
+        self.sqlite_file = self.settings.value("sqlite_file", "wordlister.db")
+        # host:port of a coordination server to take words from, or empty.
+        self.coordination_server = self.settings.value("coordination_server", "").strip()
+        self.coordination_batch_size = int(self.settings.value("coordination_batch_size", 200))
+
+    def session_config(self):
+        return SessionConfig(
+            self.master_wordlist_file, self.personal_wordlist_file, self.rescore_tracker_file,
+            self.length_min, self.length_max, self.score_min, self.score_max,
+            self.snapshot_cache_dir, self.shuffle_seed, self.load_workers,
+            self.extra_wordlist_files, self.blocklist_files,
+            self.storage_backend, self.sqlite_file, self.master_changes_only, self.requeue_master_changes,
+        )
 
-    def load_master_wordlist(self, path):
-        if not os.path.exists(path):
-            return None
-        return pd.read_csv(path, delimiter=';', names=['word', 'score'], engine='python')
+    def start_loading(self):
+        # Loading runs off the GUI thread. Scoring can start as soon as the
+        # first chunk of the queue arrives; later chunks are appended to it.
+        if self.session_loader is not None:
+            self.session_loader.cancel()
+        for index_loader in self.index_loaders:
+            index_loader.cancel()
+        self.index_loaders = []
+        self.related_index = None
+        self.search_index = None
+        self.start_coordination()
+        self.journal = None
+        self.master_index = None
+        self.queue = None
+        self.change_model = None
+        self.current_item = None
+        self.recount_progress()
+        self.session_ready = False
+        self.loading = True
+        self.waiting_for_words = False
+        self.history.clear()
+        self.pending_keys.clear()
+        self.ticker_items.clear()
+        self.update_ticker()
+        self.update_progress()
+        self.current_score_label.setText("Loading...")
+        self.load_progress_bar.setValue(0)
+        self.load_progress_bar.show()
+        self.startup_times["load_started"] = time.perf_counter()
+
+        loader = SessionLoader(self.session_config(), self)
+        loader.progress.connect(self.on_load_progress)
+        loader.stores_ready.connect(self.on_stores_ready)
+        loader.chunk_ready.connect(self.on_chunk_ready)
+        loader.master_ready.connect(self.on_master_ready)
+        loader.failed.connect(self.on_load_failed)
+        loader.finished.connect(loader.deleteLater)
+        self.session_loader = loader
+        loader.start()
+
+    def on_load_progress(self, percent, text):
+        if self.sender() is not self.session_loader:
+            return
+        self.load_progress_bar.setValue(percent)
+        self.statusBar().showMessage(text)
+
+    def on_stores_ready(self, master_index, personal_scores, rescored_tracker, journal):
+        if self.sender() is not self.session_loader:
+            journal.close()
+            return
+        self.master_index = master_index
+        self.personal_scores = personal_scores
+        self.rescored_tracker = rescored_tracker
+        self.journal = journal
+        self.change_model = ChangeModel(master_index.words)
+        self.model_bootstrapped = False
+        self.queue = self.new_queue()
+        self.top_up_batches()
+
+    def new_queue(self):
+        done = self.master_index.done
+        if self.prioritize_queue and self.coordinator is None:
+            return PrioritizedQueue(self.master_index.words, done, self.change_model)
+        return WorkQueue(self.master_index.words, lambda row: done[row])
+
+    def bootstrap_change_model(self):
+        # Teach the model the words rescored in earlier sessions, once the
+        # whole master index (and so every rescored flag) is in.
+        if self.master_index is None or self.change_model is None:
+            return
+        if self.prioritize_queue and not self.model_bootstrapped and not self.loading:
+            self.change_model.bootstrap(self.master_index, self.personal_scores)
+            self.model_bootstrapped = True
+
+    def start_coordination(self):
+        if self.coordinator is not None:
+            self.coordinator.shutdown()
+            self.coordinator = None
+        self.leases = []
+        self.batches_exhausted = False
+        if not self.coordination_server:
+            return
+        client_id = self.settings.value("coordination_client_id", "")
+        if not client_id:
+            client_id = uuid.uuid4().hex
+            self.settings.setValue("coordination_client_id", client_id)
+        self.coordinator = CoordinationWorker(CoordinationClient(self.coordination_server, client_id), self)
+        self.coordinator.batch_ready.connect(self.on_batch_ready)
+        self.coordinator.failed.connect(lambda error: self.statusBar().showMessage(error, 10000))
+
+    def top_up_batches(self):
+        # Ask for the next batch while half of the current one is left, and
+        # hand back the leases whose words have all been shown.
+        if self.coordinator is None or self.batches_exhausted or self.queue is None:
+            return
+        if self.queue.size - self.queue.position >= self.coordination_batch_size // 2:
+            return
+        finished = [lease for lease, end in self.leases if end <= self.queue.position]
+        self.leases = [(lease, end) for lease, end in self.leases if end > self.queue.position]
+        self.coordinator.request_batch(self.coordination_batch_size, finished)
 
-    def load_personal_wordlist(self, path):
-        if os.path.getsize(path) > 0:
-            return pd.read_csv(path, delimiter=';', names=['word','score'], engine='python')
+    def on_batch_ready(self, batch):
+        if self.sender() is not self.coordinator or self.queue is None:
+            return
+        self.coordinator.batch_in_flight = False
+        if batch is None:
+            # Server unreachable: the error is in the status bar; try again.
+            QTimer.singleShot(5000, self.retry_batch)
+        elif batch["lease"] is None:
+            self.batches_exhausted = True
         else:
-            return pd.DataFrame(columns=['word','score'])
+            words = self.master_index.words
+            if any(words[row] != word for row, word in zip(batch["rows"].tolist(), batch["words"])):
+                self.batches_exhausted = True
+                QMessageBox.critical(self, "Coordination",
+                                     "The coordination server uses a different master wordlist.")
+                return
+            self.queue.extend(batch["rows"], batch["scores"])
+            self.leases.append((batch["lease"], self.queue.size))
+        if self.session_ready and self.current_item is None and not self.scoring_in_progress:
+            self.waiting_for_words = False
+            self.show_next_word()
 
-    def load_tracker(self, path):
-        if os.path.getsize(path) > 0:
-            return pd.read_csv(path, delimiter=';', names=['word','rescored'], engine='python')
+    def retry_batch(self):
+        if self.session_ready and self.current_item is None and not self.scoring_in_progress:
+            self.show_next_word()
         else:
-            return pd.DataFrame(columns=['word','rescored'])
-
-    def apply_personal_scores(self):
-        if not self.personal_df.empty:
-            personal_dict = dict(zip(self.personal_df['word'], self.personal_df['score']))
-            self.df['score'] = self.df.apply(
-                lambda row: personal_dict[row['word']] if row['word'] in personal_dict else row['score'], axis=1
-            )
-
-    def apply_filters(self):
-        filtered = self.df[
-            (self.df['score'].between(self.score_min, self.score_max)) &
-            (self.df['word'].str.len().between(self.length_min, self.length_max))
-        ]
-        filtered = filtered.copy()
-        filtered['score'] = filtered['score'].apply(map_score_to_bucket)
-        return filtered
+            self.top_up_batches()
+
+    def share_word(self, row, word):
+        # Sends the word's new state to the coordination server, in batches.
+        if self.coordinator is None:
+            return
+        self.coordinator.record(row, word, self.personal_scores.get(word), self.rescored_tracker.get(word),
+                                time.time())
+        if self.coordinator.pending_count >= 25:
+            self.coordinator.flush()
+
+    def filters(self):
+        return self.length_min, self.length_max, self.score_min, self.score_max, self.master_changes_only
+
+    def recount_progress(self):
+        # Done and total for the current filters, summed from the partition
+        # index; rescore and undo then adjust the done count in place.
+        if self.master_index is None:
+            self.done_count, self.total_count = 0, 0
+        else:
+            self.done_count, self.total_count = self.master_index.count(*self.filters())
+
+    def mark_done(self, row, done):
+        if self.master_index.mark_done(row, done) and self.master_index.matches(row, *self.filters()):
+            self.done_count += 1 if done else -1
+
+    def on_chunk_ready(self, rows, scores):
+        if self.sender() is not self.session_loader:
+            return
+        # In coordination mode the words come from the server instead.
+        if self.coordinator is None:
+            self.queue.extend(rows, scores)
+        self.recount_progress()
+        if not self.session_ready:
+            self.session_ready = True
+            self.startup_times["first_word"] = time.perf_counter()
+            self.show_next_word()
+        elif self.waiting_for_words and self.queue.current() is not None:
+            self.waiting_for_words = False
+            self.show_next_word()
+        else:
+            self.update_progress()
+
+    def on_master_ready(self, master_index):
+        if self.sender() is not self.session_loader:
+            return
+        self.loading = False
+        self.load_progress_bar.hide()
+        self.recount_progress()
+        self.update_progress()
+        self.startup_times["loaded"] = time.perf_counter()
+        self.bootstrap_change_model()
+        self.statusBar().showMessage(self.startup_summary(), 10000)
+        if self.waiting_for_words or not self.session_ready:
+            self.session_ready = True
+            self.waiting_for_words = False
+            self.show_next_word()
+
+        # The related-words index is cached next to the master snapshot
+        # unless extra lists are merged in.
+        words, cacheable = master_index.words, master_index.source is None
+        path, cache_dir = self.master_wordlist_file, self.snapshot_cache_dir
+        self.start_index_loader(
+            lambda on_progress, cancelled: load_related_index(path, cache_dir, words, cacheable,
+                                                              on_progress, cancelled),
+            self.on_related_ready)
+        self.start_index_loader(lambda on_progress, cancelled: SearchIndex.build(words, cancelled),
+                                self.on_search_ready)
+
+    def start_index_loader(self, build, on_ready):
+        index_loader = IndexLoader(build, self)
+        index_loader.ready.connect(on_ready)
+        index_loader.failed.connect(lambda error: self.statusBar().showMessage(error, 10000))
+        self.index_loaders.append(index_loader)
+        index_loader.start()
+
+    def on_related_ready(self, related_index):
+        if self.sender() not in self.index_loaders:
+            return
+        self.related_index = related_index
+        if self.current_item is not None and not self.scoring_in_progress:
+            self.place_word(*self.current_item)
+
+    def on_search_ready(self, search_index):
+        if self.sender() not in self.index_loaders:
+            return
+        self.search_index = search_index
+
+    def refilter(self):
+        # Filters only: rebuild the queue from the in-memory master index.
+        # The history and ticker stay valid because undo pushes the word back
+        # in front of whatever queue is current.
+        if self.coordinator is not None:
+            self.recount_progress()
+            self.statusBar().showMessage("The coordination server picks the words; filters only change the progress count.", 5000)
+            self.update_progress()
+            return
+        index = self.master_index
+        slots = index.select(*self.filters())
+        self.queue = self.new_queue()
+        self.queue.extend(index.order[slots], index.buckets[slots])
+        self.recount_progress()
+        self.pending_keys.clear()
+        self.show_next_word()
+
+    def on_load_failed(self, error):
+        if self.sender() is not self.session_loader:
+            return
+        self.loading = False
+        self.load_progress_bar.hide()
+        self.statusBar().clearMessage()
+        QMessageBox.critical(self, "Error", error)
+        if "loaded" not in self.startup_times:
+            QTimer.singleShot(0, self.close)
+
+    def startup_summary(self):
+        started = self.startup_times["load_started"]
+        parts = []
+        if "window_shown" in self.startup_times:
+            parts.append(f"window shown after {(self.startup_times['window_shown'] - process_started) * 1000:.0f} ms")
+        if "first_word" in self.startup_times:
+            parts.append(f"first word after {(self.startup_times['first_word'] - started) * 1000:.0f} ms")
+        parts.append(f"fully loaded after {(self.startup_times['loaded'] - started) * 1000:.0f} ms")
+        summary = "Ready: " + ", ".join(parts)
+        if self.master_index.changes is not None:
+            summary += f". Master list update: {self.master_index.changes.summary()}"
+        return summary
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.startup_times.setdefault("window_shown", time.perf_counter())
 
     def keyPressEvent(self, event):
-        if self.current_index >= len(self.filtered_df) or self.scoring_in_progress:
+        key = event.key()
+        if key == Qt.Key_G:
+            self.open_related_dialog()
+            return
+        if key not in scoring_keys:
+            event.ignore()
+            return
+        if self.scoring_in_progress or self.waiting_for_words:
+            if len(self.pending_keys) < self.input_buffer_size:
+                self.pending_keys.append(key)
+            return
+        if self.current_item is None:
             event.ignore()
             return
 
-        key = event.key()
+        self.handle_key(key)
+
+    def apply_pending_key(self):
+        # One buffered key per event loop pass, so the screen catches up
+        # between words.
+        if not self.pending_keys or self.current_item is None or self.scoring_in_progress:
+            return
+        self.handle_key(self.pending_keys.popleft())
+        if self.pending_keys:
+            QTimer.singleShot(0, self.apply_pending_key)
+
+    def handle_key(self, key):
         if key == Qt.Key_D:
             self.rescore_word("increase")
         elif key == Qt.Key_A:
@@ -348,105 +933,144 @@ class RescoreApp(QMainWindow):
             self.rescore_word("keep")
         elif key == Qt.Key_U:
             self.undo_action()
+        elif key == Qt.Key_R:
+            self.redo_action()
         elif key == Qt.Key_S:
             self.save_changes()
         elif key == Qt.Key_Q:
             self.rescore_word("decrease_double")
         elif key == Qt.Key_E:
             self.rescore_word("increase_double")
-        else:
-            event.ignore()
 
-    def rescore_word(self, action):
-        if self.current_index >= len(self.filtered_df):
+    def rescore_word(self, action, related=()):
+        # related: master rows given the word's new score in the same step.
+        if self.current_item is None:
             return
 
         self.scoring_in_progress = True
-        word_data = self.filtered_df.iloc[self.current_index]
-        word = word_data["word"]
-        old_score = word_data["score"]
+        row, word, old_score = self.current_item
+        if self.telemetry.enabled:
+            self.telemetry.record_rescore()
 
         new_score = self.get_new_score_from_action(old_score, action)
-        self.place_word(word, new_score)
+        self.place_word(row, word, new_score)
         icon_key = self.get_icon_key(old_score, new_score)
-        self.history_stack.append((self.current_index, word, old_score, new_score))
+        self.history.push(row, old_score, new_score,
+                          self.personal_scores.get(word), self.rescored_tracker.get(word))
+        self.change_model.learn_rescore(row, old_score, new_score)
 
         self.ticker_items.appendleft((word, icon_key))
         self.update_ticker()
 
         self.update_personal_in_memory(word, new_score)
         self.update_tracker_in_memory(word)
+        self.mark_done(row, True)
+        self.journal.record_rescore(word, new_score)
+        self.share_word(row, word)
+        for related_row in related:
+            self.rescore_related(related_row, new_score)
+        self.rescores_since_save += 1 + len(related)
+        if self.rescores_since_save >= self.autosave_every or self.journal.write_through:
+            self.autosave()
+
+        self.show_new_score_flash(word, old_score, new_score, len(related))
+
+        if self.rapid_mode:
+            self.remove_current_word()
+        else:
+            QTimer.singleShot(self.disappear_delay_ms, self.remove_current_word)
+
+    def rescore_related(self, row, new_score):
+        index = self.master_index
+        word = index.words[row]
+        shown_score = int(index.buckets[index.slot[row]])
+        self.history.push(row, shown_score, new_score, self.personal_scores.get(word),
+                          self.rescored_tracker.get(word), joined=True)
+        self.change_model.learn_rescore(row, shown_score, new_score)
+        self.update_personal_in_memory(word, new_score)
+        self.update_tracker_in_memory(word)
+        self.mark_done(row, True)
+        self.journal.record_rescore(word, new_score)
+        self.share_word(row, word)
 
-        # Add to done_words if not already
-        self.done_words.add(word)
-
-        self.show_new_score_flash(old_score, new_score)
+    def related_rows(self, row):
+        # Unscored words sharing the word's stem, whatever the filters.
+        rows = self.related_index.related(row)
+        return rows[~self.master_index.done[rows]]
 
-        QTimer.singleShot(self.disappear_delay_ms, self.remove_current_word)
+    def open_related_dialog(self):
+        if self.current_item is None or self.scoring_in_progress or self.waiting_for_words:
+            return
+        if self.related_index is None:
+            self.statusBar().showMessage("The related words index is still being built...", 3000)
+            return
+        row, word, score = self.current_item
+        rows = self.related_rows(row)
+        if not len(rows):
+            self.statusBar().showMessage(f"No unscored words related to {word}.", 3000)
+            return
+        index = self.master_index
+        entries = [(r, index.words[r], int(index.buckets[index.slot[r]])) for r in rows[:related_limit].tolist()]
+        dialog = RelatedWordsDialog(word, score, entries, self)
+        if dialog.exec_() and dialog.action is not None:
+            self.rescore_word(dialog.action, dialog.checked_rows())
 
     def get_new_score_from_action(self, old_score, action):
-        idx = score_buckets.index(old_score)
-        if action == "increase":
-            new_idx = max(idx-1, 0)
-        elif action == "decrease":
-            new_idx = min(idx+1, len(score_buckets)-1)
-        elif action == "increase_double":
-            new_idx = max(idx-2, 0)
-        elif action == "decrease_double":
-            new_idx = min(idx+2, len(score_buckets)-1)
-        else:
-            new_idx = idx
-        return score_buckets[new_idx]
+        return apply_action(old_score, action)
 
     def remove_current_word(self):
-        if self.current_label and self.current_label.parent():
-            layout = self.current_label.parent().layout()
-            layout.removeWidget(self.current_label)
-            self.current_label.deleteLater()
-        self.current_label = None
-        self.current_index += 1
-        self.show_next_word()
+        if self.queue is None:
+            return  # a reload started while the word was on screen
+        self.queue.advance()
+        if self.refilter_pending:
+            self.refilter_pending = False
+            self.refilter()
+        else:
+            self.show_next_word()
 
     def show_next_word(self):
-        if self.current_index < len(self.filtered_df):
-            word_data = self.filtered_df.iloc[self.current_index]
-            word = word_data["word"]
-            score = map_score_to_bucket(word_data["score"])
-            self.filtered_df.at[self.current_index, "score"] = score
-            self.place_word(word, score)
+        self.top_up_batches()
+        self.current_item = self.queue.current()
+        if self.current_item is not None:
+            row, word, score = self.current_item
+            self.place_word(row, word, score)
+            self.update_progress()
+            self.scoring_in_progress = False
+            if self.pending_keys:
+                QTimer.singleShot(0, self.apply_pending_key)
+        elif self.loading or (self.coordinator is not None and self.coordinator.batch_in_flight):
+            # Caught up with the loader or the coordination server; the next
+            # chunk or batch will show a word.
+            self.waiting_for_words = True
+            self.current_score_label.setText("Loading more words...")
             self.update_progress()
             self.scoring_in_progress = False
         else:
             self.update_progress()
+            self.word_card.clear_word()
             QMessageBox.information(self, "Done", "All words have been rescored!")
-            self.current_label = None
             self.scoring_in_progress = False
 
-    def place_word(self, word, score):
-        self.current_score_label.setText(f"Current Score: {score}")
-
-        if self.current_label and self.current_label.parent():
-            old_layout = self.current_label.parent().layout()
-            old_layout.removeWidget(self.current_label)
-            self.current_label.deleteLater()
-
-        main_word_font = QFont(self.main_word_font_family, self.main_word_font_size, QFont.Bold)
-
-        self.current_label = QLabel(word)
-        self.current_label.setFont(main_word_font)
-        self.current_label.setAlignment(Qt.AlignCenter)
-        self.current_label.setMinimumHeight(150)
-        self.current_label.setStyleSheet(f"""
-            color: #000000;
-            border: 3px solid {bucket_colors[score]};
-            border-radius: 10px;
-            padding: 20px;
-            background-color: #ffffff;
-        """)
-
-        self.word_layout.insertWidget(0, self.current_label, alignment=Qt.AlignCenter)
-
-    def show_new_score_flash(self, old_score, new_score):
+    def place_word(self, row, word, score):
+        source = self.word_source(row, word)
+        text = f"Current Score: {score}" + (f"  ({source})" if source else "")
+        if self.related_index is not None:
+            related = len(self.related_rows(row))
+            if related:
+                text += f"  |  {related} related [G]"
+        self.current_score_label.setText(text)
+        self.word_card.show_word(word, score)
+
+    def word_source(self, row, word):
+        # Which list the score comes from, shown when several are merged.
+        index = self.master_index
+        if index is None or index.source is None:
+            return ""
+        if word in self.personal_scores:
+            return "personal"
+        return index.source_names[index.source[row]]
+
+    def show_new_score_flash(self, word, old_score, new_score, related=0):
         diff = new_score - old_score
         if diff > 0:
             text = f"New Score: {new_score}"
@@ -458,26 +1082,22 @@ class RescoreApp(QMainWindow):
             text = f"Score: {new_score}"
             color = "#000000"
 
+        if self.rapid_mode:
+            # The next word is already showing, so say which word this was.
+            text = f"{word}: {text}"
+        if related:
+            text += f" (+{related} related)"
         self.new_score_label.setText(text)
-        self.new_score_label.setStyleSheet(f"color: {color};")
-        QTimer.singleShot(200, lambda: self.new_score_label.setText(""))
+        if color != self.flash_color:
+            self.new_score_label.setStyleSheet(f"color: {color};")
+            self.flash_color = color
+        self.flash_timer.start(200)
 
     def get_icon_key(self, old_score, new_score):
-        if new_score == old_score:
-            return "keep"
-        old_idx = score_buckets.index(old_score)
-        new_idx = score_buckets.index(new_score)
-        diff = old_idx - new_idx
-        if diff > 0:
-            return "increase_2" if diff > 1 else "increase_1"
-        elif diff < 0:
-            return "decrease_2" if diff < -1 else "decrease_1"
-        else:
-            return "keep"
+        return icon_key(old_score, new_score)
 
     def update_progress(self):
-        total_count = len(self.filtered_df)
-        done_count = len(self.done_words)  # use in-memory done_words set
+        done_count, total_count = self.done_count, self.total_count
         progress = 0.0
         if total_count > 0:
             progress = (done_count / total_count) * 100
@@ -487,141 +1107,208 @@ class RescoreApp(QMainWindow):
         self.progress_detail_label.setText(f"{done_count} out of {total_count} complete")
 
     def update_ticker(self):
-        while self.ticker_layout.count() > 0:
-            item = self.ticker_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        for word, icon_key in self.ticker_items:
-            ticker_item_widget = QFrame()
-            ticker_item_layout = QVBoxLayout(ticker_item_widget)
-            ticker_item_layout.setContentsMargins(5,5,5,5)
-            ticker_item_layout.setSpacing(2)
-
-            icon_label = QLabel()
-            icon_label.setFixedSize(48, 48)
-            icon_label.setScaledContents(True)
-            icon_path = self.icons.get(icon_key, None)
-            if icon_path and os.path.exists(icon_path):
-                pixmap = QPixmap(icon_path)
-                if not pixmap.isNull():
-                    icon_label.setPixmap(pixmap)
-                else:
-                    icon_label.setText(icon_key)
-            else:
-                icon_label.setText(icon_key)
-            ticker_item_layout.addWidget(icon_label, alignment=Qt.AlignCenter)
-
-            w_label = QLabel(word)
-            w_label.setFont(QFont("Segoe UI", 10))
-            w_label.setAlignment(Qt.AlignCenter)
-            ticker_item_layout.addWidget(w_label, alignment=Qt.AlignCenter)
-
-            self.ticker_layout.addWidget(ticker_item_widget)
+        self.ticker.set_items(self.ticker_items)
 
     def update_personal_in_memory(self, word, score):
-        if word in self.personal_df['word'].values:
-            self.personal_df.loc[self.personal_df['word'] == word, 'score'] = score
-        else:
-            new_row = pd.DataFrame({'word': [word], 'score': [score]})
-            self.personal_df = pd.concat([self.personal_df, new_row], ignore_index=True)
+        self.personal_scores.upsert(word, score)
 
     def update_tracker_in_memory(self, word):
-        if word in self.rescored_tracker['word'].values:
-            self.rescored_tracker.loc[self.rescored_tracker['word'] == word, 'rescored'] = 1
+        self.rescored_tracker.upsert(word, 1)
+
+    def compact_journal(self):
+        # The stores are copied here so the I/O thread writes a consistent
+        # snapshot while scoring carries on.
+        personal, personal_path = self.personal_scores.copy(), self.personal_wordlist_file
+        tracker, tracker_path = self.rescored_tracker.copy(), self.rescore_tracker_file
+        self.persistence.compact(self.journal, self.journal.take_for_compaction(),
+                                 lambda: personal.save(personal_path),
+                                 lambda: tracker.save(tracker_path))
+
+    def autosave(self):
+        # Saving only appends the pending journal records; the full files are
+        # rewritten once the journal has grown large enough.
+        self.rescores_since_save = 0
+        if self.coordinator is not None:
+            self.coordinator.flush()
+        if self.journal is None:
+            return
+        if self.journal.needs_compaction():
+            self.compact_journal()
         else:
-            new_row = pd.DataFrame({'word': [word], 'rescored': [1]})
-            self.rescored_tracker = pd.concat([self.rescored_tracker, new_row], ignore_index=True)
+            self.persistence.flush(self.journal, self.journal.take_pending())
 
-    def write_personal_wordlist_to_disk(self):
-        self.personal_df.to_csv(self.personal_wordlist_file, sep=';', index=False, header=False)
+    def save_changes(self):
+        self.statusBar().showMessage("Saving...")
+        self.autosave()
 
-    def write_tracker_to_disk(self):
-        self.rescored_tracker.to_csv(self.rescore_tracker_file, sep=';', index=False, header=False)
+    def on_saved(self, message):
+        self.statusBar().showMessage(message, 3000)
 
-    def save_changes(self):
-        self.write_personal_wordlist_to_disk()
-        self.write_tracker_to_disk()
-        QMessageBox.information(self, "Saved", "Changes saved successfully.")
+    def on_save_failed(self, error):
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "Save Failed", f"Could not save changes: {error}")
 
-    def undo_action(self):
+    def undo_action(self, quiet=False):
         if self.scoring_in_progress:
             return
-        if not self.history_stack:
-            QMessageBox.information(self, "Undo", "No more undo actions available.")
+        ops = self.history.undo()
+        if not ops:
+            if not quiet:
+                QMessageBox.information(self, "Undo", "No more undo actions available.")
             return
 
-        last_index, word, old_score, new_score = self.history_stack.pop()
-
-        for i, (w, icon_key) in enumerate(self.ticker_items):
-            if w == word:
-                self.ticker_items.remove((w, icon_key))
-                break
+        # Newest first; the last op is the word that was on screen, and words
+        # rescored along with it come back only if they match the filters.
+        for op in ops:
+            word = self.master_index.words[op.row]
+            for i, (w, icon_key) in enumerate(self.ticker_items):
+                if w == word:
+                    self.ticker_items.remove((w, icon_key))
+                    break
+
+            # Put back the personal score and tracker value the word had before
+            # it was rescored, including not being in the lists at all.
+            self.personal_scores.restore(word, op.prev_score)
+            self.rescored_tracker.restore(word, op.prev_rescored)
+            self.journal.record_restore(word, op.prev_score, op.prev_rescored)
+            self.change_model.learn_rescore(op.row, op.shown_score, op.new_score, weight=-1)
+            self.mark_done(op.row, op.prev_rescored == 1)
+            self.share_word(op.row, word)
+            if op.prev_rescored != 1 and (op is ops[-1] or self.master_index.matches(op.row, *self.filters())):
+                self.queue.push_front(op.row, op.shown_score)
         self.update_ticker()
+        if self.journal.write_through:
+            self.autosave()
 
-        self.current_index = last_index
-        old_score = map_score_to_bucket(old_score)
-        self.filtered_df.at[self.current_index, "score"] = old_score
+        self.show_next_word()
 
-        # Revert personal in memory
-        if word in self.personal_df['word'].values:
-            self.personal_df.loc[self.personal_df['word'] == word, 'score'] = old_score
+    def redo_action(self, quiet=False):
+        if self.scoring_in_progress:
+            return
+        ops = self.history.redo()
+        if not ops:
+            if not quiet:
+                QMessageBox.information(self, "Redo", "No more redo actions available.")
+            return
+        first = ops[0]
+        self.ticker_items.appendleft((self.master_index.words[first.row],
+                                      self.get_icon_key(first.shown_score, first.new_score)))
+        self.update_ticker()
 
-        # Revert tracker in memory
-        if word in self.rescored_tracker['word'].values:
-            self.rescored_tracker.loc[self.rescored_tracker['word'] == word, 'rescored'] = 0
+        for op in ops:
+            word = self.master_index.words[op.row]
+            self.update_personal_in_memory(word, op.new_score)
+            self.update_tracker_in_memory(word)
+            self.journal.record_rescore(word, op.new_score)
+            self.change_model.learn_rescore(op.row, op.shown_score, op.new_score)
+            # The queue drops the word from its front once it is marked done.
+            self.mark_done(op.row, True)
+            self.share_word(op.row, word)
+        self.rescores_since_save += len(ops)
+        if self.rescores_since_save >= self.autosave_every or self.journal.write_through:
+            self.autosave()
 
-        # Remove from done_words
-        if word in self.done_words:
-            self.done_words.remove(word)
+        self.show_next_word()
 
+    def go_to_history(self, position):
+        # Undo or redo step by step until the first position ops are applied.
+        while self.history.position > position and self.history.can_undo():
+            self.undo_action(quiet=True)
+        while self.history.position < position and self.history.can_redo():
+            self.redo_action(quiet=True)
+
+    def displayed_score(self, row, word):
+        # The bucket a word would be shown with now, counting rescores made
+        # since the index was loaded.
+        score = self.personal_scores.get(word)
+        if score is None:
+            return int(self.master_index.buckets[self.master_index.slot[row]])
+        return map_score_to_bucket(score)
+
+    def open_search_dialog(self):
+        if self.master_index is None or self.scoring_in_progress:
+            return
+        if self.search_index is None:
+            self.statusBar().showMessage("The search index is still being built...", 3000)
+            return
+        index = self.master_index
+        describe = lambda row, word: (self.displayed_score(row, word), bool(index.done[row]))
+        dialog = SearchDialog(self.search_index, index.words, describe, self)
+        if dialog.exec_() and dialog.selected_row() is not None:
+            self.jump_to_word(dialog.selected_row())
+
+    def jump_to_word(self, row):
+        # Shows the word next, rescored or not; the word that was on screen
+        # stays in the queue.
+        if self.scoring_in_progress or self.queue is None:
+            return
+        word = self.master_index.words[row]
+        self.pending_keys.clear()
+        self.queue.jump_to(row, self.displayed_score(row, word))
         self.show_next_word()
 
+    def open_history_dialog(self):
+        if self.master_index is None or self.scoring_in_progress:
+            return
+        dialog = HistoryDialog(self.history, self.master_index.words, self)
+        if dialog.exec_():
+            self.go_to_history(dialog.selected_position())
+
     def open_settings_dialog(self):
         dialog = SettingsDialog(self.settings, self)
         if dialog.exec_():
-            self.master_wordlist_file = self.settings.value("master_wordlist_file", r"C:\Users\Dennis\OneDrive\XwiWordList.txt")
-            self.personal_wordlist_file = self.settings.value("personal_wordlist_file", "personal_wordlist.txt")
-            self.rescore_tracker_file = self.settings.value("rescore_tracker_file", "rescore_tracker.txt")
-            self.length_min = int(self.settings.value("length_min", 6))
-            self.length_max = int(self.settings.value("length_max", 10))
-            self.score_min = int(self.settings.value("score_min", 25))
-            self.score_max = int(self.settings.value("score_max", 60))
-            self.disappear_delay_ms = int(self.settings.value("disappear_delay_ms", 200))
-            self.main_word_font_family = self.settings.value("main_word_font_family", "Segoe UI")
-            self.main_word_font_size = int(self.settings.value("main_word_font_size", 32))
-            self.main_word_font_size = 64
-
-            self.df = self.load_master_wordlist(self.master_wordlist_file)
-            if self.df is None:
-                QMessageBox.critical(self, "Error", f"Master wordlist file not found: {self.master_wordlist_file}")
-                return
-
-            self.ensure_file_exists(self.personal_wordlist_file)
-            self.ensure_file_exists(self.rescore_tracker_file)
-
-            self.personal_df = self.load_personal_wordlist(self.personal_wordlist_file)
-            self.rescored_tracker = self.load_tracker(self.rescore_tracker_file)
-            self.apply_personal_scores()
-            self.filtered_df = self.apply_filters().sample(frac=1).reset_index(drop=True)
-            self.current_index = 0
-            self.history_stack.clear()
-            self.ticker_items.clear()
+            old_config = self.session_config()
+            old_prioritize = self.prioritize_queue
+            self.read_settings()
+            self.autosave_timer.start(self.autosave_interval_s * 1000)
+            loaded = self.master_index is not None
+            master_signature = self.master_index.signature if loaded else None
+            change = settings_change(old_config, self.session_config(), master_signature)
+            # A failed reload leaves no index to filter; load it again.
+            if change == "reload" or (change == "filter" and (self.loading or not loaded)):
+                self.autosave()
+                self.persistence.wait_idle()
+                if self.journal is not None:
+                    self.journal.close()
+                self.start_loading()
+            elif change == "filter" or (self.prioritize_queue != old_prioritize and loaded):
+                self.bootstrap_change_model()
+                if self.scoring_in_progress:
+                    self.refilter_pending = True
+                else:
+                    self.refilter()
+            self.word_card.set_word_font(self.main_word_font_family, self.main_word_font_size)
+            QMessageBox.information(self, "Settings", "Settings updated.")
 
-            # Rebuild done_words based on new filtering
-            filtered_words_set = set(self.filtered_df['word'])
-            self.done_words = set(row['word'] for _, row in self.rescored_tracker.iterrows()
-                                  if row['rescored'] == 1 and row['word'] in filtered_words_set)
+    def closeEvent(self, event):
+        self.autosave_timer.stop()
+        self.autosave()
+        self.persistence.shutdown()
+        if self.coordinator is not None:
+            self.coordinator.shutdown()
+        if self.journal is not None:
+            self.journal.close()
+        trace_file = self.settings.value("telemetry_trace_file", "wordlister_trace.json")
+        if self.telemetry.enabled and trace_file:
+            try:
+                self.telemetry.dump_trace(trace_file)
+            except OSError:
+                pass
+        super().closeEvent(event)
 
-            self.update_ticker()
-            self.show_next_word()
-            self.update_progress()
-            QMessageBox.information(self, "Settings", "Settings updated.")
+    def open_statistics_dialog(self):
+        if self.master_index is None:
+            return
+        StatisticsDialog(self.master_index.partition, self).exec_()
 
     def export_and_exit(self):
-        self.write_personal_wordlist_to_disk()
-        self.write_tracker_to_disk()
+        if self.journal is not None:
+            self.compact_journal()
+            self.persistence.wait_idle()
+            if self.persistence.last_error is not None:
+                # on_save_failed shows the error; stay open so nothing is
+                # lost and the save can be tried again.
+                return
         QMessageBox.information(self, "Exit", "Progress saved.")
         self.close()
 
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class WorkQueue:
+    # The words left to score, as master-list row ids in shuffled order plus
+    # their bucketed scores. Words are looked up in the master word array only
+    # when they reach the front, and rows already marked as done (is_done takes
+    # a row id) are skipped there, so queueing costs a few bytes per candidate. Undone
+    # words are pushed back in front of the queue, so undo keeps working after
+    # the queue has been rebuilt for new filters.
+
+    def __init__(self, words, is_done):
+        self.words = words
+        self.is_done = is_done
+        self.rows = np.empty(1024, dtype=np.int32)
+        self.scores = np.empty(1024, dtype=np.uint8)
+        self.size = 0
+        self.position = 0
+        self.front = []
+        self.jumped = None
+
+    def __len__(self):
+        return self.size
+
+    def extend(self, rows, scores):
+        needed = self.size + len(rows)
+        if needed > len(self.rows):
+            capacity = max(needed, 2 * len(self.rows))
+            self.rows = np.resize(self.rows, capacity)
+            self.scores = np.resize(self.scores, capacity)
+        self.rows[self.size:needed] = rows
+        self.scores[self.size:needed] = scores
+        self.size = needed
+
+    def current(self):
+        # (row, word, score) for the next word still to be scored, or None
+        # when the queue is used up.
+        item = self.front_item()
+        if item is not None:
+            return item
+        while self.position < self.size:
+            row = int(self.rows[self.position])
+            if not self.is_done(row):
+                return row, self.words[row], int(self.scores[self.position])
+            self.position += 1
+        return None
+
+    def front_item(self):
+        # A word jumped to from the search, else the last word pushed back
+        # by undo. Pushed-back words that were redone since are dropped.
+        if self.jumped is not None:
+            row, score = self.jumped
+            return row, self.words[row], score
+        while self.front and self.is_done(self.front[-1][0]):
+            self.front.pop()
+        if self.front:
+            row, score = self.front[-1]
+            return row, self.words[row], score
+        return None
+
+    def advance(self):
+        if not self.advance_front():
+            self.position += 1
+
+    def advance_front(self):
+        if self.jumped is not None:
+            self.jumped = None
+        elif self.front:
+            self.front.pop()
+        else:
+            return False
+        return True
+
+    def push_front(self, row, score):
+        self.jumped = None
+        self.front.append((row, score))
+
+    def jump_to(self, row, score):
+        # Shown next, even if it has been rescored already.
+        self.jumped = (row, score)